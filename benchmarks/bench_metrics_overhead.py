@@ -0,0 +1,157 @@
+"""Microbenchmark: per-request cost of the telemetry middleware and query hooks.
+
+Three measurements:
+
+- ``middleware``: a minimal ASGI app called directly, bare versus wrapped in
+  MetricsMiddleware. The difference is the middleware's own cost per request.
+- ``query hooks``: ``SELECT 1`` on in-memory SQLite with the Engine cursor
+  hooks installed versus removed, inside a request context.
+- ``render``: formatting the whole registry for one /metrics scrape.
+
+Run from the project root:
+
+    python -m benchmarks.bench_metrics_overhead [--iterations N] [--json PATH]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Awaitable, Callable
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+
+from src.core import telemetry
+from src.core.metrics import render
+from src.core.telemetry import MetricsMiddleware, RequestStats, current_request_stats
+
+
+class _Route:
+    path = "/api/tasks/{task_id}"
+
+
+async def _app(scope, receive, send):
+    scope["route"] = _Route
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def _receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _send(message):
+    pass
+
+
+async def _per_call_us(
+    fn: Callable[[], Awaitable[object]], iterations: int, rounds: int = 5
+) -> float:
+    for _ in range(min(iterations, 200)):
+        await fn()
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            await fn()
+        samples.append((time.perf_counter() - start) / iterations * 1e6)
+    return statistics.median(samples)
+
+
+async def bench_middleware(iterations: int) -> dict[str, float]:
+    """Bare ASGI app versus the same app behind MetricsMiddleware"""
+    wrapped = MetricsMiddleware(_app)
+
+    def scope():
+        return {"type": "http", "method": "GET", "path": "/api/tasks/1"}
+
+    bare_us = await _per_call_us(lambda: _app(scope(), _receive, _send), iterations)
+    wrapped_us = await _per_call_us(
+        lambda: wrapped(scope(), _receive, _send), iterations
+    )
+    return {"bare_us": bare_us, "wrapped_us": wrapped_us}
+
+
+def bench_query_hooks(iterations: int, rounds: int = 7) -> dict[str, float]:
+    """SELECT 1 with and without the cursor event hooks, rounds interleaved
+
+    Uses a synchronous SQLite engine: the hooks are registered on the Engine
+    class, so they fire the same way, without aiosqlite's thread hop noise.
+    """
+    engine = create_engine("sqlite://")
+    token = current_request_stats.set(RequestStats())
+    hooks = [
+        ("before_cursor_execute", telemetry._before_cursor_execute),
+        ("after_cursor_execute", telemetry._after_cursor_execute),
+    ]
+    samples: dict[str, list[float]] = {"with_hooks_us": [], "without_hooks_us": []}
+    with engine.connect() as conn:
+        statement = text("SELECT 1")
+        for _ in range(iterations):
+            conn.execute(statement)
+        for _ in range(rounds):
+            for key in ("with_hooks_us", "without_hooks_us"):
+                if key == "without_hooks_us":
+                    for name, fn in hooks:
+                        event.remove(Engine, name, fn)
+                start = time.perf_counter()
+                for _ in range(iterations):
+                    conn.execute(statement)
+                samples[key].append((time.perf_counter() - start) / iterations * 1e6)
+                if key == "without_hooks_us":
+                    for name, fn in hooks:
+                        event.listen(Engine, name, fn)
+    current_request_stats.reset(token)
+    engine.dispose()
+    return {key: statistics.median(values) for key, values in samples.items()}
+
+
+def bench_render(iterations: int) -> float:
+    """One full /metrics exposition with the samples recorded so far"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        render()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+async def run(iterations: int) -> dict:
+    middleware = await bench_middleware(iterations)
+    hooks = bench_query_hooks(iterations // 5)
+    return {
+        "middleware": middleware,
+        "query_hooks": hooks,
+        "render_us": bench_render(max(iterations // 20, 10)),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--json", dest="json_path", help="write results to a file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.iterations))
+    middleware, hooks = results["middleware"], results["query_hooks"]
+    print(
+        f"middleware   bare {middleware['bare_us']:8.2f}us  wrapped"
+        f" {middleware['wrapped_us']:8.2f}us  overhead"
+        f" {middleware['wrapped_us'] - middleware['bare_us']:6.2f}us/request"
+    )
+    print(
+        f"query hooks  off  {hooks['without_hooks_us']:8.2f}us  on     "
+        f" {hooks['with_hooks_us']:8.2f}us  overhead"
+        f" {hooks['with_hooks_us'] - hooks['without_hooks_us']:6.2f}us/statement"
+    )
+    print(f"render       {results['render_us']:8.2f}us per scrape")
+
+    if args.json_path:
+        with open(args.json_path, "w") as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
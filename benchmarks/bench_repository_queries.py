@@ -0,0 +1,189 @@
+"""Microbenchmark: per-call Python overhead of the hot repository queries.
+
+Two measurements per query (``list_tasks`` is its default owner-scoped
+list, the shape the task list endpoint runs most):
+
+- ``prepare``: building the statement and computing its cache key, ad hoc
+  (``select(...).where(...).options(...)`` on every call, as the repositories
+  used to) versus the cached ``lambda_stmt`` form the repositories use now.
+  This is the pure-Python cost that caching removes.
+- ``call``: the full repository method against in-memory SQLite, so the
+  database round trip is as cheap as it gets and Python overhead dominates.
+
+Run from the project root:
+
+    python -m benchmarks.bench_repository_queries [--iterations N] [--json PATH]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Awaitable, Callable
+from uuid import uuid4
+
+from sqlalchemy import lambda_stmt
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import selectinload
+from sqlmodel import SQLModel, select
+
+from src.models import Task, TaskFilter, User
+from src.repositories.task_repository import TaskRepository
+from src.repositories.user_repository import UserRepository
+
+
+def _per_call_us(fn: Callable[[], object], iterations: int) -> float:
+    for _ in range(min(iterations, 200)):
+        fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+async def _per_call_us_async(
+    fn: Callable[[], Awaitable[object]], iterations: int, rounds: int = 5
+) -> float:
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            await fn()
+        samples.append((time.perf_counter() - start) / iterations * 1e6)
+    return statistics.median(samples)
+
+
+def bench_prepare(iterations: int) -> dict[str, dict[str, float]]:
+    """Statement construction + cache key: ad hoc vs lambda_stmt"""
+    user_id = uuid4()
+    task_id = uuid4()
+    owner_id = uuid4()
+
+    def user_adhoc():
+        return select(User).where(User.id == user_id)._generate_cache_key()
+
+    def user_cached():
+        return lambda_stmt(
+            lambda: select(User).where(User.id == user_id)
+        )._generate_cache_key()
+
+    def owner_adhoc():
+        return (
+            select(Task)
+            .where(Task.owner_id == owner_id)
+            .order_by(Task.created_at.desc().nulls_first(), Task.id.desc())
+            .options(selectinload(Task.owner), selectinload(Task.assigned_to))
+            ._generate_cache_key()
+        )
+
+    def owner_cached():
+        query = lambda_stmt(lambda: select(Task).where(Task.owner_id == owner_id))
+        query += lambda s: s.order_by(
+            Task.created_at.desc().nulls_first(), Task.id.desc()
+        ).options(selectinload(Task.owner), selectinload(Task.assigned_to))
+        return query._generate_cache_key()
+
+    def task_adhoc():
+        return (
+            select(Task)
+            .where(Task.id == task_id)
+            .options(selectinload(Task.owner), selectinload(Task.assigned_to))
+            ._generate_cache_key()
+        )
+
+    def task_cached():
+        return lambda_stmt(
+            lambda: select(Task)
+            .where(Task.id == task_id)
+            .options(selectinload(Task.owner), selectinload(Task.assigned_to))
+        )._generate_cache_key()
+
+    return {
+        "get_user_by_id": {
+            "adhoc_us": _per_call_us(user_adhoc, iterations),
+            "cached_us": _per_call_us(user_cached, iterations),
+        },
+        "list_tasks": {
+            "adhoc_us": _per_call_us(owner_adhoc, iterations),
+            "cached_us": _per_call_us(owner_cached, iterations),
+        },
+        "get_task_by_id_with_users": {
+            "adhoc_us": _per_call_us(task_adhoc, iterations),
+            "cached_us": _per_call_us(task_cached, iterations),
+        },
+    }
+
+
+async def bench_calls(iterations: int) -> dict[str, float]:
+    """Full repository calls against in-memory SQLite (fresh identity map)"""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with factory() as session:
+        owner = User(name="Bench Owner", email="bench@example.com", password_hash="x")
+        session.add(owner)
+        await session.commit()
+        tasks = [Task(title=f"Task {i}", owner_id=owner.id) for i in range(10)]
+        session.add_all(tasks)
+        await session.commit()
+        owner_id, task_id = owner.id, tasks[0].id
+
+        users = UserRepository(session)
+        task_repo = TaskRepository(session)
+
+        async def get_user_by_id():
+            session.expunge_all()
+            return await users.get_user_by_id(owner_id)
+
+        async def list_tasks():
+            session.expunge_all()
+            return await task_repo.list_tasks(TaskFilter(), owner_id=owner_id)
+
+        async def get_task_by_id_with_users():
+            session.expunge_all()
+            return await task_repo.get_task_by_id_with_users(task_id)
+
+        results = {
+            "get_user_by_id": await _per_call_us_async(get_user_by_id, iterations),
+            "list_tasks": await _per_call_us_async(list_tasks, iterations),
+            "get_task_by_id_with_users": await _per_call_us_async(
+                get_task_by_id_with_users, iterations
+            ),
+        }
+
+    await engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--json", dest="json_path", help="write results to a file")
+    args = parser.parse_args()
+
+    prepare = bench_prepare(args.iterations * 10)
+    calls = asyncio.run(bench_calls(args.iterations))
+
+    print(f"{'query':<28}{'prepare adhoc':>15}{'prepare cached':>16}{'call':>12}")
+    for name, prep in prepare.items():
+        print(
+            f"{name:<28}{prep['adhoc_us']:>13.1f}us{prep['cached_us']:>14.1f}us"
+            f"{calls[name]:>10.1f}us"
+        )
+    print(
+        "\nget_user_by_id uses session.get(), which checks the identity map and"
+        " runs SQLAlchemy's internally cached primary-key load."
+    )
+
+    if args.json_path:
+        with open(args.json_path, "w") as fh:
+            json.dump({"prepare": prepare, "call": calls}, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
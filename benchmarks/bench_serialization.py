@@ -0,0 +1,299 @@
+"""Microbenchmark: per-object serialization, validation, JWT and DI costs.
+
+These are the costs paid once per object (or per request) on every list and
+detail request, measured in isolation:
+
+- ``task_detail_validate``: ``TaskDetailResponse.model_validate`` from an
+  ORM Task with its owner and assignee loaded (what TaskService returns for
+  every task in a list), and ``task_detail_dump_json`` for serializing it.
+- ``user_response_validate``: ``UserResponse.model_validate`` from an ORM
+  User and from a Core row mapping (the user directory's column select).
+- ``task_update_dump``: ``TaskUpdate.model_dump(exclude_unset=True)`` as the
+  update endpoint does, plus validating the request body into TaskUpdate.
+- ``jwt_encode`` / ``jwt_decode``: create_access_token and the decode in
+  get_current_user.
+- ``di_chain``: a request through a minimal FastAPI app whose endpoint
+  depends on get_task_service -> get_task_repository -> get_db, minus the
+  same request to an endpoint without dependencies; ``di_get_db_only`` and
+  ``session_open_close`` break it down.
+
+Results can be saved and compared against a baseline (the committed one is
+benchmarks/baselines/serialization.json):
+
+    python -m benchmarks.bench_serialization [--iterations N] [--json PATH]
+        [--compare benchmarks/baselines/serialization.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Awaitable, Callable
+from uuid import uuid4
+
+import jwt
+from fastapi import Depends, FastAPI
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.config import settings
+from src.core.security import create_access_token
+from src.db import AsyncSessionLocal, get_db
+from src.dependencies import get_task_service
+from src.models import Task, TaskDetailResponse, TaskUpdate, User, UserResponse
+from src.repositories.user_repository import USER_PUBLIC_COLUMNS
+from src.services.task_services import TaskService
+
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / "serialization.json"
+
+
+def _per_call_us(fn: Callable[[], object], iterations: int, rounds: int = 5) -> float:
+    for _ in range(min(iterations, 500)):
+        fn()
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        samples.append((time.perf_counter() - start) / iterations * 1e6)
+    return statistics.median(samples)
+
+
+async def _per_call_us_async(
+    fn: Callable[[], Awaitable[object]], iterations: int, rounds: int = 5
+) -> float:
+    for _ in range(min(iterations, 200)):
+        await fn()
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            await fn()
+        samples.append((time.perf_counter() - start) / iterations * 1e6)
+    return statistics.median(samples)
+
+
+def make_orm_task() -> Task:
+    """A transient Task with owner and assignee set, as selectinload leaves it"""
+    now = datetime.now(timezone.utc)
+    owner = User(id=uuid4(), name="Owner", email="owner@example.com", password_hash="x")
+    assignee = User(
+        id=uuid4(), name="Assignee", email="assignee@example.com", password_hash="x"
+    )
+    return Task(
+        id=uuid4(),
+        title="Write the quarterly report",
+        description="Numbers from finance, charts from analytics",
+        status="in_progress",
+        owner_id=owner.id,
+        owner=owner,
+        assigned_to_id=assignee.id,
+        assigned_to=assignee,
+        due_date=now + timedelta(days=3),
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def user_row_mapping(user: User):
+    """The user as a Core row of USER_PUBLIC_COLUMNS, as the directory reads it"""
+    engine = create_engine("sqlite://")
+    User.__table__.create(engine)
+    with Session(engine) as session:
+        session.add(User.model_validate(user))
+        session.commit()
+        row = session.execute(select(*USER_PUBLIC_COLUMNS)).one()
+    engine.dispose()
+    return row._mapping
+
+
+def bench_models(iterations: int) -> dict[str, float]:
+    task = make_orm_task()
+    detail = TaskDetailResponse.model_validate(task)
+    user = task.owner
+    mapping = user_row_mapping(user)
+    body = {"status": "completed", "due_date": "2030-01-01T00:00:00Z", "version": 3}
+    update = TaskUpdate.model_validate(body)
+
+    return {
+        "task_detail_validate": _per_call_us(
+            lambda: TaskDetailResponse.model_validate(task), iterations
+        ),
+        "task_detail_dump_json": _per_call_us(detail.model_dump_json, iterations),
+        "user_response_validate_orm": _per_call_us(
+            lambda: UserResponse.model_validate(user), iterations
+        ),
+        "user_response_validate_row": _per_call_us(
+            lambda: UserResponse.model_validate(mapping), iterations
+        ),
+        "task_update_validate": _per_call_us(
+            lambda: TaskUpdate.model_validate(body), iterations
+        ),
+        "task_update_dump": _per_call_us(
+            lambda: update.model_dump(exclude_unset=True, exclude={"version"}),
+            iterations,
+        ),
+    }
+
+
+def bench_jwt(iterations: int) -> dict[str, float]:
+    """Token round trip with the configured key and algorithm"""
+    token = create_access_token({"sub": str(uuid4())})
+    return {
+        "jwt_encode": _per_call_us(
+            lambda: create_access_token(
+                {"sub": "3f2c1c9e-0000-4000-8000-000000000000"}
+            ),
+            iterations,
+        ),
+        "jwt_decode": _per_call_us(
+            lambda: jwt.decode(
+                token, settings.secret_key, algorithms=[settings.algorithm]
+            ),
+            iterations,
+        ),
+    }
+
+
+async def bench_di_chain(iterations: int, rounds: int = 7) -> dict[str, float]:
+    """Request through a bare endpoint versus ones with dependencies
+
+    get_db opens an AsyncSession but nothing queries it, so no database
+    connection is checked out: di_chain is dependency resolution plus session
+    setup and teardown. di_get_db_only and session_open_close split that up.
+    Rounds are interleaved to cancel drift.
+    """
+    app = FastAPI()
+
+    @app.get("/bare")
+    async def bare() -> None:
+        return None
+
+    @app.get("/db")
+    async def db_only(db: AsyncSession = Depends(get_db)) -> None:
+        return None
+
+    @app.get("/chain")
+    async def chain(service: TaskService = Depends(get_task_service)) -> None:
+        return None
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    def request(path: str) -> Callable[[], Awaitable[None]]:
+        def call():
+            scope = {
+                "type": "http",
+                "asgi": {"version": "3.0"},
+                "http_version": "1.1",
+                "method": "GET",
+                "scheme": "http",
+                "path": path,
+                "raw_path": path.encode(),
+                "query_string": b"",
+                "root_path": "",
+                "headers": [],
+                "server": ("bench", 80),
+                "client": ("127.0.0.1", 1),
+                "state": {},
+            }
+            return app(scope, receive, send)
+
+        return call
+
+    async def open_close_session() -> None:
+        async with AsyncSessionLocal():
+            pass
+
+    calls = {
+        "bare": request("/bare"),
+        "db": request("/db"),
+        "chain": request("/chain"),
+        "session": open_close_session,
+    }
+    samples: dict[str, list[float]] = {name: [] for name in calls}
+    for _ in range(rounds):
+        for name, call in calls.items():
+            samples[name].append(await _per_call_us_async(call, iterations, rounds=1))
+    median = {name: statistics.median(values) for name, values in samples.items()}
+    return {
+        "di_chain": median["chain"] - median["bare"],
+        "di_get_db_only": median["db"] - median["bare"],
+        "session_open_close": median["session"],
+        "di_bare_request": median["bare"],
+    }
+
+
+def git_commit() -> str | None:
+    import subprocess
+
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results: dict, baseline: dict | None) -> None:
+    before = baseline["results"] if baseline else {}
+    header = f"{'benchmark':<28}{'now':>10}"
+    if baseline:
+        header += f"{'baseline':>12}{'change':>9}"
+    print(header)
+    for name, value in results.items():
+        line = f"{name:<28}{value:>8.2f}us"
+        old = before.get(name)
+        if old:
+            line += f"{old:>10.2f}us{(value / old - 1) * 100:>+8.1f}%"
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--json", dest="json_path", help="write results to a file")
+    parser.add_argument(
+        "--compare",
+        nargs="?",
+        const=str(DEFAULT_BASELINE),
+        help=f"baseline JSON to compare against (default {DEFAULT_BASELINE.name})",
+    )
+    args = parser.parse_args()
+
+    models = bench_models(args.iterations)
+    tokens = bench_jwt(args.iterations // 4)
+    di = asyncio.run(bench_di_chain(args.iterations // 10))
+    results = {**models, **tokens, **di}
+    baseline = json.loads(Path(args.compare).read_text()) if args.compare else None
+    print_results(results, baseline)
+
+    if args.json_path:
+        Path(args.json_path).parent.mkdir(parents=True, exist_ok=True)
+        document = {
+            "meta": {
+                "commit": git_commit(),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "iterations": args.iterations,
+            },
+            "results": {name: round(value, 3) for name, value in results.items()},
+        }
+        Path(args.json_path).write_text(json.dumps(document, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
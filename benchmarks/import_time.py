@@ -0,0 +1,91 @@
+"""Import-time report for a module (default: src.main), from ``-X importtime``.
+
+Imports the module in a fresh interpreter with ``-X importtime`` and
+summarises the trace: total wall time, the slowest modules by cumulative and
+self time, and the project's own modules. Repeats the import to take the
+fastest run so disk-cache noise does not dominate.
+
+Run from the project root:
+
+    python -m benchmarks.import_time [--module src.main] [--top N] [--runs N] [--json PATH]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+
+LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def trace(module: str) -> list[dict]:
+    """Per-module self/cumulative microseconds for one fresh import"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    entries = []
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append(
+                {
+                    "module": name,
+                    "self_us": int(self_us),
+                    "cumulative_us": int(cumulative_us),
+                    "depth": len(indent) // 2,
+                }
+            )
+    return entries
+
+
+def total_us(entries: list[dict]) -> int:
+    """Wall time of the import: the sum of the top-level cumulative times"""
+    return sum(entry["cumulative_us"] for entry in entries if entry["depth"] == 0)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="src.main")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--json", dest="json_path", help="write results to a file")
+    args = parser.parse_args()
+
+    entries = min((trace(args.module) for _ in range(args.runs)), key=total_us)
+    by_cumulative = sorted(entries, key=lambda e: e["cumulative_us"], reverse=True)
+    by_self = sorted(entries, key=lambda e: e["self_us"], reverse=True)
+    project = [e for e in entries if e["module"].split(".")[0] == "src"]
+
+    print(f"import {args.module}: {total_us(entries) / 1000:.1f} ms\n")
+    for title, rows, key in (
+        ("slowest cumulative", by_cumulative[: args.top], "cumulative_us"),
+        ("slowest self", by_self[: args.top], "self_us"),
+        ("project modules (self)", project, "self_us"),
+    ):
+        print(title)
+        for entry in rows:
+            print(f"  {entry[key] / 1000:>8.1f} ms  {entry['module']}")
+        print()
+
+    if args.json_path:
+        with open(args.json_path, "w") as fh:
+            json.dump(
+                {
+                    "module": args.module,
+                    "total_us": total_us(entries),
+                    "modules": entries,
+                },
+                fh,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+"""Endpoint load test: the ASGI app in-process against SQLite (or Postgres).
+
+Seeds users and tasks, then drives a weighted mix of login, list, get,
+create, update and delete requests from N concurrent virtual users, once per
+concurrency level. Each virtual user holds its own token and works on its
+own tasks, like a real client. Requests go through httpx's ASGI transport,
+so the full middleware / routing / service / database path is exercised
+without socket noise.
+
+Reports throughput and p50/p95/p99 latency per endpoint and level, and can
+save them as JSON (with the git commit) and compare against an earlier run:
+
+    python -m benchmarks.load_test --concurrency 1,8,32 --requests 2000 \\
+        --json results/$(git rev-parse --short HEAD).json --compare baseline.json
+
+By default a fresh SQLite file in a temporary directory is used. To run
+against a local Postgres, pass --database-url together with --reset: the
+tables in that database are dropped and recreated.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+DEFAULT_MIX = "login=2,list=30,get=30,create=14,update=18,delete=6"
+PASSWORD = "load-test-password"
+
+
+def parse_mix(value: str) -> dict[str, int]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = int(weight)
+    unknown = set(mix) - {"login", "list", "get", "create", "update", "delete"}
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown operations: {sorted(unknown)}")
+    return mix
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(latencies: list[float], errors: int, elapsed: float) -> dict:
+    values = sorted(latencies)
+    return {
+        "requests": len(values),
+        "errors": errors,
+        "throughput_rps": round(len(values) / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(values) / len(values) * 1000, 3) if values else 0.0,
+        "p50_ms": round(percentile(values, 50) * 1000, 3),
+        "p95_ms": round(percentile(values, 95) * 1000, 3),
+        "p99_ms": round(percentile(values, 99) * 1000, 3),
+    }
+
+
+class VirtualUser:
+    """One client: a login, a token and the ids of its own tasks"""
+
+    def __init__(self, email: str, task_ids: list[str]):
+        self.email = email
+        self.task_ids = task_ids
+        self.headers: dict[str, str] = {}
+
+
+async def seed(users: int, tasks_per_user: int) -> list[VirtualUser]:
+    """Users with one shared password hash, and tasks due over the next month"""
+    from src.db import AsyncSessionLocal
+    from src.models import Task, User
+    from src.services.user_services import UserService
+
+    password_hash = UserService.hash_password(PASSWORD)
+    now = datetime.now(timezone.utc)
+    rng = random.Random(0)
+    clients = []
+    async with AsyncSessionLocal() as session:
+        for u in range(users):
+            user = User(
+                name=f"Load User {u}",
+                email=f"load{u}@example.com",
+                password_hash=password_hash,
+                role="owner" if u == 0 else "member",
+            )
+            session.add(user)
+            await session.flush()
+            tasks = [
+                Task(
+                    title=f"Task {u}-{t}",
+                    owner_id=user.id,
+                    due_date=now + timedelta(days=rng.randint(-5, 30)),
+                )
+                for t in range(tasks_per_user)
+            ]
+            session.add_all(tasks)
+            await session.flush()
+            clients.append(VirtualUser(user.email, [str(task.id) for task in tasks]))
+        await session.commit()
+    return clients
+
+
+async def login(client, user: VirtualUser) -> int:
+    response = await client.post(
+        "/api/auth/login", data={"username": user.email, "password": PASSWORD}
+    )
+    if response.status_code == 200:
+        user.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    return response.status_code
+
+
+async def run_operation(client, op: str, user: VirtualUser, rng: random.Random):
+    """Issue one request of the given kind; returns (status, expected_status)"""
+    if op == "login":
+        return await login(client, user), 200
+    if op == "list":
+        response = await client.get("/api/tasks", headers=user.headers)
+        return response.status_code, 200
+    if op == "create" or not user.task_ids:
+        response = await client.post(
+            "/api/tasks",
+            json={
+                "title": f"Created {rng.random():.6f}",
+                "due_date": (
+                    datetime.now(timezone.utc) + timedelta(days=rng.randint(1, 14))
+                ).isoformat(),
+            },
+            headers=user.headers,
+        )
+        if response.status_code == 201:
+            user.task_ids.append(response.json()["id"])
+        return response.status_code, 201
+    task_id = rng.choice(user.task_ids)
+    if op == "get":
+        response = await client.get(f"/api/tasks/{task_id}", headers=user.headers)
+        return response.status_code, 200
+    if op == "update":
+        response = await client.put(
+            f"/api/tasks/{task_id}",
+            json={"status": rng.choice(["pending", "in_progress", "completed"])},
+            headers=user.headers,
+        )
+        return response.status_code, 200
+    user.task_ids.remove(task_id)
+    response = await client.delete(f"/api/tasks/{task_id}", headers=user.headers)
+    return response.status_code, 204
+
+
+async def run_level(
+    client,
+    users: list[VirtualUser],
+    concurrency: int,
+    total: int,
+    mix: dict,
+    seed_: int,
+) -> dict:
+    """total requests spread over concurrency workers; per-endpoint stats"""
+    names, weights = list(mix), list(mix.values())
+    latencies: dict[str, list[float]] = {name: [] for name in names}
+    errors: dict[str, int] = {name: 0 for name in names}
+    remaining = total
+
+    async def worker(index: int) -> None:
+        nonlocal remaining
+        rng = random.Random(seed_ * 1000 + index)
+        user = users[index % len(users)]
+        while remaining > 0:
+            remaining -= 1
+            op = rng.choices(names, weights)[0]
+            if op in ("get", "update", "delete") and not user.task_ids:
+                op = "create"
+            start = time.perf_counter()
+            status, expected = await run_operation(client, op, user, rng)
+            latencies[op].append(time.perf_counter() - start)
+            if status != expected:
+                errors[op] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    return {
+        "concurrency": concurrency,
+        "duration_s": round(elapsed, 3),
+        "overall": summarize(all_latencies, sum(errors.values()), elapsed),
+        "endpoints": {
+            name: summarize(latencies[name], errors[name], elapsed)
+            for name in names
+            if latencies[name]
+        },
+    }
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_level(level: dict) -> None:
+    overall = level["overall"]
+    print(
+        f"\nconcurrency {level['concurrency']}: {overall['requests']} requests in"
+        f" {level['duration_s']:.2f}s, {overall['throughput_rps']:.1f} req/s,"
+        f" {overall['errors']} errors"
+    )
+    print(f"  {'endpoint':<8}{'count':>7}{'err':>5}{'p50':>10}{'p95':>10}{'p99':>10}")
+    for name, stats in level["endpoints"].items():
+        print(
+            f"  {name:<8}{stats['requests']:>7}{stats['errors']:>5}"
+            f"{stats['p50_ms']:>8.2f}ms{stats['p95_ms']:>8.2f}ms"
+            f"{stats['p99_ms']:>8.2f}ms"
+        )
+
+
+def print_comparison(current: dict, baseline: dict) -> None:
+    """Throughput and p95 change per level and endpoint versus a saved run"""
+    print(f"\nversus {baseline['meta'].get('commit') or 'baseline'}:")
+    previous = {level["concurrency"]: level for level in baseline["levels"]}
+    for level in current["levels"]:
+        before = previous.get(level["concurrency"])
+        if before is None:
+            continue
+        rps_now = level["overall"]["throughput_rps"]
+        rps_then = before["overall"]["throughput_rps"]
+        change = (rps_now / rps_then - 1) * 100 if rps_then else 0.0
+        print(f"  concurrency {level['concurrency']}: throughput {change:+.1f}%")
+        for name, stats in level["endpoints"].items():
+            old = before["endpoints"].get(name)
+            if old and old["p95_ms"]:
+                delta = (stats["p95_ms"] / old["p95_ms"] - 1) * 100
+                print(
+                    f"    {name:<8} p95 {old['p95_ms']:.2f}ms -> "
+                    f"{stats['p95_ms']:.2f}ms ({delta:+.1f}%)"
+                )
+
+
+async def run(args: argparse.Namespace, database_url: str) -> dict:
+    from httpx import ASGITransport, AsyncClient
+    from sqlmodel import SQLModel
+
+    from src.db import engine
+    from src.main import app
+
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+        await conn.run_sync(SQLModel.metadata.create_all)
+    users = await seed(args.users, args.tasks_per_user)
+
+    levels = []
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://load") as client:
+        for user in users:
+            await login(client, user)
+        # One untimed pass so first-request costs do not land in level one
+        await run_level(client, users, 1, min(50, args.requests), args.mix, -1)
+        for concurrency in args.concurrency:
+            level = await run_level(
+                client, users, concurrency, args.requests, args.mix, args.seed
+            )
+            print_level(level)
+            levels.append(level)
+    await engine.dispose()
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "database": database_url.split("://")[0],
+            "python": platform.python_version(),
+            "users": args.users,
+            "tasks_per_user": args.tasks_per_user,
+            "requests_per_level": args.requests,
+            "mix": args.mix,
+            "seed": args.seed,
+        },
+        "levels": levels,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--concurrency",
+        type=lambda v: [int(c) for c in v.split(",")],
+        default=[1, 8, 32],
+        help="comma-separated concurrency levels (default 1,8,32)",
+    )
+    parser.add_argument("--requests", type=int, default=1000, help="per level")
+    parser.add_argument("--users", type=int, default=32)
+    parser.add_argument("--tasks-per-user", type=int, default=20)
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX))
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--database-url", help="default: a temporary SQLite file")
+    parser.add_argument(
+        "--reset",
+        action="store_true",
+        help="required with --database-url: drop and recreate its tables",
+    )
+    parser.add_argument("--json", dest="json_path", help="write results to a file")
+    parser.add_argument("--compare", help="earlier results JSON to compare against")
+    args = parser.parse_args()
+
+    if args.database_url and not args.reset:
+        parser.error("--database-url drops and recreates tables; pass --reset")
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = args.database_url or f"sqlite+aiosqlite:///{tmp}/load.db"
+        # Settings are read at import, so configure before importing the app
+        os.environ["DATABASE_URL"] = database_url
+        os.environ["DATABASE_REPLICA_URLS"] = ""
+        os.environ.setdefault("DB_POOL_SIZE", str(max(args.concurrency)))
+        results = asyncio.run(run(args, database_url))
+
+    if args.json_path:
+        Path(args.json_path).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.json_path).write_text(json.dumps(results, indent=2))
+    if args.compare:
+        print_comparison(results, json.loads(Path(args.compare).read_text()))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,375 @@
+"""Replay captured traffic against a test instance and compare latency per route.
+
+Input is a CAPTURE_FILE written by TrafficCaptureMiddleware (CAPTURE_ENABLED).
+Each record is re-issued at its original offset from the first one, divided
+by --speed (2 = twice as fast, 0 = as fast as --max-concurrency allows), so
+the replay reproduces the real mix, burstiness and per-user access pattern.
+
+Captures are sanitized, so the replay fills in the blanks:
+
+- each distinct principal becomes one generated user (<prefix><n>@example.com,
+  as created by ``python -m src.seed generate``), logged in up front;
+- each distinct task/user pseudonym is mapped, on first use, to one of that
+  principal's tasks (or to a user); tasks created during the replay join the
+  pool and deleted ones leave it;
+- bodies and queries are synthesized from their recorded shapes, keeping the
+  recorded enum-like values (status, sort order, ...).
+
+By default the app runs in-process (httpx ASGI transport) on a temporary
+SQLite file seeded with the generator. --base-url targets a running instance
+instead, which must have been seeded with the same --password:
+
+    python -m benchmarks.replay traffic.jsonl --speed 2 --json replay.json
+    python -m benchmarks.replay traffic.jsonl --base-url http://localhost:8001
+
+The report compares, per route, the captured p50/p95 with the replayed ones
+and counts responses whose status differs from the captured status.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+from benchmarks.load_test import git_commit, percentile
+
+# The default of `python -m src.seed generate --password`
+DEFAULT_PASSWORD = "password123"
+OMIT = object()
+
+
+def load_capture(path: str) -> list[dict]:
+    """Captured records in time order (unreadable lines are skipped)"""
+    records = []
+    with open(path) as fh:
+        for line in fh:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+    return sorted(records, key=lambda record: record["ts"])
+
+
+class Actor:
+    """A generated user standing in for one captured principal"""
+
+    def __init__(self, email: str):
+        self.email = email
+        self.user_id: str | None = None
+        self.headers: dict[str, str] = {}
+        self.task_ids: list[str] = []
+
+
+class Replayer:
+    """Maps captured pseudonyms onto real ids and synthesizes requests"""
+
+    def __init__(
+        self,
+        client,
+        actors: dict[str | None, Actor],
+        seed: int,
+        password: str = DEFAULT_PASSWORD,
+    ):
+        self.client = client
+        self.actors = actors
+        self.password = password
+        self.logins = itertools.cycle([a for p, a in actors.items() if p])
+        self.ids: dict[str, str] = {}
+        self.rng = random.Random(seed)
+
+    async def login(self, actor: Actor) -> None:
+        import jwt
+
+        response = await self.client.post(
+            "/api/auth/login",
+            data={"username": actor.email, "password": self.password},
+        )
+        response.raise_for_status()
+        token = response.json()["access_token"]
+        actor.headers = {"Authorization": f"Bearer {token}"}
+        actor.user_id = jwt.decode(token, options={"verify_signature": False})["sub"]
+        tasks = await self.client.get("/api/tasks", headers=actor.headers)
+        actor.task_ids = [task["id"] for task in tasks.json()]
+
+    def any_task_id(self, actor: Actor) -> str:
+        pool = actor.task_ids or [
+            task_id for other in self.actors.values() for task_id in other.task_ids
+        ]
+        return self.rng.choice(pool) if pool else "00000000-0000-4000-8000-000000000000"
+
+    def any_user_id(self) -> str | None:
+        users = [a.user_id for a in self.actors.values() if a.user_id]
+        return self.rng.choice(users) if users else None
+
+    def real_id(self, name: str, token: str, actor: Actor) -> str:
+        """The id a pseudonym stands for, fixed on first use"""
+        if token not in self.ids:
+            if name == "user_id":
+                self.ids[token] = actor.user_id or self.any_user_id() or token
+            elif name == "task_id":
+                self.ids[token] = self.any_task_id(actor)
+            else:
+                self.ids[token] = token
+        return self.ids[token]
+
+    def value(self, shape: Any, key: str | None, actor: Actor) -> Any:
+        """A value matching a recorded shape (recorded safe values pass through)"""
+        if isinstance(shape, dict):
+            values = {k: self.value(v, k, actor) for k, v in shape.items()}
+            return {k: v for k, v in values.items() if v is not OMIT}
+        if isinstance(shape, list):
+            length, item = shape
+            if key == "ids":
+                return [self.any_task_id(actor) for _ in range(length)]
+            return [self.value(item, None, actor) for _ in range(length)]
+        if shape == "uuid":
+            if key and key.startswith("assigned_to"):
+                return self.any_user_id()
+            return self.any_task_id(actor)
+        if shape == "datetime":
+            days = self.rng.randint(1, 30)
+            return (datetime.now(timezone.utc) + timedelta(days=days)).isoformat()
+        if shape == "int":
+            # An expected version would only produce conflicts
+            return OMIT if key == "version" else 1
+        if shape == "float":
+            return 1.0
+        if shape == "str":
+            return f"replayed {key or 'value'} {self.rng.randrange(10**6)}"
+        return shape
+
+    def request(self, record: dict) -> tuple[str, str, dict[str, Any]]:
+        """(method, url, httpx keyword arguments) reproducing a record"""
+        actor = self.actors.get(record.get("principal")) or self.actors[None]
+        path = record["route"]
+        for name, token in record.get("path_params", {}).items():
+            path = path.replace("{" + name + "}", self.real_id(name, token, actor))
+        query = {
+            key: value
+            for key, value in self.value(record.get("query") or {}, None, actor).items()
+            if value is not None
+        }
+        kwargs: dict[str, Any] = {"params": query, "headers": actor.headers}
+        kind, body = record.get("body_kind"), record.get("body")
+        if kind == "json":
+            kwargs["json"] = self.value(body, None, actor)
+        elif kind == "form" and record["route"] == "/api/auth/login":
+            login_as = next(self.logins, None)
+            email = login_as.email if login_as else "nobody@example.com"
+            kwargs["data"] = {"username": email, "password": self.password}
+        elif kind == "form":
+            kwargs["data"] = {key: "replayed" for key in body}
+        elif kind == "bytes":
+            kwargs["content"] = b"x" * int(body)
+        return record["method"], path, kwargs
+
+    def observe(self, record: dict, path: str, response) -> None:
+        """Keep task pools in step with creates and deletes"""
+        actor = self.actors.get(record.get("principal")) or self.actors[None]
+        if record["route"] == "/api/tasks" and response.status_code == 201:
+            actor.task_ids.append(response.json()["id"])
+        elif record["method"] == "DELETE" and response.status_code == 204:
+            task_id = path.rsplit("/", 1)[-1]
+            for other in self.actors.values():
+                if task_id in other.task_ids:
+                    other.task_ids.remove(task_id)
+
+
+async def replay(
+    replayer: Replayer, records: list[dict], speed: float, max_concurrency: int
+) -> dict[str, dict]:
+    """Issue every record on schedule; latency and status per route"""
+    results: dict[str, dict] = defaultdict(
+        lambda: {"captured": [], "replayed": [], "mismatches": 0, "errors": 0}
+    )
+    semaphore = asyncio.Semaphore(max_concurrency)
+    first = records[0]["ts"]
+    started = time.perf_counter()
+    max_lag = 0.0
+
+    async def issue(record: dict) -> None:
+        nonlocal max_lag
+        if speed > 0:
+            delay = (record["ts"] - first) / speed - (time.perf_counter() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        async with semaphore:
+            if speed > 0:
+                lag = time.perf_counter() - started - (record["ts"] - first) / speed
+                max_lag = max(max_lag, lag)
+            method, path, kwargs = replayer.request(record)
+            stats = results[f"{method} {record['route']}"]
+            stats["captured"].append(record["duration_ms"])
+            start = time.perf_counter()
+            try:
+                response = await replayer.client.request(method, path, **kwargs)
+            except Exception:
+                stats["errors"] += 1
+                return
+            stats["replayed"].append((time.perf_counter() - start) * 1000)
+            if response.status_code != record["status"]:
+                stats["mismatches"] += 1
+            replayer.observe(record, path, response)
+
+    await asyncio.gather(*(issue(record) for record in records))
+    elapsed = time.perf_counter() - started
+    report = {}
+    for route, stats in sorted(results.items()):
+        captured, replayed = sorted(stats["captured"]), sorted(stats["replayed"])
+        report[route] = {
+            "requests": len(captured),
+            "status_mismatches": stats["mismatches"],
+            "errors": stats["errors"],
+            "captured_p50_ms": round(percentile(captured, 50), 3),
+            "captured_p95_ms": round(percentile(captured, 95), 3),
+            "replayed_p50_ms": round(percentile(replayed, 50), 3),
+            "replayed_p95_ms": round(percentile(replayed, 95), 3),
+        }
+    return {
+        "duration_s": round(elapsed, 3),
+        "max_schedule_lag_s": round(max_lag, 3),
+        "routes": report,
+    }
+
+
+def print_report(result: dict) -> None:
+    print(
+        f"replayed in {result['duration_s']:.2f}s"
+        f" (max schedule lag {result['max_schedule_lag_s']:.3f}s)"
+    )
+    print(
+        f"  {'route':<40}{'n':>6}{'diff':>6}"
+        f"{'cap p50':>10}{'rep p50':>10}{'cap p95':>10}{'rep p95':>10}{'p95':>8}"
+    )
+    for route, stats in result["routes"].items():
+        before, after = stats["captured_p95_ms"], stats["replayed_p95_ms"]
+        change = f"{(after / before - 1) * 100:+.0f}%" if before else "-"
+        print(
+            f"  {route:<40}{stats['requests']:>6}"
+            f"{stats['status_mismatches'] + stats['errors']:>6}"
+            f"{stats['captured_p50_ms']:>8.1f}ms{stats['replayed_p50_ms']:>8.1f}ms"
+            f"{before:>8.1f}ms{after:>8.1f}ms{change:>8}"
+        )
+
+
+async def seed_in_process(
+    principals: int, tasks_per_user: int, seed: int, password: str
+) -> None:
+    from sqlmodel import SQLModel
+
+    from src.db import engine
+    from src.seed import generate_data
+
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    await generate_data(
+        engine,
+        principals,
+        principals * tasks_per_user,
+        seed=seed,
+        skew=0,
+        password=password,
+    )
+
+
+async def run(args: argparse.Namespace, records: list[dict]) -> dict:
+    import httpx
+
+    principals = list(dict.fromkeys(r["principal"] for r in records if r["principal"]))
+    actors: dict[str | None, Actor] = {None: Actor("anonymous@example.com")}
+    for index, principal in enumerate(principals):
+        actors[principal] = Actor(f"{args.email_prefix}{index}@example.com")
+
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=60)
+    else:
+        await seed_in_process(
+            max(len(principals), 1), args.tasks_per_user, args.seed, args.password
+        )
+        from src.main import app
+
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://replay"
+        )
+
+    async with client:
+        replayer = Replayer(client, actors, args.seed, args.password)
+        for principal, actor in actors.items():
+            if principal is not None:
+                await replayer.login(actor)
+        result = await replay(replayer, records, args.speed, args.max_concurrency)
+
+    if not args.base_url:
+        from src.db import engine
+
+        await engine.dispose()
+    result["meta"] = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "capture": args.capture,
+        "records": len(records),
+        "principals": len(principals),
+        "speed": args.speed,
+        "target": args.base_url or "in-process sqlite",
+    }
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("capture", help="capture file (JSON lines)")
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="time scale: 1 original, 2 twice as fast, 0 no delays (default 1)",
+    )
+    parser.add_argument("--max-concurrency", type=int, default=256)
+    parser.add_argument(
+        "--base-url", help="running test instance (default: in-process)"
+    )
+    parser.add_argument("--email-prefix", default="user")
+    parser.add_argument(
+        "--password",
+        default=DEFAULT_PASSWORD,
+        help="password of the generated users (src.seed generate --password)",
+    )
+    parser.add_argument(
+        "--tasks-per-user", type=int, default=50, help="in-process seeding only"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", dest="json_path", help="write results to a file")
+    args = parser.parse_args()
+
+    records = load_capture(args.capture)
+    if not records:
+        parser.error(f"no records in {args.capture}")
+    with tempfile.TemporaryDirectory() as tmp:
+        if not args.base_url:
+            # Settings are read at import, so configure before importing the app
+            os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{tmp}/replay.db"
+            os.environ["DATABASE_REPLICA_URLS"] = ""
+            os.environ["CAPTURE_ENABLED"] = "false"
+        result = asyncio.run(run(args, records))
+
+    print_report(result)
+    if args.json_path:
+        Path(args.json_path).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.json_path).write_text(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,19 @@
 import { apiConn } from '@/shared/api';
 import type { GetUsersResponse } from '../interfaces/users';
 
+// The API's largest page; GET /users returns one page per request
+const USERS_PAGE_SIZE = 500;
+
 export const getUsers = async (): Promise<GetUsersResponse> => {
-  const { data } = await apiConn.get<GetUsersResponse>(`users`);
-  return data;
+  const users: GetUsersResponse = [];
+  let cursor: string | undefined;
+  do {
+    const { data, headers } = await apiConn.get<GetUsersResponse>(`users`, {
+      params: { limit: USERS_PAGE_SIZE, cursor },
+    });
+    users.push(...data);
+    // Set while more pages follow
+    cursor = headers['x-next-cursor'] as string | undefined;
+  } while (cursor);
+  return users;
 };
@@ -0,0 +1,53 @@
+"""Composite indexes behind the sorted task lists and user paging
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Each list scope is sorted by one column with id as the tie-break, so every
+# index ends in id (see Task.__table_args__)
+TASK_INDEXES = {
+    "ix_task_owner_status": ["owner_id", "status", "id"],
+    "ix_task_owner_due_date": ["owner_id", "due_date", "id"],
+    "ix_task_owner_created_at": ["owner_id", "created_at", "id"],
+    "ix_task_owner_updated_at": ["owner_id", "updated_at", "id"],
+    "ix_task_owner_status_created_at": ["owner_id", "status", "created_at", "id"],
+    "ix_task_assigned_to_due_date": ["assigned_to_id", "due_date", "id"],
+    "ix_task_assigned_to_created_at": ["assigned_to_id", "created_at", "id"],
+    "ix_task_assigned_to_status_created_at": [
+        "assigned_to_id",
+        "status",
+        "created_at",
+        "id",
+    ],
+}
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("user", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_user_created_at_id", ["created_at", "id"], unique=False
+        )
+
+    with op.batch_alter_table("task", schema=None) as batch_op:
+        for name, columns in TASK_INDEXES.items():
+            batch_op.create_index(name, columns, unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("task", schema=None) as batch_op:
+        for name in reversed(TASK_INDEXES):
+            batch_op.drop_index(name)
+
+    with op.batch_alter_table("user", schema=None) as batch_op:
+        batch_op.drop_index("ix_user_created_at_id")
@@ -0,0 +1,60 @@
+"""Cold table (task_archive) for archived completed tasks
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "task_archive",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("title", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("description", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("status", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("owner_id", sa.Uuid(), nullable=False),
+        sa.Column("assigned_to_id", sa.Uuid(), nullable=True),
+        sa.Column("due_date", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("archived_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["assigned_to_id"],
+            ["user.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["owner_id"],
+            ["user.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    with op.batch_alter_table("task_archive", schema=None) as batch_op:
+        batch_op.create_index(
+            batch_op.f("ix_task_archive_assigned_to_id"),
+            ["assigned_to_id"],
+            unique=False,
+        )
+        batch_op.create_index(
+            batch_op.f("ix_task_archive_owner_id"), ["owner_id"], unique=False
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("task_archive", schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f("ix_task_archive_owner_id"))
+        batch_op.drop_index(batch_op.f("ix_task_archive_assigned_to_id"))
+
+    op.drop_table("task_archive")
@@ -0,0 +1,61 @@
+"""Task change log (task_changes) for delta sync
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "task_changes",
+        sa.Column(
+            "id",
+            sa.BigInteger().with_variant(sa.Integer(), "sqlite"),
+            autoincrement=True,
+            nullable=False,
+        ),
+        sa.Column("task_id", sa.Uuid(), nullable=False),
+        sa.Column("op", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("owner_id", sa.Uuid(), nullable=False),
+        sa.Column("assigned_to_id", sa.Uuid(), nullable=True),
+        sa.Column("previous_assigned_to_id", sa.Uuid(), nullable=True),
+        sa.Column("changed_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    with op.batch_alter_table("task_changes", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_task_changes_assigned_to_id_id", ["assigned_to_id", "id"], unique=False
+        )
+        batch_op.create_index(
+            batch_op.f("ix_task_changes_changed_at"), ["changed_at"], unique=False
+        )
+        batch_op.create_index(
+            "ix_task_changes_owner_id_id", ["owner_id", "id"], unique=False
+        )
+        batch_op.create_index(
+            "ix_task_changes_previous_assigned_to_id_id",
+            ["previous_assigned_to_id", "id"],
+            unique=False,
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("task_changes", schema=None) as batch_op:
+        batch_op.drop_index("ix_task_changes_previous_assigned_to_id_id")
+        batch_op.drop_index("ix_task_changes_owner_id_id")
+        batch_op.drop_index(batch_op.f("ix_task_changes_changed_at"))
+        batch_op.drop_index("ix_task_changes_assigned_to_id_id")
+
+    op.drop_table("task_changes")
@@ -0,0 +1,85 @@
+"""Append-only file output that never blocks the event loop.
+
+Request-path code (traffic capture, the trace file exporter) hands complete
+lines to a BackgroundLineWriter. A daemon thread appends them to the file in
+batches, so a slow disk delays the records, not the responses. The queue is
+bounded: when the writer falls behind by max_pending lines, new lines are
+dropped and counted rather than buffered without limit. flush() waits for
+everything queued so far; close() also stops the thread (lifespan shutdown).
+"""
+
+import logging
+import queue
+import threading
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class BackgroundLineWriter:
+    """Appends text to a file from a background thread"""
+
+    def __init__(self, path: str, max_pending: int = 10_000) -> None:
+        self.path = path
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+
+    def write(self, text: str) -> None:
+        """Queue text (one or more complete lines) without waiting for the disk"""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(text)
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped == 1:
+                logger.warning("%s is falling behind; dropping lines", self.path)
+
+    def flush(self) -> None:
+        """Block until everything queued so far is on disk"""
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self) -> None:
+        """Write what is queued, then stop the thread (it restarts on write)"""
+        with self._start_lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join()
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name=f"writer:{self.path}", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = _STOP in batch
+            lines = [text for text in batch if text is not _STOP]
+            try:
+                if lines:
+                    with open(self.path, "a") as fh:
+                        fh.write("".join(lines))
+            except OSError as e:
+                logger.warning(
+                    "Could not write %d lines to %s: %s", len(lines), self.path, e
+                )
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stop:
+                return
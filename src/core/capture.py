@@ -0,0 +1,225 @@
+"""Traffic capture: sanitized request records for replay and capacity planning.
+
+When CAPTURE_ENABLED is set, TrafficCaptureMiddleware appends one JSON line
+per API request to CAPTURE_FILE, from a background thread so the disk never
+blocks the event loop (buffered lines are written out at shutdown). Records keep what a replay needs to
+reproduce the access pattern and nothing that identifies people or content:
+
+- method, route template and timing (start time, duration, status code);
+- the principal and path parameters as keyed pseudonyms (HMAC with the
+  secret key), so one user or task maps to the same token across records
+  without revealing the id;
+- the shape of the query and JSON/form body: key names and value types
+  ("str", "int", "uuid", "datetime", ...). Booleans and the values of
+  enum-like keys (SAFE_VALUE_KEYS: status, sort order, ...) are kept, since
+  they steer which queries run.
+
+``python -m benchmarks.replay`` re-issues a capture against a test instance.
+"""
+
+import hashlib
+import hmac
+import json
+import random
+import time
+from datetime import datetime
+from typing import Any
+from urllib.parse import parse_qsl
+from uuid import UUID
+
+import jwt
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config import settings
+from src.core.background_writer import BackgroundLineWriter
+from src.core.telemetry import route_template
+
+# Keys whose values are enum-like and safe to record verbatim
+SAFE_VALUE_KEYS = frozenset(
+    {"status", "sort_by", "sort_order", "limit", "include_archived", "overdue"}
+)
+
+
+def pseudonym(value: str) -> str:
+    """Stable, non-reversible token for an id (keyed with the secret key)"""
+    digest = hmac.new(settings.secret_key.encode(), value.encode(), hashlib.sha256)
+    return digest.hexdigest()[:16]
+
+
+def _scalar_shape(value: Any) -> Any:
+    if value is None or isinstance(value, bool):
+        return value
+    if isinstance(value, int):
+        return "int"
+    if isinstance(value, float):
+        return "float"
+    if isinstance(value, str):
+        try:
+            UUID(value)
+            return "uuid"
+        except ValueError:
+            pass
+        try:
+            datetime.fromisoformat(value.replace("Z", "+00:00"))
+            return "datetime"
+        except ValueError:
+            return "str"
+    return type(value).__name__
+
+
+def shape(value: Any, key: str | None = None) -> Any:
+    """Structure of a JSON value: dicts by key, lists as [length, item shape]"""
+    if isinstance(value, dict):
+        return {k: shape(v, k) for k, v in value.items()}
+    if isinstance(value, list):
+        return [len(value), shape(value[0]) if value else None]
+    if key in SAFE_VALUE_KEYS and isinstance(value, (str, int, bool)):
+        return value
+    return _scalar_shape(value)
+
+
+def query_shape(query_string: bytes) -> dict[str, Any]:
+    params = parse_qsl(query_string.decode("latin-1"), keep_blank_values=True)
+    return {key: shape(value, key) for key, value in params}
+
+
+def body_shape(content_type: str, body: bytes) -> tuple[str | None, Any]:
+    """(kind, shape) of a request body; kind is json, form, bytes or None"""
+    if not body:
+        return None, None
+    if content_type.startswith("application/json"):
+        try:
+            return "json", shape(json.loads(body))
+        except ValueError:
+            return "bytes", len(body)
+    if content_type.startswith("application/x-www-form-urlencoded"):
+        # Login credentials: never record values, not even their types
+        fields = parse_qsl(body.decode("latin-1"), keep_blank_values=True)
+        return "form", {key: "str" for key, _ in fields}
+    return "bytes", len(body)
+
+
+def principal(scope: Scope) -> str | None:
+    """Pseudonym of the bearer token's user, if the token is valid"""
+    for name, value in scope.get("headers", ()):
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer":
+                return None
+            try:
+                payload = jwt.decode(
+                    token, settings.secret_key, algorithms=[settings.algorithm]
+                )
+            except jwt.InvalidTokenError:
+                return None
+            sub = payload.get("sub")
+            return pseudonym(sub) if sub else None
+    return None
+
+
+class CaptureLog:
+    """Append-only JSON-lines file of captured requests, written off the loop"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._writer = BackgroundLineWriter(path)
+
+    def append(self, record: dict[str, Any]) -> None:
+        self._writer.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def flush(self) -> None:
+        """Wait until every appended record is in the file"""
+        self._writer.flush()
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+_log: CaptureLog | None = None
+
+
+def capture_log() -> CaptureLog:
+    """The log at CAPTURE_FILE, created on first use"""
+    global _log
+    if _log is None or _log.path != settings.capture_file:
+        if _log is not None:
+            _log.close()
+        _log = CaptureLog(settings.capture_file)
+    return _log
+
+
+def close_capture_log() -> None:
+    """Write out buffered records (lifespan shutdown)"""
+    if _log is not None:
+        _log.close()
+
+
+class TrafficCaptureMiddleware:
+    """Pure ASGI middleware recording sanitized /api requests when enabled"""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or not settings.capture_enabled
+            or not scope["path"].startswith("/api/")
+            or random.random() >= settings.capture_sample_rate
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        chunks: list[bytes] = []
+        size = 0
+        status_code = 500
+
+        async def receive_and_keep() -> Message:
+            nonlocal size
+            message = await receive()
+            if message["type"] == "http.request" and size <= settings.capture_max_body:
+                chunk = message.get("body", b"")
+                chunks.append(chunk)
+                size += len(chunk)
+            return message
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started_at = time.time()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive_and_keep, send_with_status)
+        finally:
+            duration = time.perf_counter() - start
+            route = route_template(scope)
+            if route != "unmatched":
+                content_type = ""
+                for name, value in scope.get("headers", ()):
+                    if name == b"content-type":
+                        content_type = value.decode("latin-1").lower()
+                        break
+                if size > settings.capture_max_body:
+                    kind, body = "bytes", size
+                else:
+                    kind, body = body_shape(content_type, b"".join(chunks))
+                capture_log().append(
+                    {
+                        "ts": round(started_at, 6),
+                        "method": scope["method"],
+                        "route": route,
+                        "path_params": {
+                            key: pseudonym(str(value))
+                            for key, value in scope.get("path_params", {}).items()
+                        },
+                        "query": query_shape(scope.get("query_string", b"")),
+                        "principal": principal(scope),
+                        "body_kind": kind,
+                        "body": body,
+                        "status": status_code,
+                        "duration_ms": round(duration * 1000, 3),
+                    }
+                )
@@ -0,0 +1,288 @@
+"""Event bus: fan-out of change events to every worker process.
+
+Services publish small JSON events (TASK_TOPIC, USER_TOPIC) after a write
+commits. publish() first runs the local handlers synchronously, so the
+worker that made the change is up to date before the response is sent, then
+hands the event to the backend, which delivers it to the handlers of every
+other worker. Consumers (the push hub, the autocomplete index) subscribe at
+import time, so they see each change exactly once whichever worker made it.
+
+Backends (EVENT_BUS_BACKEND):
+
+- ``memory``: workers attached to one InMemoryBroker, i.e. a single process.
+  The default, and what tests use to simulate several workers.
+- ``postgres``: LISTEN/NOTIFY on EVENT_BUS_CHANNEL over a dedicated asyncpg
+  connection. NOTIFY payloads are limited to ~8kB, so events on the wire
+  carry ids only; the publishing worker may hand its own handlers a richer
+  ``local`` payload (e.g. the task it just wrote) so it skips the reload.
+- a ``package.module:Class`` import path for anything else.
+
+Delivery to other workers is best effort, but gaps are never silent: when
+events may have been missed (the listener connection dropped, a NOTIFY
+failed or an event was too large to send), RESYNC_TOPIC is dispatched on
+the affected workers so consumers rebuild from the database instead of
+staying stale.
+"""
+
+import abc
+import asyncio
+import importlib
+import json
+import logging
+from typing import Any, Callable
+from uuid import uuid4
+
+from sqlalchemy.engine import make_url
+
+from src.config import settings
+from src.core.metrics import Counter
+
+logger = logging.getLogger(__name__)
+
+TASK_TOPIC = "task"
+USER_TOPIC = "user"
+RESYNC_TOPIC = "resync"
+
+NOTIFY_PAYLOAD_LIMIT = 7999
+
+EVENT_BUS_PUBLISHED = Counter(
+    "event_bus_published_total",
+    "Events published by this worker, by topic",
+    ("topic",),
+)
+EVENT_BUS_RECEIVED = Counter(
+    "event_bus_received_total",
+    "Events received from other workers, by topic",
+    ("topic",),
+)
+EVENT_BUS_ERRORS = Counter(
+    "event_bus_errors_total",
+    "Event handler failures and events that could not be sent",
+    ("stage",),
+)
+
+Handler = Callable[[dict[str, Any]], None]
+
+
+class EventBus(abc.ABC):
+    """Base class: local dispatch plus a transport to the other workers
+
+    Subclasses implement _send; start and stop are optional hooks.
+    """
+
+    def __init__(self) -> None:
+        self.worker_id = uuid4().hex
+        self._handlers: dict[str, list[Handler]] = {}
+
+    def subscribe(self, topic: str, handler: Handler) -> None:
+        """Run handler(data) for every event on topic, from any worker"""
+        self._handlers.setdefault(topic, []).append(handler)
+
+    def publish(
+        self,
+        topic: str,
+        data: dict[str, Any],
+        local: dict[str, Any] | None = None,
+    ) -> None:
+        """Dispatch locally now and send to the other workers without waiting
+
+        Local handlers get ``local`` if given (a superset of data that only
+        this worker has at hand), the other workers get data.
+        """
+        EVENT_BUS_PUBLISHED.inc(labels=(topic,))
+        self.dispatch(topic, data if local is None else local)
+        self._send(self._envelope(topic, data))
+
+    def _envelope(self, topic: str, data: dict[str, Any]) -> str:
+        envelope = {"topic": topic, "origin": self.worker_id, "data": data}
+        return json.dumps(envelope, separators=(",", ":"))
+
+    def dispatch(self, topic: str, data: dict[str, Any]) -> None:
+        """Run this worker's handlers; a failing handler does not stop the rest"""
+        for handler in self._handlers.get(topic, ()):
+            try:
+                handler(data)
+            except Exception:
+                EVENT_BUS_ERRORS.inc(labels=("handler",))
+                logger.exception("Event handler %r failed on %s", handler, topic)
+
+    def _receive(self, payload: str) -> None:
+        """Handle an envelope from the transport, skipping this worker's own"""
+        try:
+            envelope = json.loads(payload)
+        except ValueError:
+            EVENT_BUS_ERRORS.inc(labels=("decode",))
+            return
+        if envelope.get("origin") == self.worker_id:
+            return
+        EVENT_BUS_RECEIVED.inc(labels=(envelope["topic"],))
+        self.dispatch(envelope["topic"], envelope["data"])
+
+    @abc.abstractmethod
+    def _send(self, payload: str) -> None:
+        """Deliver an envelope to the other workers without blocking"""
+
+    async def start(self) -> None:
+        """Connect the transport (called from the lifespan hook)"""
+
+    async def stop(self) -> None:
+        """Disconnect the transport"""
+
+
+class InMemoryBroker:
+    """Connects the InMemoryEventBus instances of one process"""
+
+    def __init__(self) -> None:
+        self.buses: list["InMemoryEventBus"] = []
+
+
+class InMemoryEventBus(EventBus):
+    """Delivers to the other buses on the same broker, synchronously"""
+
+    def __init__(self, broker: InMemoryBroker | None = None) -> None:
+        super().__init__()
+        self.broker = broker or InMemoryBroker()
+        self.broker.buses.append(self)
+
+    def _send(self, payload: str) -> None:
+        for bus in self.broker.buses:
+            if bus is not self:
+                bus._receive(payload)
+
+
+def listen_dsn(database_url: str) -> str:
+    """A plain asyncpg DSN for a SQLAlchemy postgresql+asyncpg URL"""
+    url = make_url(database_url).set(drivername="postgresql")
+    return url.render_as_string(hide_password=False)
+
+
+class PostgresEventBus(EventBus):
+    """LISTEN/NOTIFY over one dedicated asyncpg connection per worker
+
+    The connection is outside the SQLAlchemy pool, so listening never takes
+    a pooled connection away from requests. NOTIFYs are sent from background
+    tasks on the same connection, serialized by a lock. If the connection
+    drops, it is reopened with backoff and RESYNC_TOPIC is dispatched.
+    """
+
+    def __init__(self, dsn: str, channel: str) -> None:
+        super().__init__()
+        self.dsn = dsn
+        self.channel = channel
+        self._conn: Any = None
+        self._lock = asyncio.Lock()
+        self._pending: set[asyncio.Task] = set()
+        self._reconnect_task: asyncio.Task | None = None
+        self._stopping = False
+        # Set when an event could not be sent: peers are told to resync
+        self._resync_peers = False
+
+    async def start(self) -> None:
+        self._stopping = False
+        await self._connect()
+
+    async def _connect(self) -> None:
+        import asyncpg
+
+        conn = await asyncpg.connect(self.dsn)
+        await conn.add_listener(self.channel, self._on_notify)
+        conn.add_termination_listener(self._on_terminated)
+        self._conn = conn
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        self._receive(payload)
+
+    def _on_terminated(self, connection) -> None:
+        self._conn = None
+        if not self._stopping and self._reconnect_task is None:
+            self._reconnect_task = asyncio.create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        delay = 0.5
+        try:
+            while not self._stopping:
+                await asyncio.sleep(delay)
+                try:
+                    await self._connect()
+                except Exception as e:
+                    logger.warning("Event bus reconnect failed: %s", e)
+                    delay = min(delay * 2, 30.0)
+                    continue
+                logger.info("Event bus reconnected; resynchronizing consumers")
+                # Events from peers were missed while disconnected, and peers
+                # missed ours if any were published meanwhile
+                self.dispatch(RESYNC_TOPIC, {})
+                if self._resync_peers:
+                    self._schedule(self._notify(None))
+                return
+        finally:
+            self._reconnect_task = None
+
+    def _send(self, payload: str) -> None:
+        if len(payload.encode()) > NOTIFY_PAYLOAD_LIMIT:
+            EVENT_BUS_ERRORS.inc(labels=("send",))
+            logger.warning("Event too large for NOTIFY (%d bytes)", len(payload))
+            self._resync_peers = True
+            payload = None
+        self._schedule(self._notify(payload))
+
+    def _schedule(self, coroutine) -> None:
+        try:
+            task = asyncio.get_running_loop().create_task(coroutine)
+        except RuntimeError:
+            coroutine.close()
+            return  # no event loop: nothing else can be listening either
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _notify(self, payload: str | None) -> None:
+        """Send payload, preceded by a resync if earlier events were lost"""
+        conn = self._conn
+        if conn is None:
+            EVENT_BUS_ERRORS.inc(labels=("send",))
+            self._resync_peers = True
+            return
+        try:
+            async with self._lock:
+                if self._resync_peers:
+                    self._resync_peers = False
+                    await conn.execute(
+                        "SELECT pg_notify($1, $2)",
+                        self.channel,
+                        self._envelope(RESYNC_TOPIC, {}),
+                    )
+                if payload is not None:
+                    await conn.execute(
+                        "SELECT pg_notify($1, $2)", self.channel, payload
+                    )
+        except Exception as e:
+            EVENT_BUS_ERRORS.inc(labels=("send",))
+            self._resync_peers = True
+            logger.warning("Could not publish event: %s", e)
+
+    async def stop(self) -> None:
+        self._stopping = True
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            await conn.close()
+
+
+def create_event_bus(backend: str) -> EventBus:
+    """memory, postgres (on DATABASE_URL) or a "package.module:Class" path"""
+    if backend == "memory":
+        return InMemoryEventBus()
+    if backend == "postgres":
+        return PostgresEventBus(
+            listen_dsn(settings.database_url), settings.event_bus_channel
+        )
+    module_name, _, class_name = backend.partition(":")
+    if not class_name:
+        raise ValueError(f"Unknown event bus backend: {backend}")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+event_bus = create_event_bus(settings.event_bus_backend)
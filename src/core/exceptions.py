@@ -0,0 +1,23 @@
+class VersionConflictError(Exception):
+    """Raised when a conditional update finds a newer version of the row"""
+
+    def __init__(self, current_version: int):
+        self.current_version = current_version
+        super().__init__(
+            f"Resource was modified concurrently (current version is {current_version})"
+        )
+
+
+class ConnectionLimitError(Exception):
+    """Raised when a user already holds the maximum number of push connections"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        super().__init__(f"Too many open event streams (limit is {limit})")
+
+
+class CursorExpiredError(Exception):
+    """Raised when a sync cursor is older than the change log's retention"""
+
+    def __init__(self) -> None:
+        super().__init__("Cursor has expired; fetch the full list and start over")
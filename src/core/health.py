@@ -0,0 +1,73 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseHealthMonitor:
+    """Checks the database on a timer so probes only read cached state.
+
+    One SELECT 1 per interval replaces one per probe, and a probe never
+    waits for (or competes with requests for) a pooled connection.
+    """
+
+    def __init__(self, engine: AsyncEngine, interval: float, timeout: float):
+        self.engine = engine
+        self.interval = interval
+        self.timeout = timeout
+        self.database_ok: bool | None = None  # None until the first check
+        self.last_checked: datetime | None = None
+        self.last_error: str | None = None
+        self.latency_ms: float | None = None
+        self._checked_monotonic: float | None = None
+
+    async def check(self) -> bool:
+        """Run one SELECT 1 and record the outcome"""
+        start = time.perf_counter()
+        try:
+            async with asyncio.timeout(self.timeout):
+                async with self.engine.connect() as conn:
+                    await conn.execute(text("SELECT 1"))
+            self.database_ok = True
+            self.last_error = None
+        except Exception as e:
+            if self.database_ok is not False:
+                logger.warning("Database health check failed: %s", e)
+            self.database_ok = False
+            self.last_error = str(e) or type(e).__name__
+        self.latency_ms = round((time.perf_counter() - start) * 1000, 2)
+        self.last_checked = datetime.now(timezone.utc)
+        self._checked_monotonic = time.monotonic()
+        return self.database_ok
+
+    @property
+    def is_stale(self) -> bool:
+        """Whether the cached result is too old to trust (checker stalled)"""
+        if self._checked_monotonic is None:
+            return True
+        return time.monotonic() - self._checked_monotonic > 3 * self.interval
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Refresh the cached status every interval until stop is set"""
+        while not stop.is_set():
+            await self.check()
+            try:
+                await asyncio.wait_for(stop.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def snapshot(self) -> dict:
+        """Cached status for the readiness endpoint"""
+        return {
+            "connected": bool(self.database_ok) and not self.is_stale,
+            "last_checked": (
+                self.last_checked.isoformat() if self.last_checked else None
+            ),
+            "latency_ms": self.latency_ms,
+            "error": self.last_error,
+        }
@@ -0,0 +1,251 @@
+"""Opt-in sampling profiler for individual requests.
+
+A request is profiled when it carries ``X-Profile: <PROFILING_TOKEN>`` or is
+picked at random with probability PROFILING_SAMPLE_RATE. While any profiled
+request is in flight, a daemon thread samples the event-loop thread's stack
+every PROFILING_INTERVAL_MS:
+
+- If the profiled request's middleware frame is on the stack, the request is
+  running: the frames above it are recorded as an on-CPU call stack.
+- Otherwise the request's task is suspended: its coroutine chain
+  (``cr_await``) is walked to record where it is awaiting, which splits
+  wall time into Python work versus time waiting on the database, bcrypt
+  threads and so on.
+
+Profiles are written as JSON with collapsed stacks (``a;b;c`` -> samples,
+the input format of flame graph tools) to PROFILING_DIR, keeping the most
+recent PROFILING_KEEP files.
+"""
+
+import asyncio
+import hmac
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from types import FrameType
+from uuid import uuid4
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config import settings
+from src.core.telemetry import route_template
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_qualname} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+
+class RequestProfile:
+    """Samples collected for one request"""
+
+    def __init__(self, root: FrameType, task: asyncio.Task, thread_id: int):
+        self.id = uuid4().hex
+        self.root = root
+        self.task = task
+        self.thread_id = thread_id
+        self.stacks: dict[str, int] = {}
+        self.awaits: dict[str, int] = {}
+
+    def sample(self, frame: FrameType | None) -> None:
+        """Attribute one stack sample of the event-loop thread to this request"""
+        stack = []
+        while frame is not None and frame is not self.root:
+            stack.append(_frame_label(frame))
+            frame = frame.f_back
+        if frame is self.root:
+            key = ";".join(reversed(stack)) or "<middleware>"
+            self.stacks[key] = self.stacks.get(key, 0) + 1
+            return
+
+        key = ";".join(self._await_chain()) or "<scheduling>"
+        self.awaits[key] = self.awaits.get(key, 0) + 1
+
+    def _await_chain(self) -> list[str]:
+        """Labels of the suspended coroutines below the root, outermost first"""
+        chain: list[str] = []
+        inside = False
+        awaitable = self.task.get_coro()
+        while awaitable is not None:
+            frame = getattr(awaitable, "cr_frame", None) or getattr(
+                awaitable, "gi_frame", None
+            )
+            if frame is None:
+                # A future or other leaf awaitable: name its type
+                if inside:
+                    chain.append(f"<{type(awaitable).__name__}>")
+                break
+            if inside:
+                chain.append(_frame_label(frame))
+            elif frame is self.root:
+                inside = True
+            awaitable = getattr(awaitable, "cr_await", None) or getattr(
+                awaitable, "gi_yieldfrom", None
+            )
+        return chain
+
+
+class Sampler:
+    """Daemon thread sampling stacks while at least one profile is active
+
+    Sampling happens under the lock, so once remove() returns the profile
+    is no longer written to.
+    """
+
+    def __init__(self) -> None:
+        self._profiles: dict[str, RequestProfile] = {}
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def add(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._profiles[profile.id] = profile
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="request-profiler", daemon=True
+                )
+                self._thread.start()
+
+    def remove(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._profiles.pop(profile.id, None)
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(settings.profiling_interval_ms / 1000)
+            with self._lock:
+                if not self._profiles:
+                    self._thread = None
+                    return
+                frames = sys._current_frames()
+                for profile in self._profiles.values():
+                    profile.sample(frames.get(profile.thread_id))
+
+
+sampler = Sampler()
+
+
+class ProfileStore:
+    """Most recent profiles as JSON files in one directory"""
+
+    def __init__(self, directory: str, keep: int):
+        self.directory = Path(directory)
+        self.keep = keep
+
+    def save(self, profile: dict) -> None:
+        """Write one profile and drop the oldest beyond keep"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{profile['started_at']}-{profile['id']}.json"
+        path.write_text(json.dumps(profile))
+        for old in self._files()[self.keep :]:
+            old.unlink(missing_ok=True)
+
+    def _files(self) -> list[Path]:
+        """Profile files, newest first (names start with the start time)"""
+        if not self.directory.is_dir():
+            return []
+        return sorted(self.directory.glob("*.json"), reverse=True)
+
+    def list(self) -> list[dict]:
+        """Summaries of the stored profiles, newest first"""
+        summaries = []
+        for path in self._files():
+            try:
+                profile = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue
+            summaries.append(
+                {k: v for k, v in profile.items() if k not in ("stacks", "awaits")}
+            )
+        return summaries
+
+    def get(self, profile_id: str) -> dict | None:
+        """One stored profile by id (as returned in X-Profile-Id)"""
+        if not profile_id.isalnum():
+            return None
+        for path in self.directory.glob(f"*-{profile_id}.json"):
+            return json.loads(path.read_text())
+        return None
+
+
+def profile_store() -> ProfileStore:
+    return ProfileStore(settings.profiling_dir, settings.profiling_keep)
+
+
+def should_profile(scope: Scope) -> bool:
+    """Authorized X-Profile header, or picked by the sampling rate"""
+    token = settings.profiling_token
+    if token:
+        for name, value in scope.get("headers", ()):
+            if name == PROFILE_HEADER:
+                return hmac.compare_digest(value.decode("latin-1"), token)
+    rate = settings.profiling_sample_rate
+    return rate > 0 and random.random() < rate
+
+
+class ProfilingMiddleware:
+    """Pure ASGI middleware that profiles the requests should_profile picks
+
+    Requests that are not picked pay for one header scan and nothing else.
+    Profiled responses carry X-Profile-Id naming the stored profile.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(
+            sys._getframe(), asyncio.current_task(), threading.get_ident()
+        )
+
+        async def send_with_profile_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message = {
+                    **message,
+                    "headers": [
+                        *message.get("headers", ()),
+                        (b"x-profile-id", profile.id.encode()),
+                    ],
+                }
+            await send(message)
+
+        started_at = datetime.now(timezone.utc)
+        start = time.perf_counter()
+        sampler.add(profile)
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            sampler.remove(profile)
+            duration = time.perf_counter() - start
+            interval_ms = settings.profiling_interval_ms
+            result = {
+                "id": profile.id,
+                "started_at": started_at.strftime("%Y%m%dT%H%M%S.%fZ"),
+                "method": scope["method"],
+                "path": scope["path"],
+                "route": route_template(scope),
+                "duration_ms": round(duration * 1000, 2),
+                "interval_ms": interval_ms,
+                "cpu_samples": sum(profile.stacks.values()),
+                "await_samples": sum(profile.awaits.values()),
+                "stacks": profile.stacks,
+                "awaits": profile.awaits,
+            }
+            try:
+                await asyncio.to_thread(profile_store().save, result)
+            except OSError as e:
+                logger.warning("Could not store profile %s: %s", profile.id, e)
@@ -0,0 +1,247 @@
+"""In-process pub/sub of task changes for push connections.
+
+TaskService publishes a TaskEvent after each committed create, update,
+delete and restore; the hub fans it out to the subscriptions of the task's
+owner and assignee (and the previous assignee on reassignment). Each open
+GET /api/tasks/events stream holds one subscription with a bounded queue.
+
+Publishing never waits on subscribers. When a subscriber's queue is full its
+buffered events are dropped and the stream ends with a ``resync`` event:
+the client reconnects and refetches, instead of a slow consumer holding up
+writers or buffering without bound. Events reach the hub through the event
+bus (src.core.event_bus), so a stream sees changes made through any worker;
+if the bus may have missed events, every stream is cut off with ``resync``.
+
+On the bus a task event is only (type, task_id, recipients). The worker
+that made the change pushes the task it already has; the others load it
+with the hub's loader, and only when a recipient has a stream open there.
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import AsyncIterator, Awaitable, Callable, Iterable
+from uuid import UUID
+
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from src.config import settings
+from src.core.event_bus import RESYNC_TOPIC, TASK_TOPIC, event_bus
+from src.core.exceptions import ConnectionLimitError
+from src.core.metrics import Counter, Gauge
+from src.models import TaskEvent, TaskEventType, TaskResponse
+
+logger = logging.getLogger(__name__)
+
+TaskLoader = Callable[[UUID], Awaitable[TaskResponse | None]]
+
+PUSH_CONNECTIONS = Gauge(
+    "task_push_connections",
+    "Open task event streams",
+)
+PUSH_EVENTS = Counter(
+    "task_push_events_total",
+    "Task events queued for push connections",
+)
+PUSH_OVERFLOWS = Counter(
+    "task_push_overflows_total",
+    "Push connections cut off because their queue was full",
+)
+
+
+class Subscription:
+    """One push connection's bounded queue of events"""
+
+    def __init__(self, user_id: UUID, maxsize: int):
+        self.user_id = user_id
+        self.queue: asyncio.Queue[TaskEvent | None] = asyncio.Queue(maxsize)
+        self.overflowed = False
+
+    def offer(self, event: TaskEvent) -> bool:
+        """Queue an event without waiting; on a full queue, cut the subscriber off"""
+        if self.overflowed:
+            return False
+        try:
+            self.queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            self.cut_off()
+            PUSH_OVERFLOWS.inc()
+            return False
+
+    def cut_off(self) -> None:
+        """Drop buffered events so the stream ends with a resync"""
+        self.overflowed = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        # Wakes the consumer, which sees overflowed and ends the stream
+        self.queue.put_nowait(None)
+
+    async def next(self, timeout: float) -> TaskEvent | None:
+        """The next event, or None after timeout seconds or once overflowed"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class TaskEventHub:
+    """Routes task events to the subscriptions of their recipients"""
+
+    def __init__(self) -> None:
+        self._subscriptions: dict[UUID, set[Subscription]] = {}
+        # Reads a task's current state for events published by other workers
+        self.loader: TaskLoader | None = None
+        self._loads: set[asyncio.Task] = set()
+
+    def subscribe(self, user_id: UUID) -> Subscription:
+        """Open a subscription (push_max_connections_per_user per user)"""
+        subscriptions = self._subscriptions.setdefault(user_id, set())
+        if len(subscriptions) >= settings.push_max_connections_per_user:
+            raise ConnectionLimitError(settings.push_max_connections_per_user)
+        subscription = Subscription(user_id, settings.push_queue_size)
+        subscriptions.add(subscription)
+        PUSH_CONNECTIONS.inc()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscriptions = self._subscriptions.get(subscription.user_id)
+        if subscriptions and subscription in subscriptions:
+            subscriptions.discard(subscription)
+            PUSH_CONNECTIONS.dec()
+            if not subscriptions:
+                del self._subscriptions[subscription.user_id]
+
+    def publish(self, event: TaskEvent, recipients: Iterable[UUID | None]) -> int:
+        """Queue the event for every subscription of each recipient"""
+        delivered = 0
+        for user_id in {r for r in recipients if r is not None}:
+            for subscription in list(self._subscriptions.get(user_id, ())):
+                delivered += subscription.offer(event)
+        if delivered:
+            PUSH_EVENTS.inc(delivered)
+        return delivered
+
+    def publish_remote(
+        self,
+        event_type: TaskEventType,
+        task_id: UUID,
+        recipients: list[UUID],
+        occurred_at: datetime,
+    ) -> None:
+        """Deliver an event from another worker, loading the task if needed"""
+        if not any(self._subscriptions.get(user_id) for user_id in recipients):
+            return
+        if event_type == TaskEventType.DELETED:
+            event = TaskEvent(type=event_type, task_id=task_id, occurred_at=occurred_at)
+            self.publish(event, recipients)
+            return
+        load = asyncio.get_running_loop().create_task(
+            self._load_and_publish(event_type, task_id, recipients, occurred_at)
+        )
+        self._loads.add(load)
+        load.add_done_callback(self._loads.discard)
+
+    async def _load_and_publish(
+        self,
+        event_type: TaskEventType,
+        task_id: UUID,
+        recipients: list[UUID],
+        occurred_at: datetime,
+    ) -> None:
+        try:
+            if self.loader is None:
+                raise RuntimeError("No task loader configured")
+            task = await self.loader(task_id)
+        except Exception:
+            logger.exception("Could not load task %s for push", task_id)
+            self.resync(recipients)
+            return
+        if task is None:
+            return  # deleted meanwhile; its delete event follows
+        event = TaskEvent(
+            type=event_type, task_id=task_id, task=task, occurred_at=occurred_at
+        )
+        self.publish(event, recipients)
+
+    def resync(self, user_ids: Iterable[UUID]) -> None:
+        """Cut off the given users' subscriptions so their clients refetch"""
+        for user_id in set(user_ids):
+            for subscription in self._subscriptions.get(user_id, ()):
+                if not subscription.overflowed:
+                    subscription.cut_off()
+
+    def resync_all(self) -> None:
+        """Cut off every subscription, e.g. after events may have been missed"""
+        self.resync(list(self._subscriptions))
+
+    def subscriber_count(self, user_id: UUID | None = None) -> int:
+        if user_id is not None:
+            return len(self._subscriptions.get(user_id, ()))
+        return sum(len(subs) for subs in self._subscriptions.values())
+
+
+task_events = TaskEventHub()
+
+
+def _on_task_event(data: dict) -> None:
+    recipients = [UUID(r) for r in data["recipients"]]
+    if "event" in data:  # published by this worker, with the task attached
+        task_events.publish(data["event"], recipients)
+        return
+    task_events.publish_remote(
+        TaskEventType(data["type"]),
+        UUID(data["task_id"]),
+        recipients,
+        datetime.fromisoformat(data["occurred_at"]),
+    )
+
+
+event_bus.subscribe(TASK_TOPIC, _on_task_event)
+event_bus.subscribe(RESYNC_TOPIC, lambda _: task_events.resync_all())
+
+
+def sse_message(event: str, data: str) -> str:
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+class EventStreamResponse(StreamingResponse):
+    """text/event-stream response that closes its generator however it ends
+
+    On ASGI 2.4 servers a client disconnect surfaces as an error from send(),
+    and Starlette leaves the generator suspended until garbage collection;
+    closing it here releases the subscription right away.
+    """
+
+    media_type = "text/event-stream"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self.body_iterator.aclose()
+
+
+async def sse_stream(
+    subscription: Subscription, hub: TaskEventHub = task_events
+) -> AsyncIterator[str]:
+    """Server-Sent Events for a subscription, with keep-alive comments
+
+    Ends after a ``resync`` event if the subscription overflowed; the
+    subscription is closed whenever the stream stops, including when the
+    client disconnects.
+    """
+    try:
+        yield sse_message("ready", "{}")
+        while True:
+            event = await subscription.next(settings.push_heartbeat_seconds)
+            if subscription.overflowed:
+                yield sse_message("resync", "{}")
+                return
+            if event is None:
+                yield ": keep-alive\n\n"
+                continue
+            yield sse_message(f"task.{event.type.value}", event.model_dump_json())
+    finally:
+        hub.unsubscribe(subscription)
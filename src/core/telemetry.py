@@ -0,0 +1,212 @@
+"""Request telemetry: pure ASGI metrics middleware and SQLAlchemy query hooks.
+
+MetricsMiddleware times every HTTP request and labels it with the matched
+route template (never the raw path, which would explode label cardinality).
+Each request gets a RequestStats object in a context variable; the cursor
+event hooks on Engine add every statement's count and duration to it, so the
+per-request database totals need no plumbing through services or
+repositories. Contexts propagate into SQLAlchemy's greenlets, so the hooks
+see the request that issued the query.
+
+The same stats drive N+1 detection (a statement repeated within one request
+is logged and counted), the optional X-DB-* debug headers and, through
+capture_queries(), the query-budget assertions in the tests.
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config import settings
+from src.core.metrics import Counter, Gauge, Histogram
+
+logger = logging.getLogger(__name__)
+
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by method and route template",
+    ("method", "route"),
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being served",
+)
+HTTP_RESPONSES = Counter(
+    "http_responses_total",
+    "HTTP responses by method, route template and status code",
+    ("method", "route", "status"),
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "http_request_db_queries",
+    "SQL statements executed per HTTP request",
+    ("method", "route"),
+    buckets=QUERY_COUNT_BUCKETS,
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "http_request_db_seconds",
+    "Time spent executing SQL per HTTP request",
+    ("method", "route"),
+)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "Execution time of individual SQL statements",
+)
+DB_REPEATED_STATEMENTS = Counter(
+    "http_request_repeated_statements_total",
+    "Requests that ran one SQL statement n_plus_one_threshold+ times (likely N+1)",
+    ("method", "route"),
+)
+
+
+class RequestStats:
+    """Database work done on behalf of one request (or a capture_queries block)
+
+    Statements are counted by SQL text, so the same statement run with
+    different parameters, the signature of an N+1 pattern, accumulates under
+    one key. Stats nest: a request served inside capture_queries() also
+    counts towards the enclosing block.
+    """
+
+    __slots__ = ("queries", "db_seconds", "statements", "parent")
+
+    def __init__(self, parent: "RequestStats | None" = None) -> None:
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.statements: dict[str, int] = {}
+        self.parent = parent
+
+    def record(self, statement: str, elapsed: float) -> None:
+        stats: RequestStats | None = self
+        while stats is not None:
+            stats.queries += 1
+            stats.db_seconds += elapsed
+            stats.statements[statement] = stats.statements.get(statement, 0) + 1
+            stats = stats.parent
+
+    def repeated(self, threshold: int | None = None) -> dict[str, int]:
+        """Statements executed at least threshold times (n_plus_one_threshold)"""
+        threshold = threshold or settings.n_plus_one_threshold
+        return {
+            statement: count
+            for statement, count in self.statements.items()
+            if count >= threshold
+        }
+
+
+current_request_stats: ContextVar[RequestStats | None] = ContextVar(
+    "current_request_stats", default=None
+)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    DB_QUERY_DURATION.observe(elapsed)
+    stats = current_request_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context):
+    # after_cursor_execute does not run for failed statements
+    connection = context.connection
+    if connection is not None and connection.info.get("query_started"):
+        connection.info["query_started"].pop()
+
+
+@contextmanager
+def capture_queries() -> Iterator[RequestStats]:
+    """Collect the SQL run inside the block, including by requests it serves"""
+    stats = RequestStats(parent=current_request_stats.get())
+    token = current_request_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        current_request_stats.reset(token)
+
+
+def route_template(scope: Scope) -> str:
+    """Template of the matched route, e.g. /api/tasks/{task_id}"""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+def query_debug_headers(stats: RequestStats) -> list[tuple[bytes, bytes]]:
+    """X-DB-* response headers describing the request's queries so far"""
+    return [
+        (b"x-db-query-count", str(stats.queries).encode()),
+        (b"x-db-query-time-ms", f"{stats.db_seconds * 1000:.2f}".encode()),
+        (b"x-db-repeated-statements", str(len(stats.repeated())).encode()),
+    ]
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording latency, status and DB work per route
+
+    Written against the raw ASGI interface rather than BaseHTTPMiddleware so
+    it adds no extra task or response wrapping to each request.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(parent=current_request_stats.get())
+        token = current_request_stats.set(stats)
+        status_code = 500  # if the app raises before responding
+        debug_headers = settings.query_debug_headers
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if debug_headers:
+                    message = {
+                        **message,
+                        "headers": [
+                            *message.get("headers", ()),
+                            *query_debug_headers(stats),
+                        ],
+                    }
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            current_request_stats.reset(token)
+
+            labels = (scope["method"], route_template(scope))
+            HTTP_REQUEST_DURATION.observe(elapsed, labels)
+            HTTP_RESPONSES.inc(labels=(*labels, str(status_code)))
+            DB_QUERIES_PER_REQUEST.observe(stats.queries, labels)
+            DB_TIME_PER_REQUEST.observe(stats.db_seconds, labels)
+            repeated = stats.repeated()
+            if repeated:
+                DB_REPEATED_STATEMENTS.inc(labels=labels)
+                logger.warning(
+                    "Possible N+1 in %s %s: %s",
+                    *labels,
+                    "; ".join(f"{n}x {sql[:120]}" for sql, n in repeated.items()),
+                )
@@ -0,0 +1,357 @@
+"""Lightweight request tracing across router, service, repository and SQL layers.
+
+TracingMiddleware opens a server span per request, continuing the caller's
+trace when a W3C ``traceparent`` header is present. Child spans come from:
+
+- TracedRoute: the router handler (dependencies, endpoint, serialization);
+- @traced("service") / @traced("repository") on the service and repository
+  classes: every public async method;
+- Engine cursor hooks: every SQL statement;
+- start_span("bcrypt.*") around password hashing and verification.
+
+Spans are only created inside a sampled trace, so with tracing disabled each
+instrumented call costs one context-variable lookup. Finished traces go to
+a pluggable exporter as a batch per request; the root span also carries the
+request's total SQL time so latency splits into database and Python time.
+"""
+
+import functools
+import importlib
+import inspect
+import json
+import logging
+import os
+import random
+import sys
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator, Protocol
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config import settings
+from src.core.background_writer import BackgroundLineWriter
+from src.core.telemetry import route_template
+
+logger = logging.getLogger(__name__)
+
+TRACEPARENT_HEADER = b"traceparent"
+
+
+class Span:
+    """One timed operation within a trace"""
+
+    __slots__ = (
+        "trace",
+        "span_id",
+        "parent_id",
+        "name",
+        "layer",
+        "attributes",
+        "start_ns",
+        "end_ns",
+        "status",
+    )
+
+    def __init__(
+        self,
+        trace: "Trace",
+        name: str,
+        layer: str,
+        parent_id: str | None,
+        attributes: dict[str, Any] | None = None,
+    ):
+        self.trace = trace
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.layer = layer
+        self.attributes = attributes or {}
+        self.start_ns = time.time_ns()
+        self.end_ns: int | None = None
+        self.status = "ok"
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "trace_id": self.trace.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "layer": self.layer,
+            "start_ns": self.start_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class Trace:
+    """Spans recorded for one request, exported together when it ends"""
+
+    __slots__ = ("trace_id", "spans")
+
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.spans: list[Span] = []
+
+
+current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+@contextmanager
+def start_span(name: str, layer: str = "internal", **attributes: Any) -> Iterator:
+    """Record a child of the current span; a no-op outside a sampled trace"""
+    parent = current_span.get()
+    if parent is None:
+        yield None
+        return
+    span = Span(parent.trace, name, layer, parent.span_id, attributes)
+    parent.trace.spans.append(span)
+    token = current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.status = "error"
+        span.attributes["error.type"] = type(e).__name__
+        raise
+    finally:
+        span.end_ns = time.time_ns()
+        current_span.reset(token)
+
+
+def traced(layer: str) -> Callable[[type], type]:
+    """Class decorator: a span around every public async method of the class"""
+
+    def decorate(cls: type) -> type:
+        for attr, value in list(vars(cls).items()):
+            if attr.startswith("_") or not inspect.iscoroutinefunction(value):
+                continue
+            setattr(cls, attr, _traced_method(value, f"{cls.__name__}.{attr}", layer))
+        return cls
+
+    return decorate
+
+
+def _traced_method(func: Callable, name: str, layer: str) -> Callable:
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        if current_span.get() is None:
+            return await func(*args, **kwargs)
+        with start_span(name, layer):
+            return await func(*args, **kwargs)
+
+    return wrapper
+
+
+class TracedRoute(APIRoute):
+    """APIRoute whose handler (dependencies, endpoint, serialization) is a span"""
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        name = f"handler {self.endpoint.__name__}"
+
+        async def traced_handler(request):
+            if current_span.get() is None:
+                return await handler(request)
+            with start_span(name, "router", **{"http.route": self.path}):
+                return await handler(request)
+
+        return traced_handler
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    parent = current_span.get()
+    if parent is None:
+        return
+    span = Span(
+        parent.trace, "sql", "db", parent.span_id, {"db.statement": statement[:500]}
+    )
+    parent.trace.spans.append(span)
+    conn.info.setdefault("trace_spans", []).append(span)
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    spans = conn.info.get("trace_spans")
+    if spans:
+        spans.pop().end_ns = time.time_ns()
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context):
+    connection = context.connection
+    spans = connection.info.get("trace_spans") if connection is not None else None
+    if spans:
+        span = spans.pop()
+        span.end_ns = time.time_ns()
+        span.status = "error"
+
+
+class SpanExporter(Protocol):
+    """Receives each finished trace's spans (the root span last)"""
+
+    def export(self, spans: list[Span]) -> None: ...
+
+
+class StdoutExporter:
+    """One JSON object per span on stdout"""
+
+    def export(self, spans: list[Span]) -> None:
+        sys.stdout.write("".join(json.dumps(s.to_dict()) + "\n" for s in spans))
+        sys.stdout.flush()
+
+
+class FileExporter:
+    """One JSON object per span, appended to a local file off the event loop"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._writer = BackgroundLineWriter(path)
+
+    def export(self, spans: list[Span]) -> None:
+        self._writer.write("".join(json.dumps(s.to_dict()) + "\n" for s in spans))
+
+    def flush(self) -> None:
+        """Wait until every exported span is in the file"""
+        self._writer.flush()
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+class InMemoryExporter:
+    """Keeps exported spans in a list (tests, ad hoc inspection)"""
+
+    def __init__(self) -> None:
+        self.spans: list[Span] = []
+
+    def export(self, spans: list[Span]) -> None:
+        self.spans.extend(spans)
+
+
+def load_exporter(name: str) -> SpanExporter:
+    """stdout, file (TRACING_FILE) or a "package.module:Class" import path"""
+    if name == "stdout":
+        return StdoutExporter()
+    if name == "file":
+        return FileExporter(settings.tracing_file)
+    module_name, _, class_name = name.partition(":")
+    if not class_name:
+        raise ValueError(f"Unknown tracing exporter: {name}")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+_exporter: SpanExporter | None = None
+
+
+def get_exporter() -> SpanExporter:
+    """The configured exporter, created on first use (TRACING_EXPORTER)"""
+    global _exporter
+    if _exporter is None:
+        _exporter = load_exporter(settings.tracing_exporter)
+    return _exporter
+
+
+def close_exporter() -> None:
+    """Write out spans the exporter still buffers (lifespan shutdown)"""
+    close = getattr(_exporter, "close", None)
+    if close is not None:
+        close()
+
+
+def set_exporter(exporter: SpanExporter | None) -> None:
+    """Replace the exporter; None reloads it from settings on next use"""
+    global _exporter
+    _exporter = exporter
+
+
+def parse_traceparent(value: str) -> tuple[str, str, bool] | None:
+    """(trace_id, parent span_id, sampled) from a W3C traceparent header"""
+    parts = value.strip().split("-")
+    if len(parts) < 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    version, trace_id, parent_id, flags = parts[:4]
+    try:
+        int(trace_id, 16), int(parent_id, 16)
+        sampled = bool(int(flags, 16) & 1)
+    except ValueError:
+        return None
+    if version == "ff" or trace_id == "0" * 32 or parent_id == "0" * 16:
+        return None
+    return trace_id, parent_id, sampled
+
+
+class TracingMiddleware:
+    """Pure ASGI middleware opening the server span of each sampled request"""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.tracing_enabled:
+            await self.app(scope, receive, send)
+            return
+
+        incoming = None
+        for name, value in scope.get("headers", ()):
+            if name == TRACEPARENT_HEADER:
+                incoming = parse_traceparent(value.decode("latin-1"))
+                break
+        if incoming is not None:
+            trace_id, parent_id, sampled = incoming
+        else:
+            trace_id, parent_id = os.urandom(16).hex(), None
+            sampled = random.random() < settings.tracing_sample_rate
+        if not sampled:
+            await self.app(scope, receive, send)
+            return
+
+        trace = Trace(trace_id)
+        root = Span(trace, scope["method"], "server", parent_id)
+        token = current_span.set(root)
+
+        async def send_with_trace_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                root.attributes["http.status_code"] = message["status"]
+                message = {
+                    **message,
+                    "headers": [
+                        *message.get("headers", ()),
+                        (b"x-trace-id", trace_id.encode()),
+                    ],
+                }
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_trace_id)
+        except BaseException:
+            root.status = "error"
+            raise
+        finally:
+            root.end_ns = time.time_ns()
+            current_span.reset(token)
+            route = route_template(scope)
+            root.name = f"{scope['method']} {route}"
+            sql = [span for span in trace.spans if span.layer == "db"]
+            db_ms = sum(span.duration_ms for span in sql)
+            root.attributes.update(
+                {
+                    "http.route": route,
+                    "db.statements": len(sql),
+                    "db.time_ms": round(db_ms, 3),
+                    "python.time_ms": round(root.duration_ms - db_ms, 3),
+                }
+            )
+            try:
+                get_exporter().export([*trace.spans, root])
+            except Exception as e:
+                logger.warning("Could not export trace %s: %s", trace_id, e)
@@ -0,0 +1,90 @@
+from bisect import bisect_left, insort
+from uuid import UUID
+
+from src.core.event_bus import USER_TOPIC, event_bus
+from src.models import UserSummary
+
+
+class UserPrefixIndex:
+    """In-process sorted-array index for assignee autocomplete.
+
+    Every user is indexed under the lowercased email, full name and each word
+    of the name. Lookups are a binary search plus a short scan, so they never
+    touch the database. The index is built at startup and kept current by the
+    user events UserService publishes on register/update; each worker holds
+    its own copy, updated through the event bus.
+    """
+
+    def __init__(self) -> None:
+        self._entries: list[tuple[str, UUID]] = []
+        self._keys_by_user: dict[UUID, list[str]] = {}
+        self._users: dict[UUID, UserSummary] = {}
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    @staticmethod
+    def _keys_for(user: UserSummary) -> list[str]:
+        name = user.name.lower()
+        keys = {user.email.lower(), name, *name.split()}
+        return sorted(key for key in keys if key)
+
+    def clear(self) -> None:
+        """Drop every entry"""
+        self._entries.clear()
+        self._keys_by_user.clear()
+        self._users.clear()
+
+    def build(self, users: list[UserSummary]) -> None:
+        """Replace the index contents with the given users"""
+        self.clear()
+        for user in users:
+            keys = self._keys_for(user)
+            self._keys_by_user[user.id] = keys
+            self._users[user.id] = user
+            self._entries.extend((key, user.id) for key in keys)
+        self._entries.sort()
+
+    def remove(self, user_id: UUID) -> None:
+        """Remove a user's entries, if present"""
+        for key in self._keys_by_user.pop(user_id, []):
+            entry = (key, user_id)
+            position = bisect_left(self._entries, entry)
+            if position < len(self._entries) and self._entries[position] == entry:
+                del self._entries[position]
+        self._users.pop(user_id, None)
+
+    def upsert(self, user: UserSummary) -> None:
+        """Insert a user or refresh its entries after a name/email change"""
+        self.remove(user.id)
+        keys = self._keys_for(user)
+        self._keys_by_user[user.id] = keys
+        self._users[user.id] = user
+        for key in keys:
+            insort(self._entries, (key, user.id))
+
+    def search(self, prefix: str, limit: int = 10) -> list[UserSummary]:
+        """Users whose email, name or a name word starts with prefix"""
+        prefix = prefix.strip().lower()
+        if not prefix:
+            return []
+
+        matches: list[UserSummary] = []
+        seen: set[UUID] = set()
+        position = bisect_left(self._entries, (prefix,))
+        while position < len(self._entries) and len(matches) < limit:
+            key, user_id = self._entries[position]
+            if not key.startswith(prefix):
+                break
+            if user_id not in seen:
+                seen.add(user_id)
+                matches.append(self._users[user_id])
+            position += 1
+        return matches
+
+
+user_index = UserPrefixIndex()
+
+event_bus.subscribe(
+    USER_TOPIC, lambda data: user_index.upsert(UserSummary.model_validate(data))
+)
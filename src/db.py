@@ -1,19 +1,276 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+import functools
+import random
+import time
+from typing import Any, Awaitable, Callable, ParamSpec, TypeVar
+
+from sqlalchemy import event, exc, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    create_async_engine,
+    async_sessionmaker,
+)
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.sql.dml import UpdateBase
 from sqlmodel import SQLModel
 from src.config import settings
+from src.core.health import DatabaseHealthMonitor
+from src.core.metrics import Counter, Gauge, Histogram
+
+# Alembic head revision this code expects (see migrations/versions)
+SCHEMA_REVISION = "0006"
+
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled connection",
+    ("pool",),
+)
+POOL_OVERFLOW = Counter(
+    "db_pool_overflow_total",
+    "Checkouts that had to open an overflow connection",
+    ("pool",),
+)
+POOL_TIMEOUTS = Counter(
+    "db_pool_timeouts_total",
+    "Checkouts that gave up after pool_timeout",
+    ("pool",),
+)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool that records checkout wait, overflow and timeouts per pool"""
+
+    def _do_get(self):
+        label = (self.logging_name or "primary",)
+        overflow_before = self.overflow()
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            POOL_TIMEOUTS.inc(labels=label)
+            raise
+        finally:
+            POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start, label)
+        # overflow() starts at -pool_size; it only counts as overflow above 0
+        if self.overflow() > max(overflow_before, 0):
+            POOL_OVERFLOW.inc(labels=label)
+        return connection
+
+
+def engine_options(url: str, pool_name: str = "primary") -> dict[str, Any]:
+    """Pool and driver options from settings; SQLite keeps its own pooling"""
+    drivername = make_url(url).drivername
+    if drivername.startswith("sqlite"):
+        return {}
+    options: dict[str, Any] = {
+        "poolclass": InstrumentedPool,
+        "pool_logging_name": pool_name,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+    if drivername == "postgresql+asyncpg":
+        options["connect_args"] = {
+            "statement_cache_size": settings.db_statement_cache_size
+        }
+    return options
+
+
+class ReplicaRouter:
+    """Chooses the engine for each statement of a RoutingSession.
+
+    Writes, locking reads (SELECT ... FOR UPDATE) and everything after the
+    first of them in a session go to the primary. Plain reads go to a random
+    replica unless the session's sticky key (the authenticated user) wrote
+    something within the last sticky_seconds, which gives read-your-writes
+    across requests despite replication lag.
+
+    The last-write times live in this process only: the guarantee holds for
+    requests served by the same worker. A user's next request on another
+    worker may read a replica that has not caught up yet. Route a user's
+    requests to one worker (sticky load balancing) where that matters.
+    """
+
+    def __init__(
+        self,
+        primary: AsyncEngine,
+        replicas: list[AsyncEngine],
+        sticky_seconds: float,
+    ):
+        self.primary = primary
+        self.replicas = replicas
+        self.sticky_seconds = sticky_seconds
+        self._last_write: dict[str, float] = {}
+
+    def record_write(self, key: str | None) -> None:
+        """Start (or extend) the read-your-writes window for a key"""
+        if key is None:
+            return
+        now = time.monotonic()
+        self._last_write[key] = now
+        if len(self._last_write) > 10_000:
+            cutoff = now - self.sticky_seconds
+            self._last_write = {
+                k: t for k, t in self._last_write.items() if t >= cutoff
+            }
+
+    def is_sticky(self, key: str | None) -> bool:
+        """Whether reads for this key must still go to the primary"""
+        if key is None:
+            return False
+        written = self._last_write.get(key)
+        return written is not None and time.monotonic() - written < self.sticky_seconds
+
+
+class RoutingSession(Session):
+    """Sync session class behind AsyncSession that routes reads to replicas"""
+
+    def __init__(self, *args: Any, router: ReplicaRouter, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.router = router
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        router = self.router
+        sticky_key = self.info.get("sticky_key")
+        locking = getattr(clause, "_for_update_arg", None) is not None
+        if self._flushing or isinstance(clause, UpdateBase) or locking:
+            self.info["wrote"] = True
+            router.record_write(sticky_key)
+        if (
+            not router.replicas
+            or self.info.get("wrote")
+            or self.info.get("primary")
+            or router.is_sticky(sticky_key)
+        ):
+            return router.primary.sync_engine
+        return random.choice(router.replicas).sync_engine
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _extend_sticky_window(session: Session) -> None:
+    """Measure the read-your-writes window from the commit, not the first write"""
+    if session.info.get("wrote"):
+        session.router.record_write(session.info.get("sticky_key"))  # type: ignore[attr-defined]
+
+
+def set_session_principal(session: AsyncSession, user_id: Any) -> None:
+    """Tie a session to a user so it honours that user's read-your-writes window
+
+    The window is tracked per worker process; see ReplicaRouter.
+    """
+    session.info["sticky_key"] = str(user_id)
+
+
+def pin_to_primary(session: AsyncSession) -> None:
+    """Send every statement of a session to the primary, reads included
+
+    For jobs whose reads decide what they write (a watermark, a scan that
+    must see the latest rows), where a lagging replica would skip work.
+    """
+    session.info["primary"] = True
+
+
+def make_session_factory(
+    primary: AsyncEngine,
+    replicas: list[AsyncEngine] | None = None,
+    sticky_seconds: float = 0.0,
+) -> async_sessionmaker[AsyncSession]:
+    """Build a session factory, routing reads to replicas when any are given"""
+    if not replicas:
+        return async_sessionmaker(
+            primary,
+            class_=AsyncSession,
+            expire_on_commit=False,
+        )
+    return async_sessionmaker(
+        class_=AsyncSession,
+        sync_session_class=RoutingSession,
+        expire_on_commit=False,
+        router=ReplicaRouter(primary, replicas, sticky_seconds),
+    )
+
 
 # Create async engine
 engine = create_async_engine(
     settings.database_url,
     echo=False,  # Set to True for SQL logging
     future=True,
+    **engine_options(settings.database_url),
 )
 
-# Session factory - use async_sessionmaker for async context manager support
-AsyncSessionLocal = async_sessionmaker(
+# Optional read replicas (comma-separated DATABASE_REPLICA_URLS)
+replica_engines = [
+    create_async_engine(
+        url, echo=False, future=True, **engine_options(url, f"replica{i}")
+    )
+    for i, url in enumerate(
+        url.strip() for url in settings.database_replica_urls.split(",")
+    )
+    if url
+]
+
+
+def pool_status() -> dict[str, dict[str, int]]:
+    """Current size/in-use/idle/overflow of every instrumented pool"""
+    status: dict[str, dict[str, int]] = {}
+    for name, eng in [("primary", engine)] + [
+        (f"replica{i}", replica) for i, replica in enumerate(replica_engines)
+    ]:
+        pool = eng.pool
+        if isinstance(pool, AsyncAdaptedQueuePool):
+            status[name] = {
+                "size": pool.size(),
+                "max_overflow": settings.db_max_overflow,
+                "in_use": pool.checkedout(),
+                "idle": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+            }
+    return status
+
+
+def pool_saturation() -> float:
+    """Highest in_use / (pool_size + max_overflow) across instrumented pools"""
+    return max(
+        (
+            stats["in_use"] / max(stats["size"] + stats["max_overflow"], 1)
+            for stats in pool_status().values()
+        ),
+        default=0.0,
+    )
+
+
+# Background database check read by the readiness probe
+db_monitor = DatabaseHealthMonitor(
     engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
+    interval=settings.health_check_interval_seconds,
+    timeout=settings.health_check_timeout_seconds,
+)
+
+
+def _collect_pool_gauge(key: str) -> dict[tuple[str, ...], float]:
+    return {(name,): float(stats[key]) for name, stats in pool_status().items()}
+
+
+POOL_IN_USE = Gauge(
+    "db_pool_connections_in_use",
+    "Connections currently checked out",
+    ("pool",),
+    collect=lambda: _collect_pool_gauge("in_use"),
+)
+POOL_IDLE = Gauge(
+    "db_pool_connections_idle",
+    "Connections idle in the pool",
+    ("pool",),
+    collect=lambda: _collect_pool_gauge("idle"),
+)
+
+# Session factory - use async_sessionmaker for async context manager support
+AsyncSessionLocal = make_session_factory(
+    engine, replica_engines, settings.replica_sticky_seconds
 )
 
 
@@ -31,6 +288,91 @@ async def create_db_and_tables():
         print("Make sure PostgreSQL is running and accessible.")
 
 
+async def verify_schema(bind: AsyncEngine = engine) -> None:
+    """Check the database is migrated to SCHEMA_REVISION with a single query"""
+    try:
+        async with bind.connect() as conn:
+            result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+            revision = result.scalar_one_or_none()
+    except exc.DBAPIError as e:
+        raise RuntimeError(f"Could not read the schema revision: {e}") from e
+    if revision != SCHEMA_REVISION:
+        raise RuntimeError(
+            f"Database schema is at revision {revision!r}, expected "
+            f"{SCHEMA_REVISION!r}; run `alembic upgrade head`"
+        )
+
+
+async def prepare_database() -> None:
+    """Startup schema step selected by settings.db_startup_mode"""
+    if settings.db_startup_mode == "create_all":
+        await create_db_and_tables()
+    elif settings.db_startup_mode == "verify":
+        await verify_schema()
+
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+async def release_connection(session: AsyncSession) -> None:
+    """End the session's transaction so its pooled connection is returned now
+
+    Services commit their own writes, so at this point the transaction only
+    holds reads; committing it is cheap and, with expire_on_commit=False,
+    leaves loaded objects usable. The session transparently checks out a new
+    connection if it is used again.
+    """
+    if session.in_transaction():
+        await session.commit()
+
+
+async def _release_after_error(session: AsyncSession) -> None:
+    """End the transaction of a failed service call, never committing writes
+
+    Pending changes and failed transactions are rolled back. A transaction
+    that only read is committed instead: that loses nothing, and unlike a
+    rollback it does not expire the objects the session already loaded.
+    """
+    if not session.in_transaction():
+        return
+    if session.new or session.dirty or session.deleted:
+        await session.rollback()
+        return
+    try:
+        await session.commit()
+    except exc.SQLAlchemyError:
+        await session.rollback()
+
+
+def releases_connection(
+    method: Callable[P, Awaitable[R]],
+) -> Callable[P, Awaitable[R]]:
+    """Service-method decorator: give the connection back when the method returns
+
+    Without it the connection stays checked out until get_db closes the
+    session, i.e. through response validation, serialization and sending.
+    A method that raises (not found, permission, version conflict) releases
+    it too, so error responses do not hold a connection either.
+    """
+
+    @functools.wraps(method)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        session: AsyncSession = args[0].repo.db  # type: ignore[attr-defined]
+        succeeded = False
+        try:
+            result = await method(*args, **kwargs)
+            succeeded = True
+            return result
+        finally:
+            if succeeded:
+                await release_connection(session)
+            else:
+                await _release_after_error(session)
+
+    return wrapper
+
+
 async def get_db():
     """Dependency to get database session in endpoints"""
     async with AsyncSessionLocal() as session:
@@ -1,12 +1,13 @@
 from uuid import UUID
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 import jwt
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.db import get_db
+from src.db import get_db, set_session_principal
 from src.config import settings
+from src.core.metrics import Counter
 from src.models import UserResponse
 from src.repositories.user_repository import UserRepository
 from src.services.user_services import UserService
@@ -15,6 +16,12 @@ from src.services.task_services import TaskService
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
+AUTH_CHECKS = Counter(
+    "auth_token_checks_total",
+    "Bearer token checks by result (ok, invalid_token, unknown_user)",
+    ("result",),
+)
+
 
 def get_user_repository(db: AsyncSession = Depends(get_db)) -> UserRepository:
     """Factory: Provide UserRepository"""
@@ -42,6 +49,7 @@ def get_task_service(
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db),
     user_service: UserService = Depends(get_user_service),
 ) -> UserResponse:
     """Dependency: Get current authenticated user from JWT token"""
@@ -57,16 +65,52 @@ async def get_current_user(
         )
         user_id_str: str | None = payload.get("sub")
         if user_id_str is None:
+            AUTH_CHECKS.inc(labels=("invalid_token",))
             raise credentials_exception
 
         user_id = UUID(user_id_str)
     except (jwt.InvalidTokenError, ValueError):
+        AUTH_CHECKS.inc(labels=("invalid_token",))
         raise credentials_exception
 
+    # Reads in this request follow the user's read-your-writes window
+    set_session_principal(db, user_id)
+
     try:
         user = await user_service.get_user(user_id)
         if user is None:
             raise credentials_exception
-        return user
     except ValueError:
+        AUTH_CHECKS.inc(labels=("unknown_user",))
         raise credentials_exception
+    AUTH_CHECKS.inc(labels=("ok",))
+    return user
+
+
+def require_owner(
+    current_user: UserResponse = Depends(get_current_user),
+) -> UserResponse:
+    """Dependency: Only users with the owner role may continue"""
+    if current_user.role != "owner":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only owners can access this resource",
+        )
+    return current_user
+
+
+def get_expected_version(if_match: str | None = Header(default=None)) -> int | None:
+    """Dependency: Parse the expected version from an If-Match ETag header
+
+    ``If-Match: *`` matches any current version, i.e. no version check.
+    """
+    if if_match is None or if_match.strip() == "*":
+        return None
+    tag = if_match.strip().removeprefix("W/").strip('"')
+    try:
+        return int(tag)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='If-Match must be a version ETag such as "3"',
+        )
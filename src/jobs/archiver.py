@@ -0,0 +1,49 @@
+"""Background archival of completed tasks into the task_archive table.
+
+Run once from the command line with ``python -m src.jobs.archiver``; the API
+runs it periodically from the lifespan hook when ARCHIVE_ENABLED is set.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import timedelta
+
+from src.config import settings
+from src.db import AsyncSessionLocal
+from src.repositories.task_repository import TaskRepository
+from src.services.task_services import TaskService
+
+logger = logging.getLogger(__name__)
+
+
+async def archive_once() -> int:
+    """Archive every eligible task in batches; returns how many were moved"""
+    async with AsyncSessionLocal() as session:
+        service = TaskService(TaskRepository(session))
+        return await service.archive_completed_tasks(
+            older_than=timedelta(days=settings.archive_after_days),
+            batch_size=settings.archive_batch_size,
+        )
+
+
+async def run_archiver(stop: asyncio.Event) -> None:
+    """Archive periodically until stop is set"""
+    while not stop.is_set():
+        try:
+            moved = await archive_once()
+            if moved:
+                logger.info("Archived %d completed tasks", moved)
+        except Exception:
+            logger.exception("Task archival run failed")
+
+        try:
+            await asyncio.wait_for(stop.wait(), settings.archive_interval_seconds)
+        except asyncio.TimeoutError:
+            pass
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    print(f"Archived {asyncio.run(archive_once())} completed tasks")
@@ -0,0 +1,53 @@
+"""Retention pruning of the task_changes log behind delta sync.
+
+Run once from the command line with ``python -m src.jobs.change_log``; the
+API runs it periodically from the lifespan hook. Cursors older than the
+retention get 410 from GET /api/tasks/changes, so pruning never makes a
+client silently miss a change.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import timedelta
+
+from src.config import settings
+from src.db import AsyncSessionLocal
+from src.repositories.task_repository import TaskRepository
+from src.services.task_services import TaskService
+
+logger = logging.getLogger(__name__)
+
+
+async def prune_once() -> int:
+    """Delete every change log entry past retention; returns how many"""
+    async with AsyncSessionLocal() as session:
+        service = TaskService(TaskRepository(session))
+        return await service.prune_changes(
+            older_than=timedelta(days=settings.task_changes_retention_days),
+            batch_size=settings.task_changes_prune_batch_size,
+        )
+
+
+async def run_change_log_pruner(stop: asyncio.Event) -> None:
+    """Prune periodically until stop is set"""
+    while not stop.is_set():
+        try:
+            pruned = await prune_once()
+            if pruned:
+                logger.info("Pruned %d task change log entries", pruned)
+        except Exception:
+            logger.exception("Task change log pruning failed")
+
+        try:
+            await asyncio.wait_for(
+                stop.wait(), settings.task_changes_prune_interval_seconds
+            )
+        except asyncio.TimeoutError:
+            pass
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    print(f"Pruned {asyncio.run(prune_once())} task change log entries")
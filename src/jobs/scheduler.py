@@ -0,0 +1,171 @@
+"""In-process scheduler for periodic jobs, run by one worker at a time.
+
+Every worker runs a Scheduler; on each tick it tries to take or renew a
+lease row (scheduler_lease). Only the holder runs the jobs, so with N
+workers a job still runs once per interval. A holder that dies stops
+renewing, and another worker takes over once the lease expires, i.e. after
+at most SCHEDULER_LEASE_SECONDS. The lease is a database row rather than a
+Postgres advisory lock so the same election runs (and is tested) on SQLite.
+
+Jobs must tolerate running twice: a leader stalled past its lease can
+overlap with its successor for one tick.
+
+Run the due-date job once with ``python -m src.jobs.scheduler``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import socket
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable
+from uuid import uuid4
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.config import settings
+from src.core.metrics import Counter, Gauge
+from src.db import AsyncSessionLocal, pin_to_primary
+from src.models import TaskEventType
+from src.repositories.lease_repository import LeaseRepository
+from src.repositories.task_repository import TaskRepository
+from src.services.task_services import TaskService
+
+logger = logging.getLogger(__name__)
+
+SCHEDULER_LEADER = Gauge(
+    "scheduler_leader",
+    "1 while this worker holds the scheduler lease",
+)
+DUE_DATE_EVENTS = Counter(
+    "due_date_events_total",
+    "Due-date events emitted by the scheduler, by kind",
+    ("kind",),
+)
+
+Job = Callable[[], Awaitable[object]]
+
+
+def worker_name() -> str:
+    """Lease holder id: readable in the table, unique per process"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+
+
+class Scheduler:
+    """Runs jobs every interval while this worker holds the lease"""
+
+    def __init__(
+        self,
+        jobs: dict[str, Job],
+        name: str = "scheduler",
+        interval: float | None = None,
+        lease_seconds: float | None = None,
+        session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+        holder: str | None = None,
+    ) -> None:
+        self.jobs = jobs
+        self.name = name
+        self.interval = interval or settings.scheduler_interval_seconds
+        self.lease = timedelta(
+            seconds=lease_seconds or settings.scheduler_lease_seconds
+        )
+        self.session_factory = session_factory
+        self.holder = holder or worker_name()
+        self.is_leader = False
+
+    async def elect(self, now: datetime | None = None) -> bool:
+        """Take or renew the lease; False (and step down) if another holds it"""
+        now = now or datetime.now(timezone.utc)
+        try:
+            async with self.session_factory() as session:
+                leader = await LeaseRepository(session).try_acquire(
+                    self.name, self.holder, now + self.lease, now
+                )
+        except Exception:
+            logger.exception("Scheduler lease check failed")
+            leader = False
+        if leader != self.is_leader:
+            logger.info(
+                "%s %s the %s lease",
+                self.holder,
+                "took" if leader else "lost",
+                self.name,
+            )
+        self.is_leader = leader
+        SCHEDULER_LEADER.set(1 if leader else 0)
+        return leader
+
+    async def tick(self, now: datetime | None = None) -> bool:
+        """Run every job once if this worker is (still) the leader"""
+        if not await self.elect(now):
+            return False
+        for job_name, job in self.jobs.items():
+            try:
+                await job()
+            except Exception:
+                logger.exception("Scheduled job %s failed", job_name)
+        return True
+
+    async def release(self) -> None:
+        """Hand the lease over at shutdown instead of letting it expire"""
+        if not self.is_leader:
+            return
+        self.is_leader = False
+        SCHEDULER_LEADER.set(0)
+        try:
+            async with self.session_factory() as session:
+                await LeaseRepository(session).release(self.name, self.holder)
+        except Exception:
+            logger.exception("Could not release the scheduler lease")
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Tick every interval until stop is set, then release the lease"""
+        try:
+            while not stop.is_set():
+                await self.tick()
+                try:
+                    await asyncio.wait_for(stop.wait(), self.interval)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            await self.release()
+
+
+async def process_due_dates(
+    session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+) -> int:
+    """Emit due_soon/overdue events for tasks that crossed the line
+
+    Runs on the primary: a replica behind the last watermark write would
+    scan a stale window and skip the tasks that crossed it.
+    """
+    async with session_factory() as session:
+        pin_to_primary(session)
+        emitted = await TaskService(TaskRepository(session)).process_due_dates(
+            now=datetime.now(timezone.utc),
+            due_soon_within=timedelta(minutes=settings.due_soon_minutes),
+            batch_size=settings.due_date_batch_size,
+        )
+    for event_type, count in emitted.items():
+        if count:
+            DUE_DATE_EVENTS.inc(count, labels=(event_type.value,))
+    total = sum(emitted.values())
+    if total:
+        logger.info(
+            "Emitted %d overdue and %d due-soon task events",
+            emitted[TaskEventType.OVERDUE],
+            emitted[TaskEventType.DUE_SOON],
+        )
+    return total
+
+
+def build_scheduler() -> Scheduler:
+    """The API's scheduler and its jobs"""
+    return Scheduler({"due_dates": process_due_dates})
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    print(f"Emitted {asyncio.run(process_due_dates())} due-date events")
@@ -1,28 +1,106 @@
+import asyncio
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, HTTPException, status, Depends
+from uuid import UUID
+
+from fastapi import FastAPI, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.config import settings
-from src.db import get_db, create_db_and_tables, AsyncSessionLocal
+from src.db import (
+    prepare_database,
+    AsyncSessionLocal,
+    db_monitor,
+    engine,
+    replica_engines,
+)
+from src.models import TaskResponse
+from src.repositories.task_repository import TaskRepository
+from src.repositories.user_repository import UserRepository
+from src.services.user_services import UserService
 from src.routers.user import router as users_router
 from src.routers.task import router as tasks_router
 from src.routers.auth import router as auth_router
-from src.seed import seed_demo_admin
+from src.routers.health import router as health_router
+from src.routers.metrics import router as metrics_router
+from src.routers.admin import router as admin_router
+from src.core.capture import TrafficCaptureMiddleware, close_capture_log
+from src.core.event_bus import RESYNC_TOPIC, event_bus
+from src.core.profiling import ProfilingMiddleware
+from src.core.task_events import task_events
+from src.core.telemetry import MetricsMiddleware
+from src.core.tracing import TracingMiddleware, close_exporter
+from src.warmup import warm_up, warmup_state
+
+
+async def rebuild_user_index() -> None:
+    try:
+        async with AsyncSessionLocal() as session:
+            count = await UserService(UserRepository(session)).rebuild_user_index()
+        print(f"✅ User lookup index built with {count} users")
+    except Exception as e:
+        print(f"⚠️  Warning: Could not build user lookup index: {e}")
+
+
+_resyncs: set[asyncio.Task] = set()
+
+
+def _resync_user_index(_: dict) -> None:
+    """Rebuild the index from the database after bus events may have been lost"""
+    task = asyncio.create_task(rebuild_user_index())
+    _resyncs.add(task)
+    task.add_done_callback(_resyncs.discard)
+
+
+event_bus.subscribe(RESYNC_TOPIC, _resync_user_index)
+
+
+async def load_task(task_id: UUID) -> TaskResponse | None:
+    """Current state of a task changed on another worker, for push streams"""
+    async with AsyncSessionLocal() as session:
+        task = await TaskRepository(session).get_task_by_id_with_users(task_id)
+        return TaskResponse.model_validate(task) if task else None
+
+
+task_events.loader = load_task
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Manage application lifespan - create tables on startup"""
-    # Startup
-    await create_db_and_tables()
-    # Seed demo data (e.g., owner user) when explicitly enabled
-    if settings.seed_demo_data:
-        async with AsyncSessionLocal() as session:
-            await seed_demo_admin(session)
+    """Manage application lifespan - prepare the schema on startup"""
+    # Startup: create tables, verify the migration revision, or nothing
+    # (DB_STARTUP_MODE). Demo data is seeded separately: python -m src.seed
+    await prepare_database()
+    # Build the in-memory assignee autocomplete index, then keep it (and the
+    # push streams) current with changes made by every worker
+    await rebuild_user_index()
+    await event_bus.start()
+    # Background jobs: warm-up (readiness waits for it), readiness database
+    # check, archival of completed tasks, change log retention, and the
+    # leader-elected scheduler (due-date events)
+    stop_background = asyncio.Event()
+    background = [asyncio.create_task(db_monitor.run(stop_background))]
+    if settings.warmup_enabled:
+        background.append(asyncio.create_task(warm_up([engine, *replica_engines])))
+    else:
+        warmup_state.completed = True
+    if settings.archive_enabled:
+        from src.jobs.archiver import run_archiver
+
+        background.append(asyncio.create_task(run_archiver(stop_background)))
+    from src.jobs.change_log import run_change_log_pruner
+
+    background.append(asyncio.create_task(run_change_log_pruner(stop_background)))
+    if settings.scheduler_enabled:
+        from src.jobs.scheduler import build_scheduler
+
+        background.append(asyncio.create_task(build_scheduler().run(stop_background)))
     yield
     # Shutdown
-    pass
+    stop_background.set()
+    await asyncio.gather(*background)
+    await event_bus.stop()
+    close_capture_log()
+    close_exporter()
 
 
 app = FastAPI(title="Task Manager API", lifespan=lifespan)
@@ -34,11 +112,21 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Paged lists (GET /api/users) return the next cursor in a header
+    expose_headers=["X-Next-Cursor"],
 )
+app.add_middleware(TrafficCaptureMiddleware)
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(TracingMiddleware)
+# Outermost, so recorded latency covers CORS handling too
+app.add_middleware(MetricsMiddleware)
 
+app.include_router(health_router)
+app.include_router(metrics_router)
 app.include_router(auth_router)
 app.include_router(users_router)
 app.include_router(tasks_router)
+app.include_router(admin_router)
 
 
 # TODO: Implement your API
@@ -58,26 +146,3 @@ async def root():
     #         status_code=status.HTTP_400_BAD_REQUEST, detail="Fail Getting data"
     #     )
     return {"message": "Task Manager API is working right now"}
-
-
-@app.get("/health")
-async def health_check(session: AsyncSession = Depends(get_db)):
-    """Health check endpoint to verify API and database connection"""
-    try:
-        # Import here to avoid circular dependency
-        from sqlalchemy import text
-
-        # Test database connection
-        await session.execute(text("SELECT 1"))
-
-        return {
-            "status": "healthy",
-            "service": "Task Manager API",
-            "database": "connected",
-        }
-    except Exception as e:
-        return {
-            "status": "unhealthy",
-            "service": "Task Manager API",
-            "database": f"disconnected - {str(e)}",
-        }
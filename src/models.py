@@ -4,7 +4,7 @@ from typing import Optional, TYPE_CHECKING
 from uuid import uuid4, UUID
 
 from sqlmodel import Field, Relationship, SQLModel
-from sqlalchemy import Column, DateTime
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer
 
 
 class TaskStatus(str, Enum):
@@ -15,16 +15,55 @@ class TaskStatus(str, Enum):
     COMPLETED = "completed"
 
 
+class TaskEventType(str, Enum):
+    """Kinds of task change pushed to subscribers"""
+
+    CREATED = "created"
+    UPDATED = "updated"
+    DELETED = "deleted"
+    # Emitted by the due-date scheduler, not by a write
+    DUE_SOON = "due_soon"
+    OVERDUE = "overdue"
+
+
+class TaskChangeOp(str, Enum):
+    """What a change log entry does to a client's copy of a task"""
+
+    UPSERT = "upsert"
+    DELETE = "delete"
+
+
+class TaskSortField(str, Enum):
+    """Columns a task list can be sorted by (each backed by an index)"""
+
+    DUE_DATE = "due_date"
+    CREATED_AT = "created_at"
+    UPDATED_AT = "updated_at"
+    STATUS = "status"
+
+
+class SortOrder(str, Enum):
+    """Sort direction for list endpoints"""
+
+    ASC = "asc"
+    DESC = "desc"
+
+
 class User(SQLModel, table=True):
     """Database model for User"""
 
-    __table_args__ = {"extend_existing": True}
+    # Keyset pagination order for the user directory
+    __table_args__ = (
+        Index("ix_user_created_at_id", "created_at", "id"),
+        {"extend_existing": True},
+    )
 
     id: Optional[UUID] = Field(default_factory=uuid4, primary_key=True)
     name: str = Field(index=True)
     email: str = Field(unique=True, index=True)
     password_hash: str
     role: str = Field(default="member")
+    version: int = Field(default=1, sa_column_kwargs={"server_default": "1"})
     created_at: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc),
         sa_column=Column(DateTime(timezone=True)),
@@ -49,6 +88,8 @@ class UserUpdate(SQLModel):
     name: Optional[str] = None
     email: Optional[str] = None
     password: Optional[str] = None
+    # Expected current version (alternative to the If-Match header)
+    version: Optional[int] = None
 
 
 class UserResponse(SQLModel):
@@ -58,6 +99,7 @@ class UserResponse(SQLModel):
     name: str
     email: str
     role: str
+    version: int = 1
     created_at: datetime
     updated_at: datetime
 
@@ -65,7 +107,37 @@ class UserResponse(SQLModel):
 class Task(SQLModel, table=True):
     """Database model for Task"""
 
-    __table_args__ = {"extend_existing": True}
+    # Composite indexes backing the filter/sort combinations of TaskFilter:
+    # every list is scoped by owner or assignee, then ranged/sorted by a column
+    # with id as the tie-break. Lists sort "col ASC NULLS LAST, id ASC" or
+    # "col DESC NULLS FIRST, id DESC", a forward or backward scan of the same
+    # index. The *_status_created_at indexes serve the default (newest first)
+    # list narrowed to one status.
+    __table_args__ = (
+        Index("ix_task_owner_status", "owner_id", "status", "id"),
+        Index("ix_task_owner_due_date", "owner_id", "due_date", "id"),
+        Index("ix_task_owner_created_at", "owner_id", "created_at", "id"),
+        Index("ix_task_owner_updated_at", "owner_id", "updated_at", "id"),
+        Index(
+            "ix_task_owner_status_created_at",
+            "owner_id",
+            "status",
+            "created_at",
+            "id",
+        ),
+        Index("ix_task_assigned_to_due_date", "assigned_to_id", "due_date", "id"),
+        Index("ix_task_assigned_to_created_at", "assigned_to_id", "created_at", "id"),
+        Index(
+            "ix_task_assigned_to_status_created_at",
+            "assigned_to_id",
+            "status",
+            "created_at",
+            "id",
+        ),
+        # Unscoped range scan of the due-date scheduler, keyset-paged
+        Index("ix_task_due_date_id", "due_date", "id"),
+        {"extend_existing": True},
+    )
 
     id: Optional[UUID] = Field(default_factory=uuid4, primary_key=True)
     title: str = Field(index=True)
@@ -76,6 +148,7 @@ class Task(SQLModel, table=True):
     due_date: Optional[datetime] = Field(
         default=None, sa_column=Column(DateTime(timezone=True), nullable=True)
     )
+    version: int = Field(default=1, sa_column_kwargs={"server_default": "1"})
     created_at: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc),
         sa_column=Column(DateTime(timezone=True)),
@@ -102,6 +175,113 @@ class Task(SQLModel, table=True):
     )
 
 
+class ArchivedTask(SQLModel, table=True):
+    """Database model for completed tasks moved out of the hot task table"""
+
+    __tablename__ = "task_archive"  # type: ignore[assignment]
+    __table_args__ = {"extend_existing": True}
+
+    id: UUID = Field(primary_key=True)
+    title: str
+    description: Optional[str] = None
+    status: str
+    owner_id: UUID = Field(foreign_key="user.id", index=True)
+    assigned_to_id: Optional[UUID] = Field(
+        default=None, foreign_key="user.id", index=True
+    )
+    due_date: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime(timezone=True), nullable=True)
+    )
+    version: int = Field(default=1, sa_column_kwargs={"server_default": "1"})
+    created_at: datetime = Field(sa_column=Column(DateTime(timezone=True)))
+    updated_at: datetime = Field(sa_column=Column(DateTime(timezone=True)))
+    archived_at: datetime = Field(sa_column=Column(DateTime(timezone=True)))
+
+    # Relationships
+    owner: Optional["User"] = Relationship(
+        sa_relationship_kwargs={
+            "primaryjoin": "ArchivedTask.owner_id == User.id",
+            "foreign_keys": "[ArchivedTask.owner_id]",
+            "lazy": "selectin",
+        }
+    )
+    assigned_to: Optional["User"] = Relationship(
+        sa_relationship_kwargs={
+            "primaryjoin": "ArchivedTask.assigned_to_id == User.id",
+            "foreign_keys": "[ArchivedTask.assigned_to_id]",
+            "lazy": "selectin",
+        }
+    )
+
+
+class TaskChange(SQLModel, table=True):
+    """Append-only log of task mutations, read by delta sync
+
+    Each entry names the users who may need to hear about it; the task's
+    state itself is read from the task table when changes are served.
+    Entries are written in the same transaction as the mutation and outlive
+    deleted tasks as tombstones until pruned.
+    """
+
+    __tablename__ = "task_changes"  # type: ignore[assignment]
+    # Delta sync reads "entries after id N involving user U": one index per
+    # user column, each ending with the sequence id
+    __table_args__ = (
+        Index("ix_task_changes_owner_id_id", "owner_id", "id"),
+        Index("ix_task_changes_assigned_to_id_id", "assigned_to_id", "id"),
+        Index(
+            "ix_task_changes_previous_assigned_to_id_id",
+            "previous_assigned_to_id",
+            "id",
+        ),
+        {"extend_existing": True},
+    )
+
+    id: Optional[int] = Field(
+        default=None,
+        sa_column=Column(
+            BigInteger().with_variant(Integer, "sqlite"),
+            primary_key=True,
+            autoincrement=True,
+        ),
+    )
+    task_id: UUID
+    op: str
+    owner_id: UUID
+    assigned_to_id: Optional[UUID] = None
+    # Set on reassignment, so the user the task was taken from hears about it
+    previous_assigned_to_id: Optional[UUID] = None
+    changed_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(DateTime(timezone=True), nullable=False, index=True),
+    )
+
+
+class SchedulerLease(SQLModel, table=True):
+    """Leader lease: the holder runs the scheduled jobs until expires_at"""
+
+    __tablename__ = "scheduler_lease"  # type: ignore[assignment]
+    __table_args__ = {"extend_existing": True}
+
+    name: str = Field(primary_key=True)
+    holder: str
+    expires_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False)
+    )
+
+
+class DueDateWatermark(SQLModel, table=True):
+    """How far the due-date scheduler has scanned, per kind of event"""
+
+    __tablename__ = "due_date_watermark"  # type: ignore[assignment]
+    __table_args__ = {"extend_existing": True}
+
+    kind: str = Field(primary_key=True)
+    scanned_until: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False)
+    )
+
+
 class TaskCreate(SQLModel):
     """Schema for creating a task (request)"""
 
@@ -119,6 +299,25 @@ class TaskUpdate(SQLModel):
     status: Optional[TaskStatus] = None
     assigned_to_id: Optional[UUID] = None
     due_date: Optional[datetime] = None
+    # Expected current version (alternative to the If-Match header)
+    version: Optional[int] = None
+
+
+class TaskFilter(SQLModel):
+    """Composable filters and sort options for task lists (request)"""
+
+    status: Optional[TaskStatus] = None
+    assigned_to_id: Optional[UUID] = None
+    due_after: Optional[datetime] = None
+    due_before: Optional[datetime] = None
+    overdue: Optional[bool] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    updated_after: Optional[datetime] = None
+    updated_before: Optional[datetime] = None
+    sort_by: TaskSortField = TaskSortField.CREATED_AT
+    sort_order: SortOrder = SortOrder.DESC
+    include_archived: bool = False
 
 
 class UserSummary(SQLModel):
@@ -139,6 +338,7 @@ class TaskResponse(SQLModel):
     owner_id: UUID
     assigned_to_id: Optional[UUID]
     due_date: Optional[datetime]
+    version: int
     created_at: datetime
     updated_at: datetime
 
@@ -153,5 +353,49 @@ class TaskDetailResponse(SQLModel):
     owner: UserSummary
     assigned_to: Optional[UserSummary]
     due_date: Optional[datetime]
+    version: int
     created_at: datetime
     updated_at: datetime
+    archived_at: Optional[datetime] = None
+
+
+class TaskEvent(SQLModel):
+    """A committed task change, pushed to the task's owner and assignee"""
+
+    type: TaskEventType
+    task_id: UUID
+    # Task state after the change; None for deletes
+    task: Optional[TaskResponse] = None
+    occurred_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class TaskChangeItem(SQLModel):
+    """One task in a delta sync page: its current state, or a tombstone"""
+
+    op: TaskChangeOp
+    task_id: UUID
+    # None when the task was deleted, archived or is no longer visible
+    task: Optional[TaskDetailResponse] = None
+    changed_at: datetime
+
+
+class TaskChangesResponse(SQLModel):
+    """Compacted changes since a cursor, and the cursor to send next time"""
+
+    changes: list[TaskChangeItem]
+    cursor: str
+    has_more: bool
+
+
+class TaskLookupRequest(SQLModel):
+    """Schema for looking up many tasks by id (request)"""
+
+    ids: list[UUID]
+
+
+class TaskLookupResponse(SQLModel):
+    """Per-id outcome of a batched task lookup"""
+
+    found: list[TaskDetailResponse]
+    forbidden: list[UUID]
+    missing: list[UUID]
@@ -0,0 +1,64 @@
+from datetime import datetime
+
+from sqlalchemy import delete, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from src.core.tracing import traced
+from src.models import SchedulerLease
+
+
+@traced("repository")
+class LeaseRepository:
+    """Data access layer for leader leases
+
+    A lease is one row per name. Taking it over is a single conditional
+    UPDATE (held by us, or expired), so two workers racing for an expired
+    lease cannot both win: on Postgres the loser's UPDATE re-checks the row
+    after the winner commits and matches nothing.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def try_acquire(
+        self, name: str, holder: str, expires_at: datetime, now: datetime
+    ) -> bool:
+        """Take or renew the lease until expires_at; False if another holds it"""
+        result = await self.db.execute(
+            update(SchedulerLease)
+            .where(SchedulerLease.name == name)  # type: ignore[arg-type]
+            .where(
+                (SchedulerLease.holder == holder)
+                | (SchedulerLease.expires_at < now)  # type: ignore[operator]
+            )
+            .values(holder=holder, expires_at=expires_at)
+        )
+        if result.rowcount:  # type: ignore[attr-defined]
+            await self.db.commit()
+            return True
+
+        exists = await self.db.execute(
+            select(SchedulerLease.name).where(SchedulerLease.name == name)
+        )
+        if exists.first() is not None:
+            await self.db.rollback()
+            return False
+        try:
+            self.db.add(SchedulerLease(name=name, holder=holder, expires_at=expires_at))
+            await self.db.commit()
+            return True
+        except IntegrityError:
+            # Another worker created the lease first
+            await self.db.rollback()
+            return False
+
+    async def release(self, name: str, holder: str) -> None:
+        """Give the lease up so another worker can take it right away"""
+        await self.db.execute(
+            delete(SchedulerLease).where(
+                (SchedulerLease.name == name) & (SchedulerLease.holder == holder)  # type: ignore[arg-type]
+            )
+        )
+        await self.db.commit()
@@ -1,26 +1,109 @@
 from uuid import UUID
+from sqlalchemy import (
+    DateTime,
+    Uuid,
+    delete,
+    func,
+    insert,
+    lambda_stmt,
+    literal,
+    null,
+    tuple_,
+    update,
+)
 from sqlmodel import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import lazyload, selectinload
 from datetime import datetime, timezone
 
-from src.models import Task, TaskStatus
+from src.core.exceptions import VersionConflictError
+from src.core.tracing import traced
+from src.models import (
+    ArchivedTask,
+    DueDateWatermark,
+    SortOrder,
+    Task,
+    TaskChange,
+    TaskChangeOp,
+    TaskFilter,
+    TaskSortField,
+    TaskStatus,
+)
 
+# Sortable fields per list scope. Each entry is backed by a (scope, field, id)
+# index declared in Task.__table_args__; anything else would sort the whole
+# scope in memory on the database side, so it is rejected.
+OWNER_SORT_FIELDS = {
+    TaskSortField.DUE_DATE,
+    TaskSortField.CREATED_AT,
+    TaskSortField.UPDATED_AT,
+    TaskSortField.STATUS,
+}
+ASSIGNEE_SORT_FIELDS = {
+    TaskSortField.DUE_DATE,
+    TaskSortField.CREATED_AT,
+}
 
+
+def _is_common_shape(task_filter: TaskFilter, owner_id: UUID | None) -> bool:
+    """A list with the default sort, scoped by owner or assignee, maybe by status"""
+    fields = task_filter.model_dump(exclude_defaults=True).keys()
+    if owner_id is not None and task_filter.assigned_to_id is not None:
+        return False
+    return fields <= {"status", "assigned_to_id"}
+
+
+def _sorted_merge(
+    hot: list[Task], cold: list[ArchivedTask], task_filter: TaskFilter
+) -> list[Task | ArchivedTask]:
+    """Merge hot and archived results using the list's sort order"""
+    field = task_filter.sort_by.value
+    descending = task_filter.sort_order == SortOrder.DESC
+    items: list[Task | ArchivedTask] = [*hot, *cold]
+    dated = [item for item in items if getattr(item, field) is not None]
+    undated = [item for item in items if getattr(item, field) is None]
+    dated.sort(key=lambda item: (getattr(item, field), item.id), reverse=descending)
+    undated.sort(key=lambda item: item.id, reverse=descending)
+    return [*undated, *dated] if descending else [*dated, *undated]
+
+
+@traced("repository")
 class TaskRepository:
-    """Data access layer for Task operations"""
+    """Data access layer for Task operations
+
+    Fixed-shape hot queries are built with lambda_stmt: SQLAlchemy caches the
+    construct by the lambda's code location and turns closure variables into
+    bound parameters, so repeat calls skip rebuilding select/where/options and
+    recomputing the cache key. list_tasks uses cached statements for its
+    default shapes (owner or assignee scope, optionally a status) and builds
+    every other filter combination ad hoc.
+
+    Every mutation appends to the task_changes log before it commits, so the
+    log and the task table cannot disagree.
+    """
 
     def __init__(self, db: AsyncSession):
         self.db = db
 
+    def _log_change(self, task: Task | ArchivedTask, op: TaskChangeOp) -> None:
+        """Add a change log entry to the current transaction"""
+        self.db.add(
+            TaskChange(
+                task_id=task.id,
+                op=op.value,
+                owner_id=task.owner_id,
+                assigned_to_id=task.assigned_to_id,
+            )
+        )
+
     async def get_task_by_id(self, task_id: UUID) -> Task | None:
         """Get a single task by ID"""
         return await self.db.get(Task, task_id)
 
     async def get_task_by_id_with_users(self, task_id: UUID) -> Task | None:
         """Get a single task by ID with owner and assigned_to loaded"""
-        query = (
-            select(Task)
+        query = lambda_stmt(
+            lambda: select(Task)
             .where(Task.id == task_id)
             .options(
                 selectinload(Task.owner),  # type: ignore[arg-type]
@@ -30,11 +113,13 @@ class TaskRepository:
         result = await self.db.execute(query)
         return result.scalar_one_or_none()
 
-    async def get_tasks_by_owner(self, owner_id: UUID) -> list[Task]:
-        """Get all tasks owned by a user with related users"""
-        query = (
-            select(Task)
-            .where(Task.owner_id == owner_id)
+    async def get_tasks_by_ids(self, task_ids: list[UUID]) -> list[Task]:
+        """Get many tasks in one IN query with owner and assigned_to loaded"""
+        if not task_ids:
+            return []
+        query = lambda_stmt(
+            lambda: select(Task)
+            .where(Task.id.in_(task_ids))  # type: ignore[union-attr]
             .options(
                 selectinload(Task.owner),  # type: ignore[arg-type]
                 selectinload(Task.assigned_to),  # type: ignore[arg-type]
@@ -43,30 +128,115 @@ class TaskRepository:
         result = await self.db.execute(query)
         return list(result.scalars().all())
 
-    async def get_tasks_by_status(
-        self, owner_id: UUID, status: TaskStatus
+    @staticmethod
+    def _filter_conditions(
+        model: type[Task] | type[ArchivedTask],
+        task_filter: TaskFilter,
+        owner_id: UUID | None,
+    ) -> list:
+        """Translate a TaskFilter into WHERE clauses for the hot or archive table"""
+        if owner_id is not None:
+            conditions = [model.owner_id == owner_id]
+            if task_filter.assigned_to_id is not None:
+                conditions.append(model.assigned_to_id == task_filter.assigned_to_id)
+        elif task_filter.assigned_to_id is not None:
+            conditions = [model.assigned_to_id == task_filter.assigned_to_id]
+        else:
+            raise ValueError("Task lists must be scoped by owner or assignee")
+
+        if task_filter.status is not None:
+            conditions.append(model.status == task_filter.status.value)
+        if task_filter.due_after is not None:
+            conditions.append(model.due_date >= task_filter.due_after)  # type: ignore[operator]
+        if task_filter.due_before is not None:
+            conditions.append(model.due_date < task_filter.due_before)  # type: ignore[operator]
+        if task_filter.overdue is True:
+            conditions.append(model.due_date < datetime.now(timezone.utc))  # type: ignore[operator]
+            conditions.append(model.status != TaskStatus.COMPLETED.value)
+        elif task_filter.overdue is False:
+            conditions.append(
+                (model.due_date == None)  # noqa: E711
+                | (model.due_date >= datetime.now(timezone.utc))  # type: ignore[operator]
+                | (model.status == TaskStatus.COMPLETED.value)
+            )
+        if task_filter.created_after is not None:
+            conditions.append(model.created_at >= task_filter.created_after)
+        if task_filter.created_before is not None:
+            conditions.append(model.created_at < task_filter.created_before)
+        if task_filter.updated_after is not None:
+            conditions.append(model.updated_at >= task_filter.updated_after)
+        if task_filter.updated_before is not None:
+            conditions.append(model.updated_at < task_filter.updated_before)
+        return conditions
+
+    async def list_tasks(
+        self, task_filter: TaskFilter, owner_id: UUID | None = None
+    ) -> list[Task | ArchivedTask]:
+        """List tasks scoped by owner (or by assignee) with filters and sorting
+
+        Archived tasks are only read (from the cold table) when
+        task_filter.include_archived is set.
+        """
+        sort_fields = (
+            OWNER_SORT_FIELDS if owner_id is not None else ASSIGNEE_SORT_FIELDS
+        )
+        if task_filter.sort_by not in sort_fields:
+            raise ValueError(f"Unsupported sort field: {task_filter.sort_by.value}")
+
+        if _is_common_shape(task_filter, owner_id):
+            return await self._list_common(task_filter, owner_id)
+        hot = await self._list_from(Task, task_filter, owner_id)
+        if not task_filter.include_archived:
+            return list(hot)
+        cold = await self._list_from(ArchivedTask, task_filter, owner_id)
+        return _sorted_merge(hot, cold, task_filter)
+
+    async def _list_common(
+        self, task_filter: TaskFilter, owner_id: UUID | None
     ) -> list[Task]:
-        """Get tasks by owner and status with related users"""
-        status_value = status.value if isinstance(status, TaskStatus) else status
-        query = (
-            select(Task)
-            .where((Task.owner_id == owner_id) & (Task.status == status_value))
-            .options(
-                selectinload(Task.owner),  # type: ignore[arg-type]
-                selectinload(Task.assigned_to),  # type: ignore[arg-type]
+        """The default list shapes (scope, maybe status) as cached statements"""
+        if owner_id is not None:
+            query = lambda_stmt(lambda: select(Task).where(Task.owner_id == owner_id))
+        else:
+            assignee_id = task_filter.assigned_to_id
+            query = lambda_stmt(
+                lambda: select(Task).where(Task.assigned_to_id == assignee_id)
             )
+        if task_filter.status is not None:
+            status_value = task_filter.status.value
+            query += lambda s: s.where(Task.status == status_value)
+        query += lambda s: s.order_by(
+            Task.created_at.desc().nulls_first(),  # type: ignore[attr-defined]
+            Task.id.desc(),  # type: ignore[union-attr]
+        ).options(
+            selectinload(Task.owner),  # type: ignore[arg-type]
+            selectinload(Task.assigned_to),  # type: ignore[arg-type]
         )
         result = await self.db.execute(query)
         return list(result.scalars().all())
 
-    async def get_tasks_assigned_to(self, user_id: UUID) -> list[Task]:
-        """Get tasks assigned to a specific user with related users"""
+    async def _list_from(
+        self,
+        model: type[Task] | type[ArchivedTask],
+        task_filter: TaskFilter,
+        owner_id: UUID | None,
+    ) -> list:
+        """Run a filtered, sorted list query against one table"""
+        conditions = self._filter_conditions(model, task_filter, owner_id)
+        sort_column = getattr(model, task_filter.sort_by.value)
+        # Both directions walk the (scope, column, id) index: forwards for
+        # ascending, backwards (so NULLs first) for descending
+        if task_filter.sort_order == SortOrder.DESC:
+            order = [sort_column.desc().nulls_first(), model.id.desc()]
+        else:
+            order = [sort_column.asc().nulls_last(), model.id.asc()]
         query = (
-            select(Task)
-            .where(Task.assigned_to_id == user_id)
+            select(model)
+            .where(*conditions)
+            .order_by(*order)
             .options(
-                selectinload(Task.owner),  # type: ignore[arg-type]
-                selectinload(Task.assigned_to),  # type: ignore[arg-type]
+                selectinload(model.owner),  # type: ignore[arg-type]
+                selectinload(model.assigned_to),  # type: ignore[arg-type]
             )
         )
         result = await self.db.execute(query)
@@ -75,23 +245,79 @@ class TaskRepository:
     async def create_task(self, task: Task) -> Task:
         """Create and save a new Task"""
         self.db.add(task)
+        self._log_change(task, TaskChangeOp.UPSERT)
         await self.db.commit()
         await self.db.refresh(task)
         return task
 
-    async def update_task(self, task_id: UUID, task_data: dict) -> Task | None:
-        """Update an existing task"""
-        task = await self.get_task_by_id(task_id)
-        if not task:
-            raise ValueError("User not found")
+    async def update_task(
+        self, task_id: UUID, task_data: dict, expected_version: int | None = None
+    ) -> Task | None:
+        """Update an existing task, conditional on expected_version if given
+
+        The version check and increment happen in a single UPDATE statement,
+        so concurrent writers cannot overwrite each other without row locks.
+        """
+        values = {
+            key: value.value if isinstance(value, TaskStatus) else value
+            for key, value in task_data.items()
+            if value is not None
+        }
+        now = datetime.now(timezone.utc)
+        values["updated_at"] = now
+        values["version"] = Task.version + 1
+
+        # Logged from the row before the update, which still holds the
+        # previous assignee; rolled back below if the update does not apply
+        reassigned = "assigned_to_id" in values
+        await self.db.execute(
+            insert(TaskChange).from_select(
+                [
+                    "task_id",
+                    "op",
+                    "owner_id",
+                    "assigned_to_id",
+                    "previous_assigned_to_id",
+                    "changed_at",
+                ],
+                select(
+                    Task.id,
+                    literal(TaskChangeOp.UPSERT.value),
+                    Task.owner_id,
+                    (
+                        literal(values["assigned_to_id"], Uuid())
+                        if reassigned
+                        else Task.assigned_to_id
+                    ),
+                    Task.assigned_to_id if reassigned else null(),
+                    literal(now, DateTime(timezone=True)),
+                )
+                .where(Task.id == task_id)
+                .with_for_update(),
+            )
+        )
 
-        for key, value in task_data.items():
-            if value is not None:
-                setattr(task, key, value)
+        query = update(Task).where(Task.id == task_id)  # type: ignore[arg-type]
+        if expected_version is not None:
+            query = query.where(Task.version == expected_version)  # type: ignore[arg-type]
+        result = await self.db.execute(query.values(**values))
+
+        if result.rowcount == 0:  # type: ignore[attr-defined]
+            await self.db.rollback()
+            task = await self.get_task_by_id(task_id)
+            if not task:
+                raise ValueError("Task not found")
+            await self.db.refresh(task, ["version"])
+            raise VersionConflictError(task.version)
 
-        task.updated_at = datetime.now(timezone.utc)
         await self.db.commit()
-        await self.db.refresh(task)
+        # Reload the row's columns only: the users loaded with the task are
+        # still current, except the assignee after a reassignment
+        task = await self.get_task_by_id(task_id)
+        columns = [column.name for column in Task.__table__.columns]  # type: ignore[attr-defined]
+        await self.db.refresh(
+            task, [*columns, "assigned_to"] if reassigned else columns
+        )
         return task
 
     async def delete_task(self, task_id: UUID) -> bool:
@@ -100,6 +326,183 @@ class TaskRepository:
         if not task:
             raise ValueError("User not found")
 
+        self._log_change(task, TaskChangeOp.DELETE)
         await self.db.delete(task)
         await self.db.commit()
         return True
+
+    async def archive_completed_tasks(
+        self, completed_before: datetime, batch_size: int
+    ) -> int:
+        """Move one batch of completed tasks untouched since a cutoff to the archive
+
+        The batch is locked on the primary, and the copy and the delete repeat
+        the predicate, so a task reopened meanwhile stays where it is.
+        """
+        archivable = (Task.status == TaskStatus.COMPLETED.value) & (
+            Task.updated_at < completed_before
+        )
+        ids_query = (
+            select(Task.id)
+            .where(archivable)
+            .order_by(Task.updated_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        task_ids = list((await self.db.execute(ids_query)).scalars().all())
+        if not task_ids:
+            return 0
+
+        columns = [column.name for column in Task.__table__.columns]  # type: ignore[attr-defined]
+        hot = Task.__table__.c  # type: ignore[attr-defined]
+        await self.db.execute(
+            insert(ArchivedTask).from_select(
+                [*columns, "archived_at"],
+                select(
+                    *(hot[name] for name in columns),
+                    literal(datetime.now(timezone.utc), DateTime(timezone=True)),
+                ).where(hot.id.in_(task_ids), archivable),
+            )
+        )
+        rows = (
+            await self.db.execute(
+                delete(Task)
+                .where(Task.id.in_(task_ids), archivable)  # type: ignore[union-attr]
+                .returning(Task.id, Task.owner_id, Task.assigned_to_id)
+            )
+        ).all()
+        # Archived tasks leave the default lists, so clients drop them
+        now = datetime.now(timezone.utc)
+        if rows:
+            await self.db.execute(
+                insert(TaskChange),
+                [
+                    {
+                        "task_id": row.id,
+                        "op": TaskChangeOp.DELETE.value,
+                        "owner_id": row.owner_id,
+                        "assigned_to_id": row.assigned_to_id,
+                        "changed_at": now,
+                    }
+                    for row in rows
+                ],
+            )
+        await self.db.commit()
+        return len(rows)
+
+    async def get_archived_task_by_id(self, task_id: UUID) -> ArchivedTask | None:
+        """Get a single archived task by ID"""
+        return await self.db.get(ArchivedTask, task_id)
+
+    async def restore_task(self, task_id: UUID) -> Task:
+        """Move an archived task back into the hot table"""
+        archived = await self.get_archived_task_by_id(task_id)
+        if not archived:
+            raise ValueError("Archived task not found")
+
+        columns = [column.name for column in Task.__table__.columns]  # type: ignore[attr-defined]
+        cold = ArchivedTask.__table__.c  # type: ignore[attr-defined]
+        # Restored tasks count as touched now so the archiver leaves them alone
+        now = literal(datetime.now(timezone.utc), DateTime(timezone=True))
+        await self.db.execute(
+            insert(Task).from_select(
+                columns,
+                select(
+                    *(now if name == "updated_at" else cold[name] for name in columns)
+                ).where(cold.id == task_id),
+            )
+        )
+        await self.db.execute(delete(ArchivedTask).where(ArchivedTask.id == task_id))  # type: ignore[arg-type]
+        self._log_change(archived, TaskChangeOp.UPSERT)
+        await self.db.commit()
+
+        task = await self.get_task_by_id_with_users(task_id)
+        if not task:
+            raise ValueError("Task not found")
+        await self.db.refresh(task)
+        return task
+
+    async def get_latest_change_id(self, changed_until: datetime) -> int:
+        """Id of the newest change log entry written by changed_until (or 0)"""
+        query = select(func.coalesce(func.max(TaskChange.id), 0)).where(
+            TaskChange.changed_at <= changed_until
+        )
+        return (await self.db.execute(query)).scalar_one()
+
+    async def get_changes_since(
+        self, user_id: UUID, after_id: int, limit: int
+    ) -> list[TaskChange]:
+        """Change log entries after a cursor involving the user, oldest first"""
+        query = lambda_stmt(
+            lambda: select(TaskChange)
+            .where(
+                (TaskChange.id > after_id)  # type: ignore[operator]
+                & (
+                    (TaskChange.owner_id == user_id)
+                    | (TaskChange.assigned_to_id == user_id)
+                    | (TaskChange.previous_assigned_to_id == user_id)
+                )
+            )
+            .order_by(TaskChange.id)
+            .limit(limit)
+        )
+        result = await self.db.execute(query)
+        return list(result.scalars().all())
+
+    async def prune_changes(self, changed_before: datetime, batch_size: int) -> int:
+        """Delete one batch of change log entries older than a cutoff"""
+        ids_query = (
+            select(TaskChange.id)
+            .where(TaskChange.changed_at < changed_before)
+            .order_by(TaskChange.id)
+            .limit(batch_size)
+        )
+        change_ids = list((await self.db.execute(ids_query)).scalars().all())
+        if not change_ids:
+            return 0
+        await self.db.execute(delete(TaskChange).where(TaskChange.id.in_(change_ids)))  # type: ignore[union-attr]
+        await self.db.commit()
+        return len(change_ids)
+
+    async def get_tasks_due_between(
+        self,
+        start: datetime,
+        end: datetime,
+        batch_size: int,
+        after: tuple[datetime, UUID] | None = None,
+    ) -> list[Task]:
+        """Open tasks with start < due_date <= end, in (due_date, id) order
+
+        A range scan of ix_task_due_date_id; pass the last (due_date, id)
+        of a batch as after to get the next one.
+        """
+        conditions = [
+            Task.due_date > start,  # type: ignore[operator]
+            Task.due_date <= end,  # type: ignore[operator]
+            Task.status != TaskStatus.COMPLETED.value,
+        ]
+        if after is not None:
+            conditions.append(tuple_(Task.due_date, Task.id) > tuple_(*after))
+        query = (
+            select(Task)
+            .where(*conditions)
+            .order_by(Task.due_date, Task.id)
+            .limit(batch_size)
+            .options(lazyload(Task.owner), lazyload(Task.assigned_to))  # type: ignore[arg-type]
+        )
+        result = await self.db.execute(query)
+        return list(result.scalars().all())
+
+    async def get_due_watermark(self, kind: str) -> datetime | None:
+        """How far the due-date scheduler has scanned for kind"""
+        watermark = await self.db.get(DueDateWatermark, kind)
+        return watermark.scanned_until if watermark else None
+
+    async def set_due_watermark(self, kind: str, scanned_until: datetime) -> None:
+        """Record and commit the scheduler's progress for kind"""
+        watermark = await self.db.get(DueDateWatermark, kind)
+        if watermark is None:
+            self.db.add(DueDateWatermark(kind=kind, scanned_until=scanned_until))
+        else:
+            watermark.scanned_until = scanned_until
+        await self.db.commit()
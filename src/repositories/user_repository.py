@@ -1,29 +1,70 @@
-from typing import Sequence
+from typing import AsyncIterator, Sequence
 
+from sqlalchemy import Row, lambda_stmt, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 from datetime import datetime, timezone
 from pydantic import EmailStr
 from uuid import UUID
 
+from src.core.exceptions import VersionConflictError
+from src.core.tracing import traced
 from src.models import User
 
+# Public user columns: directory queries never load password hashes
+USER_PUBLIC_COLUMNS = (
+    User.id,
+    User.name,
+    User.email,
+    User.role,
+    User.version,
+    User.created_at,
+    User.updated_at,
+)
 
+
+@traced("repository")
 class UserRepository:
     """Data access layer for User operations"""
 
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def get_all_users(self) -> Sequence[User]:
-        """Get all users"""
-        query = select(User)
+    async def get_all_users(self) -> Sequence[Row]:
+        """Get all users (public columns only), e.g. to build the lookup index"""
+        query = select(*USER_PUBLIC_COLUMNS).order_by(User.created_at, User.id)
+        result = await self.db.execute(query)
+        return result.all()
+
+    async def get_users_page(
+        self, limit: int, after: tuple[datetime, UUID] | None = None
+    ) -> Sequence[Row]:
+        """Get one keyset page of users ordered by (created_at, id)"""
+        query = select(*USER_PUBLIC_COLUMNS)
+        if after is not None:
+            created_at, user_id = after
+            query = query.where(
+                (User.created_at > created_at)
+                | ((User.created_at == created_at) & (User.id > user_id))  # type: ignore[operator]
+            )
+        query = query.order_by(User.created_at, User.id).limit(limit)
         result = await self.db.execute(query)
-        return result.scalars().all()
+        return result.all()
+
+    async def stream_users(self, batch_size: int) -> AsyncIterator[Row]:
+        """Yield all users page by page without holding them in memory"""
+        after: tuple[datetime, UUID] | None = None
+        while True:
+            rows = await self.get_users_page(batch_size, after)
+            for row in rows:
+                yield row
+            if len(rows) < batch_size:
+                return
+            after = (rows[-1].created_at, rows[-1].id)
 
     async def get_user_by_email(self, email: EmailStr) -> User | None:
         """Get user by email"""
-        query = select(User).where(User.email == email)
+        query = lambda_stmt(lambda: select(User).where(User.email == email))
         result = await self.db.execute(query)
         return result.scalar_one_or_none()
 
@@ -38,19 +79,29 @@ class UserRepository:
         await self.db.refresh(user)
         return user
 
-    async def update_user(self, user_id: UUID, user_data: dict) -> User:
-        """Update existing user"""
-        user = await self.get_user_by_id(user_id)
-        if not user:
-            raise ValueError("User not found")
+    async def update_user(
+        self, user_id: UUID, user_data: dict, expected_version: int | None = None
+    ) -> User:
+        """Update existing user, conditional on expected_version if given"""
+        values = {key: value for key, value in user_data.items() if value is not None}
+        values["updated_at"] = datetime.now(timezone.utc)
+        values["version"] = User.version + 1
 
-        for key, value in user_data.items():
-            if value is not None:
-                setattr(user, key, value)
+        query = update(User).where(User.id == user_id)  # type: ignore[arg-type]
+        if expected_version is not None:
+            query = query.where(User.version == expected_version)  # type: ignore[arg-type]
+        result = await self.db.execute(query.values(**values))
 
-        user.updated_at = datetime.now(timezone.utc)
+        if result.rowcount == 0:  # type: ignore[attr-defined]
+            user = await self.get_user_by_id(user_id)
+            if not user:
+                raise ValueError("User not found")
+            await self.db.refresh(user)
+            raise VersionConflictError(user.version)
 
-        self.db.add(user)
         await self.db.commit()
+        user = await self.get_user_by_id(user_id)
+        if not user:
+            raise ValueError("User not found")
         await self.db.refresh(user)
         return user
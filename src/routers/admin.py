@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends, HTTPException, Path, status
+
+from src.core.profiling import profile_store
+from src.dependencies import require_owner
+from src.models import UserResponse
+from src.core.tracing import TracedRoute
+
+router = APIRouter(prefix="/api/admin", tags=["Admin"], route_class=TracedRoute)
+
+
+@router.get("/profiles")
+async def list_profiles(current_user: UserResponse = Depends(require_owner)):
+    """Summaries of the most recent request profiles, newest first"""
+    return profile_store().list()
+
+
+@router.get("/profiles/{profile_id}")
+async def get_profile(
+    profile_id: str = Path(pattern="^[0-9a-f]{32}$"),
+    current_user: UserResponse = Depends(require_owner),
+):
+    """One request profile with its collapsed call and await stacks"""
+    profile = profile_store().get(profile_id)
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found",
+        )
+    return profile
@@ -4,8 +4,9 @@ from fastapi.security import OAuth2PasswordRequestForm
 from src.core.security import create_access_token
 from src.services.user_services import UserService
 from src.dependencies import get_user_service
+from src.core.tracing import TracedRoute
 
-router = APIRouter(prefix="/api/auth", tags=["Authentication"])
+router = APIRouter(prefix="/api/auth", tags=["Authentication"], route_class=TracedRoute)
 
 
 @router.post("/login")
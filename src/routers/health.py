@@ -0,0 +1,70 @@
+from fastapi import APIRouter, Depends, status
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.db import db_monitor, get_db, pool_saturation, pool_status
+from src.dependencies import require_owner
+from src.models import UserResponse
+from src.warmup import warmup_state
+
+router = APIRouter(tags=["Health"])
+
+
+@router.get("/livez")
+async def liveness():
+    """Liveness probe: the process is serving requests (no I/O)"""
+    return {"status": "alive"}
+
+
+@router.get("/readyz")
+async def readiness():
+    """Readiness probe: warm-up done, cached database check, pool saturation"""
+    database = db_monitor.snapshot()
+    saturation = round(pool_saturation(), 3)
+    pool_ok = (
+        settings.ready_max_pool_saturation is None
+        or saturation < settings.ready_max_pool_saturation
+    )
+    ready = warmup_state.completed and database["connected"] and pool_ok
+    return JSONResponse(
+        status_code=(
+            status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE
+        ),
+        content={
+            "status": "ready" if ready else "not_ready",
+            "warmup": warmup_state.snapshot(),
+            "database": database,
+            "pool": {"saturation": saturation},
+        },
+    )
+
+
+@router.get("/health")
+async def health_check(session: AsyncSession = Depends(get_db)):
+    """Health check endpoint to verify API and database connection"""
+    try:
+        # Test database connection
+        await session.execute(text("SELECT 1"))
+
+        return {
+            "status": "healthy",
+            "service": "Task Manager API",
+            "database": "connected",
+        }
+    except Exception as e:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={
+                "status": "unhealthy",
+                "service": "Task Manager API",
+                "database": f"disconnected - {str(e)}",
+            },
+        )
+
+
+@router.get("/health/pool")
+async def pool_health(current_user: UserResponse = Depends(require_owner)):
+    """Pool size, in-use, idle and overflow connections per database (owner only)"""
+    return pool_status()
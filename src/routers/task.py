@@ -1,18 +1,68 @@
-from fastapi import APIRouter, status, HTTPException, Depends
+from datetime import datetime
+from fastapi import APIRouter, status, HTTPException, Depends, Query, Response
 from uuid import UUID
 
 from src.models import (
+    SortOrder,
     TaskCreate,
+    TaskFilter,
+    TaskChangesResponse,
+    TaskLookupRequest,
+    TaskLookupResponse,
     TaskResponse,
     TaskDetailResponse,
+    TaskSortField,
     TaskUpdate,
     TaskStatus,
     UserResponse,
 )
+from src.config import settings
+from src.core.exceptions import (
+    ConnectionLimitError,
+    CursorExpiredError,
+    VersionConflictError,
+)
+from src.core.task_events import EventStreamResponse, sse_stream, task_events
 from src.services.task_services import TaskService
-from src.dependencies import get_task_service, get_current_user
+from src.dependencies import (
+    get_task_service,
+    get_current_user,
+    get_expected_version,
+)
+from src.core.tracing import TracedRoute
+
+router = APIRouter(prefix="/api/tasks", tags=["Tasks"], route_class=TracedRoute)
 
-router = APIRouter(prefix="/api/tasks", tags=["Tasks"])
+
+def get_task_filter(
+    status: TaskStatus | None = None,
+    assigned_to_id: UUID | None = None,
+    due_after: datetime | None = None,
+    due_before: datetime | None = None,
+    overdue: bool | None = None,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+    updated_after: datetime | None = None,
+    updated_before: datetime | None = None,
+    sort_by: TaskSortField = TaskSortField.CREATED_AT,
+    sort_order: SortOrder = SortOrder.DESC,
+    include_archived: bool = False,
+) -> TaskFilter:
+    """Dependency: Build a TaskFilter from list query parameters"""
+    return TaskFilter(
+        status=status,
+        assigned_to_id=assigned_to_id,
+        due_after=due_after,
+        due_before=due_before,
+        overdue=overdue,
+        created_after=created_after,
+        created_before=created_before,
+        updated_after=updated_after,
+        updated_before=updated_before,
+        sort_by=sort_by,
+        sort_order=sort_order,
+        include_archived=include_archived,
+    )
 
 
 @router.post("", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
@@ -31,34 +81,119 @@ async def create_task(
         )
 
 
+@router.post("/lookup", response_model=TaskLookupResponse)
+async def lookup_tasks(
+    lookup: TaskLookupRequest,
+    current_user: UserResponse = Depends(get_current_user),
+    service: TaskService = Depends(get_task_service),
+):
+    """Get many tasks by ID in one request (found/forbidden/missing)"""
+    try:
+        return await service.lookup_tasks(lookup.ids, current_user.id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+
 @router.get("/assigned", response_model=list[TaskDetailResponse])
 async def list_assigned_tasks(
+    task_filter: TaskFilter = Depends(get_task_filter),
     current_user: UserResponse = Depends(get_current_user),
     service: TaskService = Depends(get_task_service),
 ):
-    """List tasks assigned to user"""
-    return await service.list_assigned_tasks(current_user.id)
+    """List tasks assigned to user with optional filters and sorting"""
+    try:
+        return await service.list_assigned_tasks(current_user.id, task_filter)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
 
 
 @router.get("", response_model=list[TaskDetailResponse])
 async def list_tasks(
-    status: TaskStatus | None = None,
+    task_filter: TaskFilter = Depends(get_task_filter),
     current_user: UserResponse = Depends(get_current_user),
     service: TaskService = Depends(get_task_service),
 ):
-    """List user's tasks with optional status filter"""
-    return await service.list_user_tasks(current_user.id, status)
+    """List user's tasks with optional filters and sorting"""
+    try:
+        return await service.list_user_tasks(current_user.id, task_filter=task_filter)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+
+@router.get("/events")
+async def stream_task_events(current_user: UserResponse = Depends(get_current_user)):
+    """Push changes to the user's own and assigned tasks (Server-Sent Events)
+
+    Events are task.created / task.updated / task.deleted, and
+    task.due_soon / task.overdue from the scheduler, with a TaskEvent
+    as data. A resync event means events were dropped: refetch and reconnect.
+    """
+    try:
+        subscription = task_events.subscribe(current_user.id)
+    except ConnectionLimitError as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+        )
+    return EventStreamResponse(
+        sse_stream(subscription),
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/changes", response_model=TaskChangesResponse)
+async def list_task_changes(
+    since: str | None = None,
+    limit: int = Query(
+        default=settings.task_changes_page_size,
+        ge=1,
+        le=settings.task_changes_page_max_size,
+    ),
+    current_user: UserResponse = Depends(get_current_user),
+    service: TaskService = Depends(get_task_service),
+):
+    """Delta sync: the caller's tasks changed since a cursor
+
+    Call without since to get a starting cursor, then fetch the full lists.
+    Apply each change (upsert or delete) and pass the returned cursor next
+    time; repeat while has_more. 410 means the cursor is older than the
+    change log: fetch the full lists again.
+    """
+    try:
+        return await service.list_changes(current_user.id, since, limit)
+    except CursorExpiredError as e:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail=str(e),
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
 
 
 @router.get("/{task_id}", response_model=TaskDetailResponse)
 async def get_task(
     task_id: UUID,
+    response: Response,
     current_user: UserResponse = Depends(get_current_user),
     service: TaskService = Depends(get_task_service),
 ):
-    """Get a task by ID"""
+    """Get a task by ID (version returned as ETag)"""
     try:
-        return await service.get_task(task_id, current_user.id)
+        task = await service.get_task(task_id, current_user.id)
+        response.headers["ETag"] = f'"{task.version}"'
+        return task
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -75,13 +210,28 @@ async def get_task(
 async def update_task(
     task_id: UUID,
     task_data: TaskUpdate,
+    response: Response,
+    if_match_version: int | None = Depends(get_expected_version),
     current_user: UserResponse = Depends(get_current_user),
     service: TaskService = Depends(get_task_service),
 ):
-    """Update a task"""
+    """Update a task; If-Match or body version makes the update conditional"""
+    expected_version = (
+        task_data.version if task_data.version is not None else if_match_version
+    )
     try:
-        return await service.update_task(
-            task_id, current_user.id, task_data.model_dump(exclude_unset=True)
+        task = await service.update_task(
+            task_id,
+            current_user.id,
+            task_data.model_dump(exclude_unset=True, exclude={"version"}),
+            expected_version,
+        )
+        response.headers["ETag"] = f'"{task.version}"'
+        return task
+    except VersionConflictError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
         )
     except ValueError as e:
         raise HTTPException(
@@ -114,3 +264,24 @@ async def delete_task(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=str(e),
         )
+
+
+@router.post("/{task_id}/restore", response_model=TaskResponse)
+async def restore_task(
+    task_id: UUID,
+    current_user: UserResponse = Depends(get_current_user),
+    service: TaskService = Depends(get_task_service),
+):
+    """Move an archived task back into the active task list"""
+    try:
+        return await service.restore_task(task_id, current_user.id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e),
+        )
+    except PermissionError as e:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=str(e),
+        )
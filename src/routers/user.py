@@ -1,27 +1,70 @@
 from typing import Sequence
 
-from fastapi import APIRouter, status, HTTPException, Depends
+from fastapi import APIRouter, status, HTTPException, Depends, Query, Response
+from fastapi.responses import StreamingResponse
 from uuid import UUID
 
-from src.models import UserCreate, UserResponse, UserUpdate
+from src.config import settings
+from src.core.exceptions import VersionConflictError
+from src.models import UserCreate, UserResponse, UserSummary, UserUpdate
 from src.services.user_services import UserService
-from src.dependencies import get_user_service, get_current_user
+from src.dependencies import (
+    get_current_user,
+    get_expected_version,
+    get_user_service,
+    require_owner,
+)
+from src.core.tracing import TracedRoute
 
-router = APIRouter(prefix="/api/users", tags=["Users"])
+router = APIRouter(prefix="/api/users", tags=["Users"], route_class=TracedRoute)
 
 
 @router.get("", response_model=Sequence[UserResponse])
 async def list_users(
-    current_user: UserResponse = Depends(get_current_user),
+    response: Response,
+    limit: int = Query(
+        default=settings.user_page_size, ge=1, le=settings.user_page_max_size
+    ),
+    cursor: str | None = None,
+    current_user: UserResponse = Depends(require_owner),
     service: UserService = Depends(get_user_service),
 ):
-    """Get all users (owner only)"""
-    if current_user.role != "owner":
+    """Get a page of users (owner only); next page cursor in X-Next-Cursor"""
+    try:
+        users, next_cursor = await service.list_users_page(limit, cursor)
+    except ValueError as e:
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only owners can list all users",
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
         )
-    return await service.get_all_users()
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return users
+
+
+@router.get("/lookup", response_model=list[UserSummary])
+async def lookup_users(
+    q: str = Query(min_length=1),
+    limit: int = Query(default=10, ge=1, le=50),
+    current_user: UserResponse = Depends(get_current_user),
+    service: UserService = Depends(get_user_service),
+):
+    """Autocomplete users by name or email prefix (for picking assignees)"""
+    return service.suggest_users(q, limit)
+
+
+@router.get("/stream")
+async def stream_users(
+    current_user: UserResponse = Depends(require_owner),
+    service: UserService = Depends(get_user_service),
+):
+    """Stream every user as NDJSON (owner only)"""
+
+    async def ndjson():
+        async for user in service.stream_users(settings.user_page_size):
+            yield user.model_dump_json() + "\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
 
 
 @router.post("", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
@@ -65,19 +108,33 @@ async def get_user(
 async def update_user(
     user_id: UUID,
     user_data: UserUpdate,
+    response: Response,
+    if_match_version: int | None = Depends(get_expected_version),
     current_user: UserResponse = Depends(get_current_user),
     service: UserService = Depends(get_user_service),
 ):
-    """Update user information"""
+    """Update user information; If-Match or body version makes it conditional"""
     if current_user.id != user_id and current_user.role != "owner":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You don't have permission to modify this profile",
         )
 
+    expected_version = (
+        user_data.version if user_data.version is not None else if_match_version
+    )
     try:
-        return await service.update_user(
-            user_id, user_data.model_dump(exclude_unset=True)
+        user = await service.update_user(
+            user_id,
+            user_data.model_dump(exclude_unset=True, exclude={"version"}),
+            expected_version,
+        )
+        response.headers["ETag"] = f'"{user.version}"'
+        return user
+    except VersionConflictError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
         )
     except ValueError as e:
         error_msg = str(e)
@@ -1,11 +1,33 @@
+"""Database seeding commands.
+
+    python -m src.seed              # demo owner/member users (SEED_DEMO_DATA)
+    python -m src.seed generate --users 100000 --tasks 5000000
+
+``generate`` bulk-loads synthetic users and tasks for scaling tests: tasks
+per user follow a Zipf-like skew, a share of tasks is assigned to another
+user, statuses follow a configurable mix and due dates spread around the
+creation date. Rows are streamed in batches (COPY on Postgres/asyncpg,
+executemany elsewhere), so memory stays flat for millions of rows.
+"""
+
 from __future__ import annotations
 
+import argparse
+import asyncio
+import itertools
 import logging
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable, Iterator
+from uuid import UUID
 
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Table, insert, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
 
 from src.config import settings
-from src.models import User
+from src.db import AsyncSessionLocal, engine, prepare_database
+from src.models import Task, TaskStatus, User
 from src.repositories.user_repository import UserRepository
 from src.services.user_services import UserService
 
@@ -15,8 +37,8 @@ logger = logging.getLogger(__name__)
 async def seed_demo_admin(session: AsyncSession) -> None:
     """Create demo admin (owner) and member users if configured.
 
-    This runs at startup (lifespan) and is fully internal: no HTTP endpoint
-    is exposed for creating users.
+    Run as a separate command (python -m src.seed), not at worker startup;
+    no HTTP endpoint is exposed for creating users.
     """
 
     # Safety guard: only seed when explicitly enabled
@@ -79,3 +101,280 @@ async def seed_demo_admin(session: AsyncSession) -> None:
         "Demo member user created with email %s and role 'member'",
         settings.demo_member_email,
     )
+
+
+DEFAULT_STATUS_MIX = "pending=0.5,in_progress=0.2,completed=0.3"
+
+
+def parse_status_mix(value: str) -> dict[str, float]:
+    """ "pending=0.5,in_progress=0.2,completed=0.3" -> weights per status"""
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight)
+    unknown = set(mix) - {status.value for status in TaskStatus}
+    if unknown:
+        raise ValueError(f"Unknown task statuses: {sorted(unknown)}")
+    if sum(mix.values()) <= 0:
+        raise ValueError("Status weights must add up to more than zero")
+    return mix
+
+
+def _batches(rows: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    iterator = iter(rows)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+
+def generate_users(
+    count: int,
+    password_hash: str,
+    rng: random.Random,
+    now: datetime,
+    email_prefix: str = "user",
+) -> Iterator[dict[str, Any]]:
+    """User rows sharing one precomputed password hash, created over a year"""
+    for i in range(count):
+        created_at = now - timedelta(seconds=rng.uniform(0, 365 * 86400))
+        yield {
+            "id": UUID(int=rng.getrandbits(128), version=4),
+            "name": f"Generated User {i}",
+            "email": f"{email_prefix}{i}@example.com",
+            "password_hash": password_hash,
+            "role": "member",
+            "version": 1,
+            "created_at": created_at,
+            "updated_at": created_at,
+        }
+
+
+def generate_tasks(
+    count: int,
+    user_ids: list[UUID],
+    rng: random.Random,
+    now: datetime,
+    skew: float = 1.1,
+    assign_ratio: float = 0.3,
+    status_mix: dict[str, float] | None = None,
+    due_ratio: float = 0.8,
+) -> Iterator[dict[str, Any]]:
+    """Task rows with realistic owner, assignee, status and date distributions
+
+    Owners are drawn with weight 1 / rank**skew over a shuffled user order,
+    so a few users own most tasks and many own a handful (skew 0: uniform).
+    A task is assigned to another random user with probability assign_ratio
+    and has a due date with probability due_ratio, 1-45 days after creation
+    (so older open tasks are overdue). updated_at is biased towards the
+    creation date, as most tasks are edited soon after they are created.
+    """
+    ranked = user_ids[:]
+    rng.shuffle(ranked)
+    cum_weights = list(
+        itertools.accumulate(1 / (rank + 1) ** skew for rank in range(len(ranked)))
+    )
+    mix = status_mix or parse_status_mix(DEFAULT_STATUS_MIX)
+    statuses, status_weights = list(mix), list(mix.values())
+
+    done = 0
+    while done < count:
+        chunk = min(10_000, count - done)
+        owners = rng.choices(ranked, cum_weights=cum_weights, k=chunk)
+        chosen_statuses = rng.choices(statuses, status_weights, k=chunk)
+        for owner_id, status in zip(owners, chosen_statuses):
+            created_at = now - timedelta(seconds=rng.uniform(0, 365 * 86400))
+            age = (now - created_at).total_seconds()
+            assignee = None
+            if len(user_ids) > 1 and rng.random() < assign_ratio:
+                assignee = rng.choice(user_ids)
+                while assignee == owner_id:
+                    assignee = rng.choice(user_ids)
+            due_date = None
+            if rng.random() < due_ratio:
+                due_date = created_at + timedelta(days=rng.uniform(1, 45))
+            yield {
+                "id": UUID(int=rng.getrandbits(128), version=4),
+                "title": f"Generated task {done}",
+                "description": None if rng.random() < 0.5 else "Generated",
+                "status": status,
+                "owner_id": owner_id,
+                "assigned_to_id": assignee,
+                "due_date": due_date,
+                "version": 1,
+                "created_at": created_at,
+                "updated_at": created_at + timedelta(seconds=age * rng.random() ** 3),
+            }
+            done += 1
+
+
+async def bulk_insert(
+    conn: AsyncConnection, table: Table, rows: Iterable[dict], batch_size: int
+) -> int:
+    """Stream rows into table in batches; COPY on asyncpg, executemany elsewhere"""
+    inserted = 0
+    if conn.dialect.name == "postgresql" and conn.dialect.driver == "asyncpg":
+        raw = await conn.get_raw_connection()
+        driver = raw.driver_connection
+        columns = [column.name for column in table.columns]
+        for batch in _batches(rows, batch_size):
+            await driver.copy_records_to_table(
+                table.name,
+                records=[tuple(row[c] for c in columns) for row in batch],
+                columns=columns,
+            )
+            inserted += len(batch)
+    else:
+        statement = insert(table)
+        for batch in _batches(rows, batch_size):
+            await conn.execute(statement, batch)
+            inserted += len(batch)
+    return inserted
+
+
+async def generate_data(
+    bind: AsyncEngine,
+    users: int,
+    tasks: int,
+    *,
+    seed: int = 0,
+    skew: float = 1.1,
+    assign_ratio: float = 0.3,
+    status_mix: dict[str, float] | None = None,
+    due_ratio: float = 0.8,
+    batch_size: int = 10_000,
+    password: str = "password123",
+    email_prefix: str = "user",
+) -> dict[str, float]:
+    """Bulk-load synthetic users and tasks; returns row counts and timings
+
+    The password is hashed once and shared by every generated user, since
+    bcrypt at ~100ms per hash would otherwise dominate the run. Everything
+    goes in one transaction, so a failed run leaves no partial data.
+    """
+    if tasks and not users:
+        raise ValueError("Tasks need at least one user to own them")
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    password_hash = UserService.hash_password(password)
+    user_ids: list[UUID] = []
+
+    def remember_ids(rows: Iterable[dict]) -> Iterator[dict]:
+        for row in rows:
+            user_ids.append(row["id"])
+            yield row
+
+    started = time.perf_counter()
+    async with bind.begin() as conn:
+        if conn.dialect.name == "sqlite":
+            # Random UUID keys touch pages all over each index; a 256MB page
+            # cache keeps them in memory (about 2x faster on large loads)
+            await conn.exec_driver_sql("PRAGMA cache_size=-262144")
+        await bulk_insert(
+            conn,
+            User.__table__,
+            remember_ids(generate_users(users, password_hash, rng, now, email_prefix)),
+            batch_size,
+        )
+        users_done = time.perf_counter()
+        await bulk_insert(
+            conn,
+            Task.__table__,
+            generate_tasks(
+                tasks, user_ids, rng, now, skew, assign_ratio, status_mix, due_ratio
+            ),
+            batch_size,
+        )
+        tasks_done = time.perf_counter()
+    if bind.dialect.name == "postgresql":
+        # Fresh planner statistics, or the first queries plan for empty tables
+        async with bind.connect() as conn:
+            await conn.execute(text('ANALYZE "user", task'))
+
+    return {
+        "users": users,
+        "tasks": tasks,
+        "users_seconds": round(users_done - started, 3),
+        "tasks_seconds": round(tasks_done - users_done, 3),
+    }
+
+
+async def main() -> None:
+    """Seed demo users into the configured database
+
+    Runs the same schema step as worker startup first, so it also works on a
+    fresh database (the compose seed service runs before the API).
+    """
+    if not settings.seed_demo_data:
+        logger.warning("SEED_DEMO_DATA is not enabled; nothing to seed.")
+        return
+    await prepare_database()
+    async with AsyncSessionLocal() as session:
+        await seed_demo_admin(session)
+    await engine.dispose()
+
+
+async def generate_main(args: argparse.Namespace) -> None:
+    """Bulk-load synthetic data into the configured database"""
+    result = await generate_data(
+        engine,
+        args.users,
+        args.tasks,
+        seed=args.seed,
+        skew=args.skew,
+        assign_ratio=args.assign_ratio,
+        status_mix=args.status_mix,
+        due_ratio=args.due_ratio,
+        batch_size=args.batch_size,
+        password=args.password,
+        email_prefix=args.email_prefix,
+    )
+    await engine.dispose()
+    logger.info(
+        "Generated %d users in %.1fs and %d tasks in %.1fs (%.0f tasks/s)",
+        result["users"],
+        result["users_seconds"],
+        result["tasks"],
+        result["tasks_seconds"],
+        result["tasks"] / result["tasks_seconds"] if result["tasks_seconds"] else 0,
+    )
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m src.seed")
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("demo", help="demo owner/member users (default)")
+    generate = commands.add_parser("generate", help="bulk synthetic users and tasks")
+    generate.add_argument("--users", type=int, default=1_000)
+    generate.add_argument("--tasks", type=int, default=100_000)
+    generate.add_argument("--seed", type=int, default=0, help="random seed")
+    generate.add_argument(
+        "--skew", type=float, default=1.1, help="Zipf exponent of tasks per user"
+    )
+    generate.add_argument(
+        "--assign-ratio", type=float, default=0.3, help="share of assigned tasks"
+    )
+    generate.add_argument(
+        "--status-mix",
+        type=parse_status_mix,
+        default=parse_status_mix(DEFAULT_STATUS_MIX),
+        help=f"status weights (default {DEFAULT_STATUS_MIX})",
+    )
+    generate.add_argument(
+        "--due-ratio", type=float, default=0.8, help="share of tasks with a due date"
+    )
+    generate.add_argument("--batch-size", type=int, default=10_000)
+    generate.add_argument("--password", default="password123")
+    generate.add_argument(
+        "--email-prefix",
+        default="user",
+        help="emails are <prefix><n>@example.com; change it to load more users",
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    cli_args = parse_args()
+    if cli_args.command == "generate":
+        asyncio.run(generate_main(cli_args))
+    else:
+        asyncio.run(main())
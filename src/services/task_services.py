@@ -1,24 +1,88 @@
+import base64
 from uuid import UUID
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
+from src.config import settings
+from src.core.event_bus import TASK_TOPIC, event_bus
+from src.core.exceptions import CursorExpiredError
+from src.core.tracing import traced
+from src.db import releases_connection
 from src.models import (
     Task,
+    TaskChangeItem,
+    TaskChangeOp,
+    TaskChangesResponse,
     TaskCreate,
+    TaskEvent,
+    TaskEventType,
     TaskUpdate,
     TaskResponse,
     TaskDetailResponse,
+    TaskFilter,
+    TaskLookupResponse,
     TaskStatus,
     User,
 )
 from src.repositories.task_repository import TaskRepository
 
 
+def _encode_change_cursor(change_id: int, needed_since: datetime) -> str:
+    """Opaque delta sync cursor: the last change seen, and the oldest log
+    time the next read may still need (compared against retention)"""
+    raw = f"{change_id}|{needed_since.isoformat()}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_change_cursor(cursor: str) -> tuple[int, datetime]:
+    """Parse a cursor produced by _encode_change_cursor"""
+    try:
+        change_id, needed_since = (
+            base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        )
+        return int(change_id), _as_utc(datetime.fromisoformat(needed_since))
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+
+
+def _as_utc(moment: datetime) -> datetime:
+    """SQLite hands back naive datetimes; they are stored as UTC"""
+    return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+
+
+@traced("service")
 class TaskService:
     """Business logic layer for Task operations"""
 
     def __init__(self, repository: TaskRepository):
         self.repo = repository
 
+    @staticmethod
+    def can_view(task: Task, user_id: UUID) -> bool:
+        """A task is visible to its owner and its assignee"""
+        return task.owner_id == user_id or task.assigned_to_id == user_id
+
+    @staticmethod
+    def _publish(
+        event_type: TaskEventType,
+        task_id: UUID,
+        task: TaskResponse | None,
+        *recipients: UUID | None,
+    ) -> None:
+        """Announce a committed change to the given users' push connections
+
+        Other workers get ids only and load the task themselves, so the
+        event stays small whatever the task holds.
+        """
+        event = TaskEvent(type=event_type, task_id=task_id, task=task)
+        data = {
+            "type": event_type.value,
+            "task_id": str(task_id),
+            "recipients": sorted({str(r) for r in recipients if r is not None}),
+            "occurred_at": event.occurred_at.isoformat(),
+        }
+        event_bus.publish(TASK_TOPIC, data, local={**data, "event": event})
+
+    @releases_connection
     async def create_task(self, owner_id: UUID, task_data: TaskCreate) -> TaskResponse:
         """Create a new task"""
         if task_data.assigned_to_id:
@@ -36,8 +100,17 @@ class TaskService:
         )
 
         created_task = await self.repo.create_task(task)
-        return TaskResponse.model_validate(created_task)
+        response = TaskResponse.model_validate(created_task)
+        self._publish(
+            TaskEventType.CREATED,
+            response.id,
+            response,
+            owner_id,
+            response.assigned_to_id,
+        )
+        return response
 
+    @releases_connection
     async def get_task(self, task_id: UUID, user_id: UUID) -> TaskDetailResponse:
         """Get a task with permission check"""
         task = await self.repo.get_task_by_id_with_users(task_id)
@@ -45,32 +118,141 @@ class TaskService:
             raise ValueError(f"Task with id {task_id} not found")
 
         # Check if user is owner or assigned to the task
-        if task.owner_id != user_id and task.assigned_to_id != user_id:
+        if not self.can_view(task, user_id):
             raise PermissionError("You don't have permission to view this task")
 
         return TaskDetailResponse.model_validate(task)
 
+    @releases_connection
+    async def lookup_tasks(
+        self, task_ids: list[UUID], user_id: UUID
+    ) -> TaskLookupResponse:
+        """Get many tasks at once, applying the get_task permission rule per id"""
+        # Deduplicate while keeping the caller's order
+        unique_ids = list(dict.fromkeys(task_ids))
+        if len(unique_ids) > settings.task_lookup_max_ids:
+            raise ValueError(
+                f"Cannot look up more than {settings.task_lookup_max_ids} tasks at once"
+            )
+
+        tasks = {task.id: task for task in await self.repo.get_tasks_by_ids(unique_ids)}
+
+        found: list[TaskDetailResponse] = []
+        forbidden: list[UUID] = []
+        missing: list[UUID] = []
+        for task_id in unique_ids:
+            task = tasks.get(task_id)
+            if task is None:
+                missing.append(task_id)
+            elif not self.can_view(task, user_id):
+                forbidden.append(task_id)
+            else:
+                found.append(TaskDetailResponse.model_validate(task))
+
+        return TaskLookupResponse(found=found, forbidden=forbidden, missing=missing)
+
+    @releases_connection
+    async def list_changes(
+        self, user_id: UUID, since: str | None, limit: int
+    ) -> TaskChangesResponse:
+        """Tasks changed for the user since a cursor, one entry per task
+
+        Without a cursor, returns no changes and a cursor past the settled
+        entries: take it before fetching the full lists. Each task appears
+        once, with its current state if the user can still see it, else as a
+        delete. The cursor only moves past entries older than
+        task_changes_settle_seconds, so newer ones may be sent twice.
+        """
+        now = datetime.now(timezone.utc)
+        settled_before = now - timedelta(seconds=settings.task_changes_settle_seconds)
+        if since is None:
+            latest = await self.repo.get_latest_change_id(settled_before)
+            return TaskChangesResponse(
+                changes=[],
+                cursor=_encode_change_cursor(latest, settled_before),
+                has_more=False,
+            )
+
+        after_id, needed_since = _decode_change_cursor(since)
+        retention = timedelta(days=settings.task_changes_retention_days)
+        if needed_since < now - retention:
+            raise CursorExpiredError()
+
+        entries = await self.repo.get_changes_since(user_id, after_id, limit)
+        cursor_id = after_id
+        if not entries:
+            needed_since = settled_before
+        for entry in entries:
+            changed_at = _as_utc(entry.changed_at)
+            if changed_at > settled_before:
+                break
+            cursor_id = entry.id
+            needed_since = changed_at - timedelta(
+                seconds=settings.task_changes_settle_seconds
+            )
+
+        latest = {entry.task_id: entry for entry in entries}
+        tasks = {
+            task.id: task for task in await self.repo.get_tasks_by_ids(list(latest))
+        }
+        changes = []
+        for task_id, entry in sorted(latest.items(), key=lambda item: item[1].id):
+            task = tasks.get(task_id)
+            if task is not None and self.can_view(task, user_id):
+                item = TaskChangeItem(
+                    op=TaskChangeOp.UPSERT,
+                    task_id=task_id,
+                    task=TaskDetailResponse.model_validate(task),
+                    changed_at=entry.changed_at,
+                )
+            else:
+                item = TaskChangeItem(
+                    op=TaskChangeOp.DELETE, task_id=task_id, changed_at=entry.changed_at
+                )
+            changes.append(item)
+
+        return TaskChangesResponse(
+            changes=changes,
+            cursor=_encode_change_cursor(cursor_id, needed_since),
+            # A full page stopped by unsettled entries has nothing more yet
+            has_more=len(entries) == limit and cursor_id == entries[-1].id,
+        )
+
+    @releases_connection
     async def list_user_tasks(
-        self, user_id: UUID, status: TaskStatus | None = None
+        self,
+        user_id: UUID,
+        status: TaskStatus | None = None,
+        task_filter: TaskFilter | None = None,
     ) -> list[TaskDetailResponse]:
-        """List tasks owned by user, optionally filtered by status"""
-        if status:
-            tasks = await self.repo.get_tasks_by_status(user_id, status)
-        else:
-            tasks = await self.repo.get_tasks_by_owner(user_id)
+        """List tasks owned by user, optionally filtered and sorted"""
+        if task_filter is None:
+            task_filter = TaskFilter(status=status)
+        tasks = await self.repo.list_tasks(task_filter, owner_id=user_id)
 
         return [TaskDetailResponse.model_validate(task) for task in tasks]
 
-    async def list_assigned_tasks(self, user_id: UUID) -> list[TaskDetailResponse]:
-        """List tasks assigned to user"""
-        tasks = await self.repo.get_tasks_assigned_to(user_id)
+    @releases_connection
+    async def list_assigned_tasks(
+        self, user_id: UUID, task_filter: TaskFilter | None = None
+    ) -> list[TaskDetailResponse]:
+        """List tasks assigned to user, optionally filtered and sorted"""
+        task_filter = (task_filter or TaskFilter()).model_copy(
+            update={"assigned_to_id": user_id}
+        )
+        tasks = await self.repo.list_tasks(task_filter)
 
         return [TaskDetailResponse.model_validate(task) for task in tasks]
 
+    @releases_connection
     async def update_task(
-        self, task_id: UUID, user_id: UUID, task_data: dict
+        self,
+        task_id: UUID,
+        user_id: UUID,
+        task_data: dict,
+        expected_version: int | None = None,
     ) -> TaskResponse:
-        """Update a task with permission check"""
+        """Update a task with permission check and optional version check"""
         task = await self.repo.get_task_by_id(task_id)
         if not task:
             raise ValueError(f"Task not found")
@@ -85,9 +267,21 @@ class TaskService:
         #     k: v for k, v in task_data.model_dump().items() if v is not None
         # }
 
-        updated_task = await self.repo.update_task(task_id, task_data)
-        return TaskResponse.model_validate(updated_task)
+        previous_assignee = task.assigned_to_id
+        updated_task = await self.repo.update_task(task_id, task_data, expected_version)
+        response = TaskResponse.model_validate(updated_task)
+        # The previous assignee hears about a reassignment away from them
+        self._publish(
+            TaskEventType.UPDATED,
+            task_id,
+            response,
+            response.owner_id,
+            response.assigned_to_id,
+            previous_assignee,
+        )
+        return response
 
+    @releases_connection
     async def delete_task(self, task_id: UUID, user_id: UUID) -> bool:
         """Delete a task with permission check"""
         task = await self.repo.get_task_by_id(task_id)
@@ -99,4 +293,102 @@ class TaskService:
                 "Permission denied: only the task owner can delete this task"
             )
 
-        return await self.repo.delete_task(task_id)
+        recipients = (task.owner_id, task.assigned_to_id)
+        deleted = await self.repo.delete_task(task_id)
+        if deleted:
+            self._publish(TaskEventType.DELETED, task_id, None, *recipients)
+        return deleted
+
+    @releases_connection
+    async def restore_task(self, task_id: UUID, user_id: UUID) -> TaskResponse:
+        """Restore an archived task with permission check"""
+        archived = await self.repo.get_archived_task_by_id(task_id)
+        if not archived:
+            raise ValueError(f"Archived task with id {task_id} not found")
+
+        if archived.owner_id != user_id:
+            raise PermissionError(
+                "Permission denied: only the task owner can restore this task"
+            )
+
+        restored_task = await self.repo.restore_task(task_id)
+        response = TaskResponse.model_validate(restored_task)
+        self._publish(
+            TaskEventType.CREATED,
+            task_id,
+            response,
+            response.owner_id,
+            response.assigned_to_id,
+        )
+        return response
+
+    @releases_connection
+    async def archive_completed_tasks(
+        self, older_than: timedelta, batch_size: int
+    ) -> int:
+        """Archive completed tasks untouched for older_than, batch by batch"""
+        cutoff = datetime.now(timezone.utc) - older_than
+        total = 0
+        while True:
+            moved = await self.repo.archive_completed_tasks(cutoff, batch_size)
+            total += moved
+            if moved < batch_size:
+                return total
+
+    @releases_connection
+    async def process_due_dates(
+        self, now: datetime, due_soon_within: timedelta, batch_size: int
+    ) -> dict[TaskEventType, int]:
+        """Emit due_soon/overdue events for open tasks that crossed the line
+
+        Each kind keeps a watermark: a run scans (watermark, boundary] in
+        batches, then moves the watermark to the boundary, so every task is
+        announced once as its due date approaches and once as it passes. The
+        first run starts at now and announces nothing that was already
+        overdue. A run cut short is repeated, so delivery is at least once.
+        """
+        boundaries = {
+            TaskEventType.OVERDUE: now,
+            TaskEventType.DUE_SOON: now + due_soon_within,
+        }
+        emitted: dict[TaskEventType, int] = {}
+        for event_type, boundary in boundaries.items():
+            watermark = await self.repo.get_due_watermark(event_type.value)
+            emitted[event_type] = 0
+            if watermark is None:
+                # First run: start from now, so an empty window still records it
+                watermark = now
+            elif boundary <= _as_utc(watermark):
+                continue
+            start = _as_utc(watermark)
+
+            after = None
+            while True:
+                tasks = await self.repo.get_tasks_due_between(
+                    start, boundary, batch_size, after
+                )
+                for task in tasks:
+                    self._publish(
+                        event_type,
+                        task.id,
+                        TaskResponse.model_validate(task),
+                        task.owner_id,
+                        task.assigned_to_id,
+                    )
+                emitted[event_type] += len(tasks)
+                if len(tasks) < batch_size:
+                    break
+                after = (tasks[-1].due_date, tasks[-1].id)
+            await self.repo.set_due_watermark(event_type.value, boundary)
+        return emitted
+
+    @releases_connection
+    async def prune_changes(self, older_than: timedelta, batch_size: int) -> int:
+        """Delete change log entries older than the retention, batch by batch"""
+        cutoff = datetime.now(timezone.utc) - older_than
+        total = 0
+        while True:
+            pruned = await self.repo.prune_changes(cutoff, batch_size)
+            total += pruned
+            if pruned < batch_size:
+                return total
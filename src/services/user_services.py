@@ -1,12 +1,42 @@
-from typing import Sequence
+import base64
+import functools
+from datetime import datetime
+from typing import AsyncIterator
 from uuid import UUID
-from passlib.context import CryptContext
-from src.models import UserCreate, UserResponse, User
+from src.core.event_bus import USER_TOPIC, event_bus
+from src.core.user_index import user_index
+from src.core.tracing import start_span, traced
+from src.db import release_connection, releases_connection
+from src.models import UserCreate, UserResponse, UserSummary, User
 from src.repositories.user_repository import UserRepository
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+@functools.cache
+def pwd_context():
+    """bcrypt context, built on first use to keep passlib off the import path"""
+    from passlib.context import CryptContext
 
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def _encode_cursor(created_at: datetime, user_id: UUID) -> str:
+    """Opaque keyset cursor for the user directory"""
+    raw = f"{created_at.isoformat()}|{user_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Parse a cursor produced by _encode_cursor"""
+    try:
+        created_at, user_id = (
+            base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        )
+        return datetime.fromisoformat(created_at), UUID(user_id)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+
+
+@traced("service")
 class UserService:
     """Business logic layer for User operations"""
 
@@ -16,23 +46,48 @@ class UserService:
     @staticmethod
     def hash_password(password: str) -> str:
         """Hash password using bcrypt"""
-        return pwd_context.hash(password)
+        with start_span("bcrypt.hash", "crypto"):
+            return pwd_context().hash(password)
+
+    @staticmethod
+    def _publish(user: User) -> None:
+        """Announce a committed user change to every worker's lookup index"""
+        summary = UserSummary.model_validate(user)
+        event_bus.publish(USER_TOPIC, summary.model_dump(mode="json"))
 
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
         """Verify plain password against hashed password"""
-        return pwd_context.verify(plain_password, hashed_password)
-
-    async def get_all_users(self) -> Sequence[UserResponse]:
-        """Get all users"""
-        users = await self.repo.get_all_users()
-        return [UserResponse.model_validate(user) for user in users]
-
+        with start_span("bcrypt.verify", "crypto"):
+            return pwd_context().verify(plain_password, hashed_password)
+
+    @releases_connection
+    async def list_users_page(
+        self, limit: int, cursor: str | None = None
+    ) -> tuple[list[UserResponse], str | None]:
+        """Get a page of users and the cursor for the next page"""
+        after = _decode_cursor(cursor) if cursor else None
+        rows = await self.repo.get_users_page(limit, after)
+        users = [UserResponse.model_validate(row._mapping) for row in rows]
+
+        next_cursor = None
+        if len(rows) == limit:
+            next_cursor = _encode_cursor(rows[-1].created_at, rows[-1].id)
+        return users, next_cursor
+
+    async def stream_users(self, batch_size: int) -> AsyncIterator[UserResponse]:
+        """Yield every user, fetched in keyset batches"""
+        async for row in self.repo.stream_users(batch_size):
+            yield UserResponse.model_validate(row._mapping)
+
+    @releases_connection
     async def register_user(self, user_data: UserCreate) -> UserResponse:
         """Register a new user"""
         existing_user = await self.repo.get_user_by_email(user_data.email)
         if existing_user:
             raise ValueError("Email already registered")
+        # Don't hold a pooled connection while bcrypt runs
+        await release_connection(self.repo.db)
 
         user = User(
             name=user_data.name,
@@ -41,8 +96,10 @@ class UserService:
         )
 
         created_user = await self.repo.create_user(user)
+        self._publish(created_user)
         return UserResponse.model_validate(created_user)
 
+    @releases_connection
     async def get_user(self, user_id: UUID) -> UserResponse:
         """Get user by id"""
         user = await self.repo.get_user_by_id(user_id)
@@ -51,8 +108,11 @@ class UserService:
 
         return UserResponse.model_validate(user)
 
-    async def update_user(self, user_id: UUID, user_data: dict) -> UserResponse:
-        """Update user info"""
+    @releases_connection
+    async def update_user(
+        self, user_id: UUID, user_data: dict, expected_version: int | None = None
+    ) -> UserResponse:
+        """Update user info, optionally conditional on the expected version"""
         user = await self.repo.get_user_by_id(user_id)
         if not user:
             raise ValueError("User not found")
@@ -63,14 +123,30 @@ class UserService:
                 raise ValueError("Email already registered")
 
         if "password" in user_data and user_data["password"] is not None:
+            await release_connection(self.repo.db)
             user_data["password_hash"] = self.hash_password(user_data.pop("password"))
 
-        updated_user = await self.repo.update_user(user_id, user_data)
+        updated_user = await self.repo.update_user(user_id, user_data, expected_version)
+        self._publish(updated_user)
         return UserResponse.model_validate(updated_user)
 
+    @releases_connection
+    async def rebuild_user_index(self) -> int:
+        """Load every user into the in-memory autocomplete index"""
+        users = await self.repo.get_all_users()
+        user_index.build([UserSummary.model_validate(user._mapping) for user in users])
+        return len(user_index)
+
+    def suggest_users(self, query: str, limit: int) -> list[UserSummary]:
+        """Prefix-match users by name or email from the in-memory index"""
+        return user_index.search(query, limit)
+
+    @releases_connection
     async def authenticate_user(self, email: str, password: str) -> UserResponse:
         """Authenticate user"""
         user = await self.repo.get_user_by_email(email)
+        # Don't hold a pooled connection while bcrypt runs
+        await release_connection(self.repo.db)
         if not user or not self.verify_password(password, user.password_hash):
             raise ValueError("Invalid email or password")
 
@@ -0,0 +1,159 @@
+"""Startup warm-up so a fresh worker's first real requests are not the slow ones.
+
+Pool connections, SQLAlchemy's compiled-statement caches, the lambda_stmt
+caches, Pydantic serializers, the JWT codec and the bcrypt backend all
+initialize lazily. warm_up() exercises each once from the lifespan hook;
+readiness stays red until it has finished.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from contextlib import AsyncExitStack
+from datetime import datetime, timezone
+from typing import Awaitable, Callable
+from uuid import UUID
+
+import jwt
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from src.config import settings
+from src.core.security import create_access_token
+from src.models import (
+    TaskDetailResponse,
+    TaskFilter,
+    TaskResponse,
+    TaskStatus,
+    TaskUpdate,
+    UserResponse,
+    UserSummary,
+)
+from src.repositories.task_repository import TaskRepository
+from src.repositories.user_repository import UserRepository
+from src.services.user_services import UserService
+
+logger = logging.getLogger(__name__)
+
+# Matches no row: every warm-up query runs for real but returns nothing
+NO_ROW_ID = UUID(int=0)
+
+
+class WarmupState:
+    """Progress of the startup warm-up, read by the readiness probe"""
+
+    def __init__(self) -> None:
+        self.completed = False
+        self.duration_ms: float | None = None
+        self.steps: dict[str, float] = {}  # step name -> milliseconds
+        self.errors: dict[str, str] = {}
+
+    def snapshot(self) -> dict:
+        """Warm-up status for the readiness endpoint"""
+        return {
+            "completed": self.completed,
+            "duration_ms": self.duration_ms,
+            "steps": self.steps,
+            "errors": self.errors,
+        }
+
+
+warmup_state = WarmupState()
+
+
+async def open_pool_connections(engine: AsyncEngine, count: int) -> None:
+    """Check out count connections at once so the pool keeps them open"""
+    async with AsyncExitStack() as stack:
+        connections = await asyncio.gather(
+            *(stack.enter_async_context(engine.connect()) for _ in range(count))
+        )
+        for connection in connections:
+            await connection.execute(text("SELECT 1"))
+
+
+async def run_repository_queries(session: AsyncSession) -> None:
+    """Run every read query of the repositories once against NO_ROW_ID"""
+    tasks = TaskRepository(session)
+    users = UserRepository(session)
+
+    await tasks.get_task_by_id(NO_ROW_ID)
+    await tasks.get_task_by_id_with_users(NO_ROW_ID)
+    await tasks.get_tasks_by_ids([NO_ROW_ID])
+    for status in (None, TaskStatus.PENDING):
+        await tasks.list_tasks(TaskFilter(status=status), owner_id=NO_ROW_ID)
+        await tasks.list_tasks(TaskFilter(status=status, assigned_to_id=NO_ROW_ID))
+    await tasks.list_tasks(TaskFilter(overdue=True), owner_id=NO_ROW_ID)
+    await tasks.get_archived_task_by_id(NO_ROW_ID)
+
+    await users.get_user_by_id(NO_ROW_ID)
+    await users.get_user_by_email("warm-up@invalid")
+    await users.get_users_page(1)
+
+
+def exercise_serializers() -> None:
+    """Validate and dump each response model once, and round-trip a JWT"""
+    now = datetime.now(timezone.utc)
+    user = UserSummary(id=NO_ROW_ID, name="Warm Up", email="warm-up@invalid")
+    task = {
+        "id": NO_ROW_ID,
+        "title": "warm-up",
+        "description": None,
+        "status": TaskStatus.PENDING,
+        "owner_id": NO_ROW_ID,
+        "assigned_to_id": NO_ROW_ID,
+        "owner": user,
+        "assigned_to": user,
+        "due_date": now,
+        "version": 1,
+        "created_at": now,
+        "updated_at": now,
+    }
+    TaskDetailResponse.model_validate(task).model_dump_json()
+    TaskResponse.model_validate(task).model_dump_json()
+    UserResponse.model_validate(
+        {**user.model_dump(), "role": "member", "created_at": now, "updated_at": now}
+    ).model_dump_json()
+    TaskUpdate.model_validate({"title": "warm-up"}).model_dump(exclude_unset=True)
+
+    token = create_access_token({"sub": str(NO_ROW_ID)})
+    jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+
+
+async def warm_up(
+    engines: list[AsyncEngine], state: WarmupState = warmup_state
+) -> WarmupState:
+    """Run each warm-up step, recording timings; failures do not stop the rest"""
+
+    async def step(name: str, action: Callable[[], Awaitable[object]]) -> None:
+        start = time.perf_counter()
+        try:
+            await action()
+        except Exception as e:
+            logger.warning("Warm-up step %s failed: %s", name, e)
+            state.errors[name] = str(e) or type(e).__name__
+        state.steps[name] = round((time.perf_counter() - start) * 1000, 2)
+
+    async def queries(engine: AsyncEngine) -> None:
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            await run_repository_queries(session)
+
+    started = time.perf_counter()
+    connections = settings.warmup_connections or settings.db_pool_size
+    for index, engine in enumerate(engines):
+        name = "primary" if index == 0 else f"replica{index - 1}"
+        await step(f"{name}.pool", lambda: open_pool_connections(engine, connections))
+        await step(f"{name}.queries", lambda: queries(engine))
+
+    async def serializers() -> None:
+        exercise_serializers()
+
+    await step("serializers", serializers)
+    # A bcrypt hash loads the backend and builds the passlib context
+    await step("bcrypt", lambda: asyncio.to_thread(UserService.hash_password, "x"))
+
+    state.duration_ms = round((time.perf_counter() - started) * 1000, 2)
+    state.completed = True
+    logger.info("Warm-up finished in %.0f ms", state.duration_ms)
+    return state
@@ -52,10 +52,13 @@ async def test_db_session(test_db_engine):
 async def client(test_db_session):
     """Create test client with dependency override"""
 
+    from src.core.user_index import user_index
+
     async def override_get_db():
         yield test_db_session
 
     app.dependency_overrides[get_db] = override_get_db
+    user_index.clear()
 
     async with AsyncClient(
         transport=ASGITransport(app=app), base_url="http://test"
@@ -141,3 +144,29 @@ def auth_client(client: AsyncClient, test_user):
     app.dependency_overrides[get_current_user] = lambda: test_user
     yield client
     app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def query_budget():
+    """Fail a block that runs more SQL statements than its budget, or an N+1
+
+    Usage: with query_budget(2): response = await client.get(...)
+    Counts every statement run inside the block, including by requests.
+    """
+    from contextlib import contextmanager
+    from src.core.telemetry import capture_queries
+
+    @contextmanager
+    def check(max_queries: int, allow_repeated: bool = False):
+        with capture_queries() as stats:
+            yield stats
+        report = "\n".join(
+            f"  {count}x {statement}" for statement, count in stats.statements.items()
+        )
+        assert (
+            stats.queries <= max_queries
+        ), f"{stats.queries} queries, budget is {max_queries}:\n{report}"
+        if not allow_repeated:
+            assert not stats.repeated(), f"Repeated statements (likely N+1):\n{report}"
+
+    return check
@@ -0,0 +1,143 @@
+import json
+
+import pytest
+from httpx import AsyncClient
+
+from src.core.capture import body_shape, capture_log, pseudonym, shape
+
+
+@pytest.fixture
+def capture_file(tmp_path, monkeypatch):
+    """Enable traffic capture into a temporary file"""
+    from src.config import settings
+
+    path = tmp_path / "traffic.jsonl"
+    monkeypatch.setattr(settings, "capture_enabled", True)
+    monkeypatch.setattr(settings, "capture_sample_rate", 1.0)
+    monkeypatch.setattr(settings, "capture_file", str(path))
+    return path
+
+
+def records(path) -> list[dict]:
+    capture_log().flush()
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+class TestTrafficCapture:
+    """Test suite for the traffic capture middleware"""
+
+    @pytest.mark.asyncio
+    async def test_records_are_sanitized(
+        self, client: AsyncClient, test_user, test_task, capture_file
+    ):
+        """Test ids, principal and body values are not written to the log"""
+        from src.core.security import create_access_token
+
+        token = create_access_token({"sub": str(test_user.id)})
+        response = await client.put(
+            f"/api/tasks/{test_task.id}",
+            json={"title": "Secret plans", "status": "completed"},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+        assert response.status_code == 200
+        [record] = records(capture_file)
+        raw = capture_file.read_text()
+        assert str(test_task.id) not in raw and str(test_user.id) not in raw
+        assert "Secret plans" not in raw
+        assert record["method"] == "PUT"
+        assert record["route"] == "/api/tasks/{task_id}"
+        assert record["path_params"] == {"task_id": pseudonym(str(test_task.id))}
+        assert record["principal"] == pseudonym(str(test_user.id))
+        assert record["body_kind"] == "json"
+        assert record["body"] == {"title": "str", "status": "completed"}
+        assert record["status"] == 200
+        assert record["duration_ms"] > 0
+
+    @pytest.mark.asyncio
+    async def test_login_form_values_not_recorded(
+        self, client: AsyncClient, test_user, capture_file
+    ):
+        """Test credentials are reduced to field names"""
+        await client.post(
+            "/api/auth/login",
+            data={"username": "test@example.com", "password": "testpass123"},
+        )
+
+        [record] = records(capture_file)
+        assert "testpass123" not in capture_file.read_text()
+        assert record["body_kind"] == "form"
+        assert record["body"] == {"username": "str", "password": "str"}
+        assert record["principal"] is None
+
+    @pytest.mark.asyncio
+    async def test_query_shape_and_non_api_routes(
+        self, auth_client: AsyncClient, capture_file
+    ):
+        """Test enum-like query values are kept and probes are not captured"""
+        await auth_client.get(
+            "/api/tasks",
+            params={"status": "pending", "due_after": "2030-01-01T00:00:00Z"},
+        )
+        await auth_client.get("/livez")
+
+        [record] = records(capture_file)
+        assert record["route"] == "/api/tasks"
+        assert record["query"] == {"status": "pending", "due_after": "datetime"}
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self, auth_client: AsyncClient, tmp_path):
+        """Test nothing is written unless capture is enabled"""
+        from src.config import settings
+
+        await auth_client.get("/api/tasks")
+
+        assert settings.capture_enabled is False
+        assert not (tmp_path / "traffic.jsonl").exists()
+
+    def test_shape(self):
+        """Test value shapes for nested JSON bodies"""
+        body = {
+            "ids": ["3fa85f64-5717-4562-b3fc-2c963f66afa6"],
+            "due_date": "2030-01-01T00:00:00",
+            "version": 2,
+            "description": None,
+            "nested": {"flag": True, "name": "x"},
+        }
+
+        assert shape(body) == {
+            "ids": [1, "uuid"],
+            "due_date": "datetime",
+            "version": "int",
+            "description": None,
+            "nested": {"flag": True, "name": "str"},
+        }
+        assert body_shape("text/plain", b"abc") == ("bytes", 3)
+        assert body_shape("application/json", b"") == (None, None)
+
+
+class TestBackgroundLineWriter:
+    """Test suite for the off-loop file writer behind the capture log"""
+
+    def test_close_writes_everything_queued(self, tmp_path):
+        """Test lines queued before shutdown all reach the file, in order"""
+        from src.core.background_writer import BackgroundLineWriter
+
+        path = tmp_path / "lines.txt"
+        writer = BackgroundLineWriter(str(path))
+        for i in range(100):
+            writer.write(f"{i}\n")
+        writer.close()
+
+        assert path.read_text().splitlines() == [str(i) for i in range(100)]
+
+    def test_full_queue_drops_instead_of_blocking(self, tmp_path):
+        """Test a writer that falls behind drops and counts new lines"""
+        from src.core.background_writer import BackgroundLineWriter
+
+        writer = BackgroundLineWriter(str(tmp_path / "lines.txt"), max_pending=1)
+        writer._ensure_started = lambda: None  # keep the thread from draining
+        writer.write("kept\n")
+        writer.write("dropped\n")
+
+        assert writer.dropped == 1
@@ -0,0 +1,364 @@
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from uuid import uuid4
+
+from src.db import make_session_factory, set_session_principal
+from src.models import SQLModel, User
+from src.repositories.user_repository import UserRepository
+
+
+@pytest.fixture
+async def primary_and_replica(tmp_path):
+    """Two SQLite files standing in for a primary and an (unreplicated) replica"""
+    engines = [
+        create_async_engine(f"sqlite+aiosqlite:///{tmp_path / name}.db")
+        for name in ("primary", "replica")
+    ]
+    for engine in engines:
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+
+    yield engines
+
+    for engine in engines:
+        await engine.dispose()
+
+
+def make_user(email: str) -> User:
+    return User(id=uuid4(), name="Routed", email=email, password_hash="x")
+
+
+class TestReplicaRouting:
+    """Test suite for read-replica routing in the session factory"""
+
+    @pytest.mark.asyncio
+    async def test_reads_go_to_replica_and_writes_to_primary(self, primary_and_replica):
+        """Test a fresh session reads from the replica, not the primary"""
+        primary, replica = primary_and_replica
+        factory = make_session_factory(primary, [replica], sticky_seconds=5)
+
+        async with factory() as session:
+            await UserRepository(session).create_user(make_user("w@example.com"))
+
+        async with factory() as session:
+            # Nothing replicates between the files, so the replica can't see it
+            found = await UserRepository(session).get_user_by_email("w@example.com")
+        assert found is None
+
+        async with primary.connect() as conn:
+            rows = (await conn.exec_driver_sql("SELECT email FROM user")).all()
+        assert rows == [("w@example.com",)]
+
+    @pytest.mark.asyncio
+    async def test_session_reads_primary_after_its_own_write(self, primary_and_replica):
+        """Test a session that wrote keeps reading from the primary"""
+        primary, replica = primary_and_replica
+        factory = make_session_factory(primary, [replica], sticky_seconds=5)
+
+        async with factory() as session:
+            repo = UserRepository(session)
+            await repo.create_user(make_user("same@example.com"))
+            found = await repo.get_user_by_email("same@example.com")
+        assert found is not None
+
+    @pytest.mark.asyncio
+    async def test_read_your_writes_window_per_user(self, primary_and_replica):
+        """Test a user's next request reads from the primary within the window"""
+        primary, replica = primary_and_replica
+        factory = make_session_factory(primary, [replica], sticky_seconds=60)
+        writer_id = uuid4()
+
+        async with factory() as session:
+            set_session_principal(session, writer_id)
+            await UserRepository(session).create_user(make_user("ryw@example.com"))
+
+        async with factory() as session:
+            set_session_principal(session, writer_id)
+            own_read = await UserRepository(session).get_user_by_email(
+                "ryw@example.com"
+            )
+        async with factory() as session:
+            set_session_principal(session, uuid4())
+            other_read = await UserRepository(session).get_user_by_email(
+                "ryw@example.com"
+            )
+
+        assert own_read is not None
+        assert other_read is None
+
+    @pytest.mark.asyncio
+    async def test_window_expires(self, primary_and_replica):
+        """Test reads return to the replica once the window has passed"""
+        primary, replica = primary_and_replica
+        factory = make_session_factory(primary, [replica], sticky_seconds=0)
+        writer_id = uuid4()
+
+        async with factory() as session:
+            set_session_principal(session, writer_id)
+            await UserRepository(session).create_user(make_user("exp@example.com"))
+
+        async with factory() as session:
+            set_session_principal(session, writer_id)
+            found = await UserRepository(session).get_user_by_email("exp@example.com")
+        assert found is None
+
+    @pytest.mark.asyncio
+    async def test_locking_read_goes_to_primary(self, primary_and_replica):
+        """Test SELECT ... FOR UPDATE never reads a (possibly stale) replica"""
+        from sqlmodel import select
+
+        primary, replica = primary_and_replica
+        factory = make_session_factory(primary, [replica], sticky_seconds=0)
+        async with factory() as session:
+            await UserRepository(session).create_user(make_user("lock@example.com"))
+
+        async with factory() as session:
+            locked = await session.execute(select(User.email).with_for_update())
+        assert locked.scalars().all() == ["lock@example.com"]
+
+    @pytest.mark.asyncio
+    async def test_archiver_ignores_stale_replica(self, primary_and_replica):
+        """Test a task the replica still sees as completed is not archived"""
+        from datetime import datetime, timedelta, timezone
+
+        from src.models import Task, TaskStatus
+        from src.repositories.task_repository import TaskRepository
+
+        primary, replica = primary_and_replica
+        factory = make_session_factory(primary, [replica], sticky_seconds=0)
+        owner = make_user("archiver@example.com")
+        task_id = uuid4()
+        old = datetime.now(timezone.utc) - timedelta(days=40)
+        for engine, status in ((replica, "completed"), (primary, "pending")):
+            async with make_session_factory(engine)() as session:
+                session.add(User.model_validate(owner))
+                session.add(
+                    Task(
+                        id=task_id,
+                        title="Reopened",
+                        owner_id=owner.id,
+                        status=status,
+                        updated_at=old,
+                    )
+                )
+                await session.commit()
+
+        async with factory() as session:
+            moved = await TaskRepository(session).archive_completed_tasks(
+                datetime.now(timezone.utc) - timedelta(days=30), batch_size=10
+            )
+
+        assert moved == 0
+        async with primary.connect() as conn:
+            rows = (await conn.exec_driver_sql("SELECT status FROM task")).all()
+        assert rows == [(TaskStatus.PENDING.value,)]
+
+    @pytest.mark.asyncio
+    async def test_due_date_job_reads_primary(self, primary_and_replica):
+        """Test the due-date scan resumes from the primary's watermark"""
+        from datetime import datetime, timedelta, timezone
+
+        from src.jobs.scheduler import process_due_dates
+        from src.models import DueDateWatermark, Task, TaskEventType
+
+        primary, replica = primary_and_replica
+        now = datetime.now(timezone.utc)
+        owner = make_user("due@example.com")
+        # The replica has neither the last run's watermark nor the task that
+        # became overdue since, so a scan reading it would start at now
+        async with make_session_factory(primary)() as session:
+            session.add(owner)
+            session.add(
+                DueDateWatermark(
+                    kind=TaskEventType.OVERDUE.value,
+                    scanned_until=now - timedelta(minutes=10),
+                )
+            )
+            session.add(
+                Task(
+                    id=uuid4(),
+                    title="Overdue",
+                    owner_id=owner.id,
+                    due_date=now - timedelta(minutes=5),
+                )
+            )
+            await session.commit()
+
+        factory = make_session_factory(primary, [replica], sticky_seconds=0)
+        assert await process_due_dates(factory) == 1
+
+
+class TestInstrumentedPool:
+    """Test suite for connection pool instrumentation"""
+
+    @pytest.mark.asyncio
+    async def test_pool_records_wait_overflow_and_timeouts(self, tmp_path):
+        """Test checkouts beyond pool_size count as overflow, then time out"""
+        from sqlalchemy import exc
+
+        from src.db import (
+            POOL_CHECKOUT_WAIT,
+            POOL_OVERFLOW,
+            POOL_TIMEOUTS,
+            InstrumentedPool,
+        )
+
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'pool'}.db",
+            poolclass=InstrumentedPool,
+            pool_logging_name="test",
+            pool_size=1,
+            max_overflow=1,
+            pool_timeout=0.05,
+        )
+        label = ("test",)
+        waits_before = POOL_CHECKOUT_WAIT.count(label)
+        overflow_before = POOL_OVERFLOW.value(label)
+        timeouts_before = POOL_TIMEOUTS.value(label)
+
+        first = await engine.connect()
+        second = await engine.connect()
+        with pytest.raises(exc.TimeoutError):
+            await engine.connect()
+        await first.close()
+        await second.close()
+        await engine.dispose()
+
+        assert POOL_CHECKOUT_WAIT.count(label) - waits_before == 3
+        assert POOL_OVERFLOW.value(label) - overflow_before == 1
+        assert POOL_TIMEOUTS.value(label) - timeouts_before == 1
+
+
+class TestConnectionRelease:
+    """Test suite for returning connections to the pool after service calls"""
+
+    @pytest.mark.asyncio
+    async def test_service_returns_connection_before_session_closes(self, tmp_path):
+        """Test a read-only service call leaves no connection checked out"""
+        from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+        from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+        from src.services.user_services import UserService
+
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'release'}.db",
+            poolclass=AsyncAdaptedQueuePool,
+        )
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        factory = async_sessionmaker(
+            engine, class_=AsyncSession, expire_on_commit=False
+        )
+
+        async with factory() as session:
+            repo = UserRepository(session)
+            user = await repo.create_user(make_user("pool@example.com"))
+
+            await repo.get_user_by_id(user.id)
+            assert engine.pool.checkedout() == 1
+
+            response = await UserService(repo).get_user(user.id)
+            assert engine.pool.checkedout() == 0
+            assert response.email == "pool@example.com"
+
+        await engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_failing_service_call_returns_connection(self, tmp_path):
+        """Test a service call that raises also leaves no connection checked out"""
+        from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+        from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+        from src.repositories.task_repository import TaskRepository
+        from src.services.task_services import TaskService
+
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'release_error'}.db",
+            poolclass=AsyncAdaptedQueuePool,
+        )
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        factory = async_sessionmaker(
+            engine, class_=AsyncSession, expire_on_commit=False
+        )
+
+        async with factory() as session:
+            service = TaskService(TaskRepository(session))
+            with pytest.raises(ValueError):
+                await service.update_task(uuid4(), uuid4(), {"title": "Missing"})
+            assert engine.pool.checkedout() == 0
+
+        await engine.dispose()
+
+
+def alembic_config(url: str):
+    from alembic.config import Config
+
+    config = Config("alembic.ini")
+    config.set_main_option("sqlalchemy.url", url)
+    return config
+
+
+class TestSchemaMigrations:
+    """Test suite for Alembic migrations and the startup schema check"""
+
+    def test_head_matches_expected_revision(self):
+        """Test the code's SCHEMA_REVISION is the migrations head"""
+        from alembic.script import ScriptDirectory
+
+        from src.db import SCHEMA_REVISION
+
+        script = ScriptDirectory.from_config(alembic_config("sqlite://"))
+        assert script.get_heads() == [SCHEMA_REVISION]
+
+    @pytest.mark.asyncio
+    async def test_migrations_match_models(self, tmp_path):
+        """Test upgrading to head yields exactly the schema the models declare"""
+        import asyncio
+
+        from alembic import command
+        from alembic.autogenerate import compare_metadata
+        from alembic.migration import MigrationContext
+
+        url = f"sqlite+aiosqlite:///{tmp_path / 'migrated'}.db"
+        # env.py runs its own event loop, so migrate from a worker thread
+        await asyncio.to_thread(command.upgrade, alembic_config(url), "head")
+
+        engine = create_async_engine(url)
+        async with engine.connect() as conn:
+            diff = await conn.run_sync(
+                lambda sync_conn: compare_metadata(
+                    MigrationContext.configure(
+                        sync_conn, opts={"compare_server_default": True}
+                    ),
+                    SQLModel.metadata,
+                )
+            )
+        await engine.dispose()
+
+        assert diff == []
+
+    @pytest.mark.asyncio
+    async def test_verify_schema(self, tmp_path):
+        """Test verify_schema accepts a migrated database and rejects others"""
+        import asyncio
+
+        from alembic import command
+
+        from src.db import SCHEMA_REVISION, verify_schema
+
+        url = f"sqlite+aiosqlite:///{tmp_path / 'verify'}.db"
+        engine = create_async_engine(url)
+
+        with pytest.raises(RuntimeError, match="schema revision"):
+            await verify_schema(engine)
+
+        await asyncio.to_thread(command.upgrade, alembic_config(url), "head")
+        await verify_schema(engine)
+
+        async with engine.begin() as conn:
+            await conn.exec_driver_sql("UPDATE alembic_version SET version_num = 'old'")
+        with pytest.raises(RuntimeError, match=f"expected '{SCHEMA_REVISION}'"):
+            await verify_schema(engine)
+
+        await engine.dispose()
@@ -0,0 +1,225 @@
+import json
+from uuid import uuid4
+
+import pytest
+from httpx import AsyncClient
+
+from src.core.event_bus import (
+    RESYNC_TOPIC,
+    TASK_TOPIC,
+    USER_TOPIC,
+    InMemoryBroker,
+    InMemoryEventBus,
+    create_event_bus,
+    event_bus,
+    listen_dsn,
+)
+from src.core.task_events import task_events
+from src.models import TaskEventType
+
+
+@pytest.fixture
+def peer():
+    """A second worker's bus, attached to the app's bus"""
+    other = InMemoryEventBus(event_bus.broker)
+    yield other
+    event_bus.broker.buses.remove(other)
+
+
+class TestInMemoryEventBus:
+    """Test suite for event bus delivery between workers"""
+
+    def test_publish_reaches_every_worker_once(self):
+        """Test local handlers run immediately and peers get one copy"""
+        broker = InMemoryBroker()
+        first, second = InMemoryEventBus(broker), InMemoryEventBus(broker)
+        received = {"first": [], "second": []}
+        first.subscribe("topic", received["first"].append)
+        second.subscribe("topic", received["second"].append)
+
+        first.publish("topic", {"n": 1})
+        second.publish("topic", {"n": 2})
+
+        assert received == {
+            "first": [{"n": 1}, {"n": 2}],
+            "second": [{"n": 1}, {"n": 2}],
+        }
+
+    def test_failing_handler_does_not_stop_others(self):
+        """Test one broken consumer cannot starve the rest"""
+        bus = InMemoryEventBus()
+        received = []
+
+        def broken(data):
+            raise RuntimeError("boom")
+
+        bus.subscribe("topic", broken)
+        bus.subscribe("topic", received.append)
+
+        bus.publish("topic", {})
+
+        assert received == [{}]
+
+    def test_listen_dsn(self):
+        """Test the SQLAlchemy URL is turned into a plain asyncpg DSN"""
+        assert (
+            listen_dsn("postgresql+asyncpg://user:pass@db:5432/tasks")
+            == "postgresql://user:pass@db:5432/tasks"
+        )
+
+    def test_custom_bus_must_implement_send(self):
+        """Test a backend class without a transport fails when it is created"""
+        with pytest.raises(TypeError, match="_send"):
+            create_event_bus("src.core.event_bus:EventBus")
+
+
+class TestCrossWorkerConsumers:
+    """Test suite for caches and push streams fed by other workers"""
+
+    @pytest.mark.asyncio
+    async def test_user_change_reaches_lookup_index(
+        self, auth_client: AsyncClient, peer
+    ):
+        """Test a user registered on another worker shows up in autocomplete"""
+        user_id = uuid4()
+        peer.publish(
+            USER_TOPIC,
+            {"id": str(user_id), "name": "Remote Worker", "email": "r@example.com"},
+        )
+
+        response = await auth_client.get("/api/users/lookup", params={"q": "remo"})
+
+        assert response.status_code == 200
+        assert [u["id"] for u in response.json()] == [str(user_id)]
+
+    def test_task_delete_reaches_push_streams(self, peer):
+        """Test a task deleted on another worker is pushed to local streams"""
+        user_id, task_id = uuid4(), uuid4()
+        subscription = task_events.subscribe(user_id)
+        try:
+            peer.publish(
+                TASK_TOPIC,
+                {
+                    "type": "deleted",
+                    "task_id": str(task_id),
+                    "recipients": [str(user_id)],
+                    "occurred_at": "2026-01-01T00:00:00+00:00",
+                },
+            )
+            event = subscription.queue.get_nowait()
+            assert (event.type, event.task_id, event.task) == (
+                TaskEventType.DELETED,
+                task_id,
+                None,
+            )
+        finally:
+            task_events.unsubscribe(subscription)
+
+    @pytest.mark.asyncio
+    async def test_remote_change_loads_the_task(
+        self, test_db_session, test_task, test_user, peer, monkeypatch
+    ):
+        """Test a worker loads a task changed elsewhere only for open streams"""
+        import asyncio
+
+        from src.models import TaskResponse
+        from src.repositories.task_repository import TaskRepository
+
+        loads = []
+
+        async def loader(task_id):
+            loads.append(task_id)
+            task = await TaskRepository(test_db_session).get_task_by_id_with_users(
+                task_id
+            )
+            return TaskResponse.model_validate(task)
+
+        monkeypatch.setattr(task_events, "loader", loader)
+        data = {
+            "type": "updated",
+            "task_id": str(test_task.id),
+            "recipients": [str(uuid4())],
+            "occurred_at": "2026-01-01T00:00:00+00:00",
+        }
+        peer.publish(TASK_TOPIC, data)
+        await asyncio.sleep(0)
+        assert loads == []
+
+        subscription = task_events.subscribe(test_user.id)
+        try:
+            peer.publish(TASK_TOPIC, {**data, "recipients": [str(test_user.id)]})
+            event = await asyncio.wait_for(subscription.queue.get(), 1)
+            assert event.type == TaskEventType.UPDATED
+            assert event.task.title == test_task.title
+            assert loads == [test_task.id]
+        finally:
+            task_events.unsubscribe(subscription)
+
+    @pytest.mark.asyncio
+    async def test_local_change_is_published_to_peers(
+        self, auth_client: AsyncClient, test_user, peer
+    ):
+        """Test a task written through this worker is sent to the others as ids"""
+        received = []
+        peer.subscribe(TASK_TOPIC, received.append)
+
+        response = await auth_client.post(
+            "/api/tasks", json={"title": "Shared", "description": "x" * 10000}
+        )
+
+        [message] = received
+        assert message["type"] == "created"
+        assert message["task_id"] == response.json()["id"]
+        assert message["recipients"] == [str(test_user.id)]
+        assert "event" not in message
+
+    @pytest.mark.asyncio
+    async def test_oversize_event_resyncs_peers(self, monkeypatch):
+        """Test an event too large for NOTIFY is replaced by a resync"""
+        import asyncio
+
+        from src.core.event_bus import PostgresEventBus
+
+        sent = []
+
+        class Connection:
+            async def execute(self, query, channel, payload):
+                sent.append(json.loads(payload)["topic"])
+
+        bus = PostgresEventBus("postgresql://", "events")
+        bus._conn = Connection()
+
+        bus.publish(TASK_TOPIC, {"blob": "x" * 10000})
+        bus.publish(TASK_TOPIC, {"n": 1})
+        await asyncio.gather(*bus._pending)
+
+        assert sent == [RESYNC_TOPIC, TASK_TOPIC]
+
+        bus._conn = None
+        bus.publish(TASK_TOPIC, {"n": 2})
+        await asyncio.gather(*bus._pending)
+        assert bus._resync_peers
+
+    @pytest.mark.asyncio
+    async def test_resync_rebuilds_consumers(self, monkeypatch):
+        """Test a possible gap in events cuts off streams and rebuilds the index"""
+        import asyncio
+
+        import src.main
+
+        rebuilds = []
+
+        async def rebuild_user_index():
+            rebuilds.append(True)
+
+        monkeypatch.setattr(src.main, "rebuild_user_index", rebuild_user_index)
+        subscription = task_events.subscribe(uuid4())
+        try:
+            event_bus.dispatch(RESYNC_TOPIC, {})
+            await asyncio.sleep(0)
+
+            assert subscription.overflowed
+            assert subscription.queue.get_nowait() is None
+            assert rebuilds == [True]
+        finally:
+            task_events.unsubscribe(subscription)
@@ -0,0 +1,201 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.core.health import DatabaseHealthMonitor
+
+
+@pytest.fixture
+def monitor_state():
+    """Restore the shared readiness monitor after a test changes it"""
+    from src.db import db_monitor
+
+    saved = dict(vars(db_monitor))
+    yield db_monitor
+    vars(db_monitor).update(saved)
+
+
+@pytest.fixture
+def warmup_done():
+    """Mark the startup warm-up finished (the lifespan does not run in tests)"""
+    from src.warmup import warmup_state
+
+    saved = warmup_state.completed
+    warmup_state.completed = True
+    yield warmup_state
+    warmup_state.completed = saved
+
+
+class TestProbes:
+    """Test suite for liveness and readiness probes"""
+
+    @pytest.mark.asyncio
+    async def test_livez_does_no_io(self, client: AsyncClient):
+        """Test liveness answers without touching the database"""
+        from src.main import app
+        from src.db import get_db
+
+        async def no_db():
+            raise AssertionError("liveness must not open a session")
+            yield
+
+        app.dependency_overrides[get_db] = no_db
+        response = await client.get("/livez")
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "alive"}
+
+    @pytest.mark.asyncio
+    async def test_readyz_ready_after_successful_check(
+        self, client: AsyncClient, monitor_state, warmup_done, tmp_path
+    ):
+        """Test readiness is 200 once the background check succeeded"""
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'ok'}.db")
+        monitor_state.engine = engine
+        await monitor_state.check()
+
+        response = await client.get("/readyz")
+        await engine.dispose()
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "ready"
+        assert data["database"]["connected"] is True
+        assert data["warmup"]["completed"] is True
+        assert "saturation" in data["pool"]
+
+    @pytest.mark.asyncio
+    async def test_readyz_not_ready_when_database_down(
+        self, client: AsyncClient, monitor_state, tmp_path
+    ):
+        """Test readiness is 503 when the last check failed"""
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'db'}.db"
+        )
+        monitor_state.engine = engine
+        await monitor_state.check()
+
+        response = await client.get("/readyz")
+        await engine.dispose()
+
+        assert response.status_code == 503
+        assert response.json()["status"] == "not_ready"
+        assert response.json()["database"]["error"]
+
+    @pytest.mark.asyncio
+    async def test_readyz_not_ready_before_first_check(
+        self, client: AsyncClient, monitor_state
+    ):
+        """Test readiness stays 503 until the first check has run"""
+        monitor_state._checked_monotonic = None
+        monitor_state.database_ok = None
+
+        response = await client.get("/readyz")
+
+        assert response.status_code == 503
+
+    @pytest.mark.asyncio
+    async def test_readyz_not_ready_until_warm_up_completes(
+        self, client: AsyncClient, monitor_state, warmup_done, tmp_path
+    ):
+        """Test readiness stays 503 while warm-up is still running"""
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'ok'}.db")
+        monitor_state.engine = engine
+        await monitor_state.check()
+        warmup_done.completed = False
+
+        response = await client.get("/readyz")
+        await engine.dispose()
+
+        assert response.status_code == 503
+        assert response.json()["warmup"]["completed"] is False
+
+    @pytest.mark.asyncio
+    async def test_pool_status_requires_login(self, client: AsyncClient):
+        """Test pool numbers are not served without a token"""
+        response = await client.get("/health/pool")
+
+        assert response.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_pool_status_is_owner_only(self, auth_client: AsyncClient):
+        """Test members may not read pool numbers"""
+        response = await auth_client.get("/health/pool")
+
+        assert response.status_code == 403
+
+    @pytest.mark.asyncio
+    async def test_pool_status_for_owner(self, owner_auth_client: AsyncClient):
+        """Test owners get the per-database pool numbers"""
+        response = await owner_auth_client.get("/health/pool")
+
+        assert response.status_code == 200
+        assert isinstance(response.json(), dict)
+
+
+class TestWarmup:
+    """Test suite for the startup warm-up"""
+
+    @pytest.mark.asyncio
+    async def test_warm_up_runs_every_step(self, tmp_path, monkeypatch):
+        """Test warm-up pre-opens pool connections and runs all steps cleanly"""
+        from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+        from src.config import settings
+        from src.models import SQLModel
+        from src.warmup import WarmupState, warm_up
+
+        monkeypatch.setattr(settings, "warmup_connections", 3)
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'warm'}.db",
+            poolclass=AsyncAdaptedQueuePool,
+        )
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+
+        state = await warm_up([engine], WarmupState())
+        idle = engine.pool.checkedin()
+        await engine.dispose()
+
+        assert state.completed is True
+        assert state.errors == {}
+        assert set(state.steps) == {
+            "primary.pool",
+            "primary.queries",
+            "serializers",
+            "bcrypt",
+        }
+        assert idle == 3
+
+    @pytest.mark.asyncio
+    async def test_warm_up_completes_when_a_step_fails(self, tmp_path):
+        """Test a failing step is recorded but does not block readiness"""
+        from src.warmup import WarmupState, warm_up
+
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'db'}.db"
+        )
+        state = await warm_up([engine], WarmupState())
+        await engine.dispose()
+
+        assert state.completed is True
+        assert set(state.errors) == {"primary.pool", "primary.queries"}
+        assert "serializers" not in state.errors
+
+
+class TestDatabaseHealthMonitor:
+    """Test suite for the background database check"""
+
+    @pytest.mark.asyncio
+    async def test_result_goes_stale(self, tmp_path):
+        """Test a result older than three intervals is no longer trusted"""
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'ok'}.db")
+        monitor = DatabaseHealthMonitor(engine, interval=0.01, timeout=1)
+
+        await monitor.check()
+        assert monitor.snapshot()["connected"] is True
+
+        monitor._checked_monotonic -= 1
+        assert monitor.is_stale
+        assert monitor.snapshot()["connected"] is False
+        await engine.dispose()
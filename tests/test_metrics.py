@@ -0,0 +1,90 @@
+import pytest
+from httpx import AsyncClient
+
+from src.core.telemetry import (
+    DB_QUERIES_PER_REQUEST,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS_IN_FLIGHT,
+    HTTP_RESPONSES,
+)
+from src.dependencies import AUTH_CHECKS
+
+
+class TestMetricsEndpoint:
+    """Test suite for the Prometheus /metrics endpoint"""
+
+    @pytest.mark.asyncio
+    async def test_metrics_exposition(self, auth_client: AsyncClient, test_task):
+        """Test /metrics renders request metrics labelled by route template"""
+        await auth_client.get(f"/api/tasks/{test_task.id}")
+
+        response = await auth_client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        body = response.text
+        assert "# TYPE http_request_duration_seconds histogram" in body
+        assert (
+            'http_request_duration_seconds_count{method="GET",'
+            'route="/api/tasks/{task_id}"}' in body
+        )
+        assert str(test_task.id) not in body
+        assert "# TYPE http_requests_in_flight gauge" in body
+
+
+class TestRequestMetrics:
+    """Test suite for the metrics middleware and query hooks"""
+
+    @pytest.mark.asyncio
+    async def test_latency_status_and_in_flight(self, auth_client: AsyncClient):
+        """Test each request is timed and counted by status, then leaves in flight"""
+        labels = ("GET", "/api/tasks/{task_id}")
+        before = HTTP_REQUEST_DURATION.count(labels)
+        missing_before = HTTP_RESPONSES.value((*labels, "404"))
+
+        response = await auth_client.get(
+            "/api/tasks/00000000-0000-0000-0000-000000000000"
+        )
+
+        assert response.status_code == 404
+        assert HTTP_REQUEST_DURATION.count(labels) == before + 1
+        assert HTTP_RESPONSES.value((*labels, "404")) == missing_before + 1
+        assert HTTP_REQUESTS_IN_FLIGHT.value() == 0
+
+    @pytest.mark.asyncio
+    async def test_unmatched_paths_share_one_label(self, client: AsyncClient):
+        """Test unknown paths do not create a label per raw path"""
+        labels = ("GET", "unmatched", "404")
+        before = HTTP_RESPONSES.value(labels)
+
+        await client.get("/no/such/path/1")
+        await client.get("/no/such/path/2")
+
+        assert HTTP_RESPONSES.value(labels) == before + 2
+
+    @pytest.mark.asyncio
+    async def test_db_queries_counted_per_request(
+        self, auth_client: AsyncClient, test_task
+    ):
+        """Test SQL statements issued while serving a request are attributed to it"""
+        labels = ("GET", "/api/tasks")
+        count_before = DB_QUERIES_PER_REQUEST.count(labels)
+        queries_before = DB_QUERIES_PER_REQUEST.sum(labels)
+
+        response = await auth_client.get("/api/tasks")
+
+        assert response.status_code == 200
+        assert DB_QUERIES_PER_REQUEST.count(labels) == count_before + 1
+        assert DB_QUERIES_PER_REQUEST.sum(labels) > queries_before
+
+    @pytest.mark.asyncio
+    async def test_auth_check_results(self, client: AsyncClient):
+        """Test bearer token checks are counted by result"""
+        before = AUTH_CHECKS.value(("invalid_token",))
+
+        response = await client.get(
+            "/api/tasks", headers={"Authorization": "Bearer not-a-jwt"}
+        )
+
+        assert response.status_code == 401
+        assert AUTH_CHECKS.value(("invalid_token",)) == before + 1
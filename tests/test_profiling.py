@@ -0,0 +1,149 @@
+import asyncio
+import sys
+
+import pytest
+from httpx import AsyncClient
+
+from src.core.profiling import ProfileStore, RequestProfile
+
+
+@pytest.fixture
+def profiling(tmp_path, monkeypatch):
+    """Enable header-triggered profiling into a temporary directory"""
+    from src.config import settings
+
+    monkeypatch.setattr(settings, "profiling_token", "let-me-profile")
+    monkeypatch.setattr(settings, "profiling_interval_ms", 0.5)
+    monkeypatch.setattr(settings, "profiling_dir", str(tmp_path / "profiles"))
+    return settings
+
+
+class TestRequestProfiling:
+    """Test suite for on-demand request profiling"""
+
+    @pytest.mark.asyncio
+    async def test_authorized_header_profiles_request(
+        self, client: AsyncClient, test_user, profiling
+    ):
+        """Test a request with the profiling token is profiled and stored"""
+        response = await client.post(
+            "/api/auth/login",
+            data={"username": "test@example.com", "password": "testpass123"},
+            headers={"X-Profile": "let-me-profile"},
+        )
+
+        assert response.status_code == 200
+        profile_id = response.headers["x-profile-id"]
+        profile = ProfileStore(profiling.profiling_dir, 10).get(profile_id)
+        assert profile["route"] == "/api/auth/login"
+        assert profile["cpu_samples"] + profile["await_samples"] > 0
+        # bcrypt runs inline in the login handler, so it dominates the stacks
+        assert any("verify_password" in stack for stack in profile["stacks"])
+
+    @pytest.mark.asyncio
+    async def test_wrong_token_is_not_profiled(self, client: AsyncClient, profiling):
+        """Test an unauthorized X-Profile header is ignored"""
+        response = await client.get("/livez", headers={"X-Profile": "guess"})
+
+        assert "x-profile-id" not in response.headers
+
+    @pytest.mark.asyncio
+    async def test_sample_rate_profiles_without_header(
+        self, client: AsyncClient, profiling, monkeypatch
+    ):
+        """Test a sampling rate of 1 profiles every request"""
+        monkeypatch.setattr(profiling, "profiling_token", None)
+        monkeypatch.setattr(profiling, "profiling_sample_rate", 1.0)
+
+        response = await client.get("/livez")
+
+        assert "x-profile-id" in response.headers
+
+    @pytest.mark.asyncio
+    async def test_await_chain_names_suspension_point(self):
+        """Test a suspended request is attributed to the coroutine it awaits"""
+        profile = RequestProfile(None, None, 0)
+
+        async def handler():
+            await asyncio.sleep(1)
+
+        async def middleware():
+            profile.root = sys._getframe()
+            await handler()
+
+        task = asyncio.create_task(middleware())
+        await asyncio.sleep(0.01)
+        profile.task = task
+        profile.sample(sys._getframe())
+        task.cancel()
+
+        assert profile.stacks == {}
+        [chain] = profile.awaits
+        assert chain.split(";")[0].startswith("TestRequestProfiling")
+        assert "handler" in chain.split(";")[0]
+        assert chain.split(";")[1].startswith("sleep")
+        assert chain.split(";")[-1].startswith("<Future")
+
+
+class TestProfileStore:
+    """Test suite for on-disk profile retention"""
+
+    def test_keeps_most_recent(self, tmp_path):
+        """Test only the newest profiles are kept and listed newest first"""
+        store = ProfileStore(str(tmp_path), keep=2)
+        for i in range(3):
+            store.save(
+                {
+                    "id": f"{i:032x}",
+                    "started_at": f"20260101T00000{i}.000000Z",
+                    "stacks": {},
+                    "awaits": {},
+                }
+            )
+
+        summaries = store.list()
+
+        assert [s["id"] for s in summaries] == [f"{2:032x}", f"{1:032x}"]
+        assert "stacks" not in summaries[0]
+        assert store.get(f"{0:032x}") is None
+
+
+class TestProfileEndpoints:
+    """Test suite for the admin profile endpoints"""
+
+    @pytest.mark.asyncio
+    async def test_owner_lists_and_reads_profiles(
+        self, owner_auth_client: AsyncClient, profiling
+    ):
+        """Test owners can list stored profiles and fetch one by id"""
+        response = await owner_auth_client.get(
+            "/livez", headers={"X-Profile": "let-me-profile"}
+        )
+        profile_id = response.headers["x-profile-id"]
+
+        listed = await owner_auth_client.get("/api/admin/profiles")
+        fetched = await owner_auth_client.get(f"/api/admin/profiles/{profile_id}")
+
+        assert listed.status_code == 200
+        assert [p["id"] for p in listed.json()] == [profile_id]
+        assert fetched.status_code == 200
+        assert fetched.json()["route"] == "/livez"
+        assert "stacks" in fetched.json()
+
+    @pytest.mark.asyncio
+    async def test_unknown_profile_returns_404(
+        self, owner_auth_client: AsyncClient, profiling
+    ):
+        """Test fetching a profile that is not stored"""
+        response = await owner_auth_client.get(f"/api/admin/profiles/{'0' * 32}")
+
+        assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_members_cannot_read_profiles(
+        self, auth_client: AsyncClient, profiling
+    ):
+        """Test the profile endpoints are owner only"""
+        response = await auth_client.get("/api/admin/profiles")
+
+        assert response.status_code == 403
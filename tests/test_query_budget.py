@@ -0,0 +1,175 @@
+import pytest
+from httpx import AsyncClient
+from uuid import uuid4
+
+from src.models import Task, TaskStatus
+
+
+@pytest.fixture
+async def many_tasks(test_db_session, test_user, owner_user):
+    """Ten tasks owned by test_user, half of them assigned to owner_user"""
+    tasks = [
+        Task(
+            id=uuid4(),
+            title=f"Task {i}",
+            status=TaskStatus.PENDING,
+            owner_id=test_user.id,
+            assigned_to_id=owner_user.id if i % 2 else None,
+        )
+        for i in range(10)
+    ]
+    test_db_session.add_all(tasks)
+    await test_db_session.commit()
+    return tasks
+
+
+class TestQueryBudgets:
+    """Test suite pinning the SQL statements each endpoint may run"""
+
+    @pytest.mark.asyncio
+    async def test_list_tasks_budget(
+        self, auth_client: AsyncClient, many_tasks, query_budget
+    ):
+        """Test listing tasks loads owners and assignees without N+1 queries"""
+        with query_budget(3):
+            response = await auth_client.get("/api/tasks")
+
+        assert response.status_code == 200
+        assert len(response.json()) == 10
+
+    @pytest.mark.asyncio
+    async def test_get_task_budget(
+        self, auth_client: AsyncClient, many_tasks, query_budget
+    ):
+        """Test fetching one task with its users"""
+        with query_budget(3):
+            response = await auth_client.get(f"/api/tasks/{many_tasks[1].id}")
+
+        assert response.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_lookup_tasks_budget(
+        self, auth_client: AsyncClient, many_tasks, query_budget
+    ):
+        """Test a batched lookup costs the same as a single get"""
+        with query_budget(3):
+            response = await auth_client.post(
+                "/api/tasks/lookup", json={"ids": [str(t.id) for t in many_tasks]}
+            )
+
+        assert response.status_code == 200
+        assert len(response.json()["found"]) == 10
+
+    @pytest.mark.asyncio
+    async def test_create_task_budget(
+        self, auth_client: AsyncClient, owner_user, query_budget
+    ):
+        """Test creating an assigned task"""
+        with query_budget(3):
+            response = await auth_client.post(
+                "/api/tasks",
+                json={"title": "Budgeted", "assigned_to_id": str(owner_user.id)},
+            )
+
+        assert response.status_code == 201
+
+    @pytest.mark.asyncio
+    async def test_update_task_budget(
+        self, auth_client: AsyncClient, many_tasks, query_budget
+    ):
+        """Test a conditional update and re-read"""
+        with query_budget(3):
+            response = await auth_client.put(
+                f"/api/tasks/{many_tasks[0].id}", json={"title": "Renamed"}
+            )
+
+        assert response.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_update_task_loads_users_once(
+        self, auth_client: AsyncClient, many_tasks, test_db_session, query_budget
+    ):
+        """Test an update on a cold session reads each of the task's users once"""
+        test_db_session.expunge_all()
+        with query_budget(6, allow_repeated=True) as stats:
+            response = await auth_client.put(
+                f"/api/tasks/{many_tasks[1].id}", json={"title": "Renamed"}
+            )
+
+        assert response.status_code == 200
+        user_reads = sum(
+            count
+            for statement, count in stats.statements.items()
+            if statement.startswith("SELECT user.")
+        )
+        # One IN query each for the owner and the assignee
+        assert user_reads == 2
+
+    @pytest.mark.asyncio
+    async def test_assigned_tasks_budget(
+        self, owner_auth_client: AsyncClient, many_tasks, query_budget
+    ):
+        """Test listing tasks assigned to the caller"""
+        with query_budget(3):
+            response = await owner_auth_client.get("/api/tasks/assigned")
+
+        assert response.status_code == 200
+        assert len(response.json()) == 5
+
+    @pytest.mark.asyncio
+    async def test_list_users_budget(
+        self, owner_auth_client: AsyncClient, test_user, query_budget
+    ):
+        """Test the user directory is a single query"""
+        with query_budget(1):
+            response = await owner_auth_client.get("/api/users")
+
+        assert response.status_code == 200
+
+
+class TestQueryDiagnostics:
+    """Test suite for N+1 detection and the debug headers"""
+
+    @pytest.mark.asyncio
+    async def test_repeated_statement_fails_budget(
+        self, test_db_session, test_user, query_budget
+    ):
+        """Test the budget helper rejects one statement run per item"""
+        from src.repositories.user_repository import UserRepository
+
+        repo = UserRepository(test_db_session)
+        with pytest.raises(AssertionError, match="likely N\\+1"):
+            with query_budget(10):
+                for _ in range(3):
+                    await repo.get_user_by_email(test_user.email)
+
+    @pytest.mark.asyncio
+    async def test_budget_exceeded_lists_statements(
+        self, test_db_session, test_user, query_budget
+    ):
+        """Test exceeding the budget reports the statements that ran"""
+        from src.repositories.user_repository import UserRepository
+
+        repo = UserRepository(test_db_session)
+        with pytest.raises(AssertionError, match="2 queries, budget is 1"):
+            with query_budget(1, allow_repeated=True):
+                await repo.get_user_by_email(test_user.email)
+                await repo.get_users_page(10)
+
+    @pytest.mark.asyncio
+    async def test_debug_headers(
+        self, auth_client: AsyncClient, many_tasks, monkeypatch
+    ):
+        """Test X-DB-* headers report the request's queries when enabled"""
+        from src.config import settings
+
+        response = await auth_client.get("/api/tasks")
+        assert "x-db-query-count" not in response.headers
+
+        monkeypatch.setattr(settings, "query_debug_headers", True)
+        response = await auth_client.get("/api/tasks")
+
+        assert response.status_code == 200
+        assert 1 <= int(response.headers["x-db-query-count"]) <= 3
+        assert float(response.headers["x-db-query-time-ms"]) >= 0
+        assert response.headers["x-db-repeated-statements"] == "0"
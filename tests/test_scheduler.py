@@ -0,0 +1,172 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.task_events import task_events
+from src.jobs.scheduler import Scheduler
+from src.models import Task, TaskEventType, TaskStatus
+from src.repositories.task_repository import TaskRepository
+from src.services.task_services import TaskService
+
+
+@pytest.fixture
+def session_factory(test_db_engine):
+    """Sessions on the test database, as each worker would open them"""
+    return async_sessionmaker(
+        test_db_engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+
+@pytest.fixture
+def subscription(test_user):
+    """A push subscription for test_user on the app's hub"""
+    subscription = task_events.subscribe(test_user.id)
+    yield subscription
+    task_events.unsubscribe(subscription)
+
+
+def drain(subscription) -> list:
+    events = []
+    while not subscription.queue.empty():
+        events.append(subscription.queue.get_nowait())
+    return events
+
+
+class TestLeaderElection:
+    """Test suite for the scheduler lease shared by workers"""
+
+    @pytest.mark.asyncio
+    async def test_only_the_leader_runs_jobs(self, session_factory):
+        """Test two workers on one database run each job once per tick"""
+        runs = []
+
+        def worker(holder):
+            async def job():
+                runs.append(holder)
+
+            return Scheduler(
+                {"job": job},
+                lease_seconds=60,
+                session_factory=session_factory,
+                holder=holder,
+            )
+
+        first, second = worker("first"), worker("second")
+        now = datetime.now(timezone.utc)
+
+        assert await first.tick(now) is True
+        assert await second.tick(now) is False
+        assert await first.tick(now + timedelta(seconds=30)) is True
+        assert runs == ["first", "first"]
+
+    @pytest.mark.asyncio
+    async def test_expired_lease_is_taken_over(self, session_factory):
+        """Test a worker that stopped renewing loses the lease"""
+        now = datetime.now(timezone.utc)
+        first = Scheduler({}, lease_seconds=60, session_factory=session_factory)
+        second = Scheduler({}, lease_seconds=60, session_factory=session_factory)
+        await first.elect(now)
+
+        assert await second.elect(now + timedelta(seconds=59)) is False
+        assert await second.elect(now + timedelta(seconds=61)) is True
+        assert await first.elect(now + timedelta(seconds=62)) is False
+        assert (first.is_leader, second.is_leader) == (False, True)
+
+    @pytest.mark.asyncio
+    async def test_release_hands_over_immediately(self, session_factory):
+        """Test a leader shutting down frees the lease without waiting"""
+        now = datetime.now(timezone.utc)
+        first = Scheduler({}, lease_seconds=60, session_factory=session_factory)
+        second = Scheduler({}, lease_seconds=60, session_factory=session_factory)
+        await first.elect(now)
+
+        await first.release()
+
+        assert await second.elect(now) is True
+
+    @pytest.mark.asyncio
+    async def test_failing_job_does_not_stop_others(self, session_factory):
+        """Test one broken job is logged and the rest still run"""
+        runs = []
+
+        async def broken():
+            raise RuntimeError("boom")
+
+        async def healthy():
+            runs.append(True)
+
+        scheduler = Scheduler(
+            {"broken": broken, "healthy": healthy}, session_factory=session_factory
+        )
+
+        assert await scheduler.tick() is True
+        assert runs == [True]
+
+
+class TestDueDateProcessing:
+    """Test suite for due-soon and overdue events"""
+
+    async def _make_task(self, session, owner_id, due_date, status=TaskStatus.PENDING):
+        task = Task(
+            id=uuid4(),
+            title="Due",
+            owner_id=owner_id,
+            due_date=due_date,
+            status=status.value,
+        )
+        session.add(task)
+        await session.commit()
+        return task
+
+    @pytest.mark.asyncio
+    async def test_each_boundary_is_announced_once(
+        self, test_db_session, test_user, subscription
+    ):
+        """Test tasks are announced as they become due soon, then overdue"""
+        service = TaskService(TaskRepository(test_db_session))
+        t0 = datetime.now(timezone.utc)
+        hour = timedelta(hours=1)
+
+        async def run(now):
+            return await service.process_due_dates(now, hour, batch_size=2)
+
+        already_overdue = await self._make_task(
+            test_db_session, test_user.id, t0 - hour
+        )
+        soon = [
+            await self._make_task(
+                test_db_session, test_user.id, t0 + timedelta(minutes=m)
+            )
+            for m in (10, 20, 30)
+        ]
+        await self._make_task(
+            test_db_session,
+            test_user.id,
+            t0 + timedelta(minutes=15),
+            TaskStatus.COMPLETED,
+        )
+        later = await self._make_task(test_db_session, test_user.id, t0 + 3 * hour)
+
+        first = await run(t0)
+        assert first == {TaskEventType.OVERDUE: 0, TaskEventType.DUE_SOON: 3}
+        events = drain(subscription)
+        assert [e.type for e in events] == [TaskEventType.DUE_SOON] * 3
+        assert [e.task_id for e in events] == [task.id for task in soon]
+        assert already_overdue.id not in {e.task_id for e in events}
+
+        assert await run(t0) == {
+            TaskEventType.OVERDUE: 0,
+            TaskEventType.DUE_SOON: 0,
+        }
+
+        second = await run(t0 + 2.5 * hour)
+        assert second == {TaskEventType.OVERDUE: 3, TaskEventType.DUE_SOON: 1}
+        events = drain(subscription)
+        assert {e.task_id for e in events if e.type == TaskEventType.OVERDUE} == {
+            task.id for task in soon
+        }
+        assert [e.task_id for e in events if e.type == TaskEventType.DUE_SOON] == [
+            later.id
+        ]
@@ -0,0 +1,110 @@
+import random
+from collections import Counter
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import func, select
+
+from src.models import Task, User
+from src.seed import generate_data, generate_tasks, parse_status_mix
+
+
+class TestGenerateData:
+    """Test suite for the synthetic data generator"""
+
+    @pytest.mark.asyncio
+    async def test_bulk_loads_users_and_tasks(self, test_db_engine):
+        """Test the requested row counts land in the database, in small batches"""
+        result = await generate_data(
+            test_db_engine, users=20, tasks=500, batch_size=64, password="pw"
+        )
+
+        assert result["users"] == 20 and result["tasks"] == 500
+        async with test_db_engine.connect() as conn:
+            users = await conn.scalar(select(func.count()).select_from(User))
+            tasks = await conn.scalar(select(func.count()).select_from(Task))
+            orphans = await conn.scalar(
+                select(func.count())
+                .select_from(Task)
+                .where(Task.owner_id.not_in(select(User.id)))
+            )
+            hashes = await conn.scalar(
+                select(func.count(User.password_hash.distinct()))
+            )
+        assert (users, tasks, orphans) == (20, 500, 0)
+        assert hashes == 1
+
+    @pytest.mark.asyncio
+    async def test_generated_users_can_log_in(self, test_db_engine):
+        """Test the shared precomputed hash verifies against the password"""
+        from src.services.user_services import UserService
+
+        await generate_data(test_db_engine, users=2, tasks=0, password="secret-pw")
+
+        async with test_db_engine.connect() as conn:
+            password_hash = await conn.scalar(select(User.password_hash).limit(1))
+        assert UserService.verify_password("secret-pw", password_hash)
+
+    @pytest.mark.asyncio
+    async def test_tasks_without_users_rejected(self, test_db_engine):
+        """Test tasks cannot be generated without owners"""
+        with pytest.raises(ValueError):
+            await generate_data(test_db_engine, users=0, tasks=10)
+
+
+class TestTaskDistributions:
+    """Test suite for the shape of generated tasks"""
+
+    def generate(self, count=20000, **kwargs):
+        user_ids = [uuid4() for _ in range(200)]
+        rows = list(
+            generate_tasks(
+                count,
+                user_ids,
+                random.Random(7),
+                datetime.now(timezone.utc),
+                **kwargs,
+            )
+        )
+        return user_ids, rows
+
+    def test_tasks_per_user_are_skewed(self):
+        """Test a few users own most tasks under the default skew"""
+        _, rows = self.generate()
+        per_owner = sorted(Counter(r["owner_id"] for r in rows).values(), reverse=True)
+
+        top_tenth = sum(per_owner[:20])
+        assert top_tenth > 0.5 * len(rows)
+        assert per_owner[0] > 20 * per_owner[len(per_owner) // 2]
+
+    def test_zero_skew_is_uniform(self):
+        """Test skew 0 spreads tasks evenly over users"""
+        _, rows = self.generate(skew=0)
+        per_owner = Counter(r["owner_id"] for r in rows).values()
+
+        assert max(per_owner) < 2 * min(per_owner)
+
+    def test_assignment_status_and_due_ratios(self):
+        """Test assignment, status mix and due dates follow the parameters"""
+        _, rows = self.generate(
+            assign_ratio=0.25,
+            status_mix=parse_status_mix("pending=1,completed=3"),
+            due_ratio=0.5,
+        )
+        assigned = [r for r in rows if r["assigned_to_id"] is not None]
+        statuses = Counter(r["status"] for r in rows)
+        with_due = [r for r in rows if r["due_date"] is not None]
+
+        assert 0.22 < len(assigned) / len(rows) < 0.28
+        assert all(r["assigned_to_id"] != r["owner_id"] for r in assigned)
+        assert set(statuses) == {"pending", "completed"}
+        assert 0.72 < statuses["completed"] / len(rows) < 0.78
+        assert 0.47 < len(with_due) / len(rows) < 0.53
+        assert all(r["due_date"] > r["created_at"] for r in with_due)
+        assert all(r["updated_at"] >= r["created_at"] for r in rows)
+
+    def test_unknown_status_rejected(self):
+        """Test the status mix only accepts TaskStatus values"""
+        with pytest.raises(ValueError):
+            parse_status_mix("pending=1,blocked=1")
@@ -0,0 +1,266 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import update
+from sqlmodel import select
+
+from src.dependencies import get_current_user
+from src.main import app
+from src.models import TaskChange
+
+
+@pytest.fixture(autouse=True)
+def settle_immediately(monkeypatch):
+    """Let cursors move past entries as soon as they are written"""
+    from src.config import settings
+
+    monkeypatch.setattr(settings, "task_changes_settle_seconds", 0)
+
+
+def act_as(user) -> None:
+    app.dependency_overrides[get_current_user] = lambda: user
+
+
+async def changes(client: AsyncClient, since: str | None = None, **params) -> dict:
+    if since is not None:
+        params["since"] = since
+    response = await client.get("/api/tasks/changes", params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+class TestTaskChangeLog:
+    """Test suite for the task_changes log written by the repository"""
+
+    @pytest.mark.asyncio
+    async def test_mutations_are_logged(
+        self, auth_client: AsyncClient, test_db_session, owner_user
+    ):
+        """Test create, update, reassign and delete each append one entry"""
+        created = await auth_client.post("/api/tasks", json={"title": "Logged"})
+        task_id = created.json()["id"]
+        await auth_client.put(f"/api/tasks/{task_id}", json={"title": "Renamed"})
+        await auth_client.put(
+            f"/api/tasks/{task_id}", json={"assigned_to_id": str(owner_user.id)}
+        )
+        await auth_client.delete(f"/api/tasks/{task_id}")
+
+        entries = (
+            await test_db_session.execute(select(TaskChange).order_by(TaskChange.id))
+        ).scalars()
+        assert [
+            (e.op, e.assigned_to_id, e.previous_assigned_to_id) for e in entries
+        ] == [
+            ("upsert", None, None),
+            ("upsert", None, None),
+            ("upsert", owner_user.id, None),
+            ("delete", owner_user.id, None),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_rejected_update_is_not_logged(
+        self, auth_client: AsyncClient, test_db_session, test_task
+    ):
+        """Test a version conflict rolls back its log entry too"""
+        response = await auth_client.put(
+            f"/api/tasks/{test_task.id}", json={"title": "Stale", "version": 99}
+        )
+
+        assert response.status_code == 409
+        entries = (await test_db_session.execute(select(TaskChange))).all()
+        assert entries == []
+
+
+class TestDeltaSync:
+    """Test suite for GET /api/tasks/changes"""
+
+    @pytest.mark.asyncio
+    async def test_changes_are_compacted_per_task(
+        self, auth_client: AsyncClient, test_user
+    ):
+        """Test several edits to a task come back once, in their latest state"""
+        start = await changes(auth_client)
+        assert start["changes"] == [] and start["has_more"] is False
+
+        created = await auth_client.post("/api/tasks", json={"title": "Draft"})
+        task_id = created.json()["id"]
+        await auth_client.put(f"/api/tasks/{task_id}", json={"title": "Final"})
+        deleted = await auth_client.post("/api/tasks", json={"title": "Gone"})
+        await auth_client.delete(f"/api/tasks/{deleted.json()['id']}")
+
+        page = await changes(auth_client, start["cursor"])
+
+        assert [(c["op"], c["task_id"]) for c in page["changes"]] == [
+            ("upsert", task_id),
+            ("delete", deleted.json()["id"]),
+        ]
+        assert page["changes"][0]["task"]["title"] == "Final"
+        assert page["changes"][0]["task"]["owner"]["id"] == str(test_user.id)
+        assert page["changes"][1]["task"] is None
+        assert (await changes(auth_client, page["cursor"]))["changes"] == []
+
+    @pytest.mark.asyncio
+    async def test_visibility_follows_assignment(
+        self, client: AsyncClient, test_user, owner_user
+    ):
+        """Test the assignee sees the task and loses it again on reassignment"""
+        act_as(owner_user)
+        cursor = (await changes(client))["cursor"]
+
+        act_as(test_user)
+        created = await client.post(
+            "/api/tasks",
+            json={"title": "Handed over", "assigned_to_id": str(owner_user.id)},
+        )
+        task_id = created.json()["id"]
+        act_as(owner_user)
+        page = await changes(client, cursor)
+        assert [(c["op"], c["task_id"]) for c in page["changes"]] == [
+            ("upsert", task_id)
+        ]
+
+        act_as(test_user)
+        await client.put(
+            f"/api/tasks/{task_id}", json={"assigned_to_id": str(test_user.id)}
+        )
+        act_as(owner_user)
+        page = await changes(client, page["cursor"])
+
+        assert [(c["op"], c["task_id"]) for c in page["changes"]] == [
+            ("delete", task_id)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_other_users_changes_are_not_listed(
+        self, client: AsyncClient, test_user, owner_user
+    ):
+        """Test the log is filtered to the caller's tasks"""
+        act_as(owner_user)
+        cursor = (await changes(client))["cursor"]
+        act_as(test_user)
+        await client.post("/api/tasks", json={"title": "Private"})
+
+        act_as(owner_user)
+        page = await changes(client, cursor)
+
+        assert page["changes"] == []
+
+    @pytest.mark.asyncio
+    async def test_paging_and_settle_window(
+        self, auth_client: AsyncClient, monkeypatch
+    ):
+        """Test has_more paging, and that recent entries are resent"""
+        from src.config import settings
+
+        cursor = (await changes(auth_client))["cursor"]
+        for i in range(3):
+            await auth_client.post("/api/tasks", json={"title": f"Task {i}"})
+
+        first = await changes(auth_client, cursor, limit=2)
+        rest = await changes(auth_client, first["cursor"], limit=2)
+        assert (len(first["changes"]), first["has_more"]) == (2, True)
+        assert (len(rest["changes"]), rest["has_more"]) == (1, False)
+
+        monkeypatch.setattr(settings, "task_changes_settle_seconds", 60)
+        unsettled = await changes(auth_client, cursor)
+        again = await changes(auth_client, unsettled["cursor"])
+        assert len(unsettled["changes"]) == len(again["changes"]) == 3
+
+    @pytest.mark.asyncio
+    async def test_full_page_of_unsettled_entries(
+        self, auth_client: AsyncClient, test_db_session, monkeypatch
+    ):
+        """Test a page stopped by unsettled entries does not claim has_more"""
+        from src.config import settings
+
+        cursor = (await changes(auth_client))["cursor"]
+        await auth_client.post("/api/tasks", json={"title": "Settled"})
+        await test_db_session.execute(
+            update(TaskChange).values(
+                changed_at=datetime.now(timezone.utc) - timedelta(minutes=5)
+            )
+        )
+        await test_db_session.commit()
+        for title in ("Fresh", "Fresher"):
+            await auth_client.post("/api/tasks", json={"title": title})
+        monkeypatch.setattr(settings, "task_changes_settle_seconds", 60)
+
+        page = await changes(auth_client, cursor, limit=2)
+        again = await changes(auth_client, page["cursor"], limit=2)
+
+        assert (len(page["changes"]), page["has_more"]) == (2, False)
+        assert [c["task"]["title"] for c in again["changes"]] == ["Fresh", "Fresher"]
+        assert again["has_more"] is False
+
+    @pytest.mark.asyncio
+    async def test_initial_cursor_stops_before_unsettled_entries(
+        self, auth_client: AsyncClient, monkeypatch
+    ):
+        """Test a fresh cursor still returns entries inside the settle window"""
+        from src.config import settings
+
+        monkeypatch.setattr(settings, "task_changes_settle_seconds", 60)
+        await auth_client.post("/api/tasks", json={"title": "In flight"})
+
+        cursor = (await changes(auth_client))["cursor"]
+        page = await changes(auth_client, cursor)
+
+        assert [c["task"]["title"] for c in page["changes"]] == ["In flight"]
+
+    @pytest.mark.asyncio
+    async def test_expired_and_invalid_cursors(
+        self, auth_client: AsyncClient, monkeypatch
+    ):
+        """Test a cursor past retention gets 410 and garbage gets 400"""
+        import base64
+
+        from src.config import settings
+
+        monkeypatch.setattr(settings, "task_changes_retention_days", 1)
+        old = datetime.now(timezone.utc) - timedelta(days=2)
+        expired = base64.urlsafe_b64encode(f"0|{old.isoformat()}".encode()).decode()
+
+        response = await auth_client.get(
+            "/api/tasks/changes", params={"since": expired}
+        )
+        assert response.status_code == 410
+
+        response = await auth_client.get(
+            "/api/tasks/changes", params={"since": "not-a-cursor"}
+        )
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_pruning_removes_only_old_entries(
+        self, auth_client: AsyncClient, test_db_session
+    ):
+        """Test retention pruning deletes entries older than the cutoff"""
+        from src.repositories.task_repository import TaskRepository
+        from src.services.task_services import TaskService
+
+        for title in ("Old", "Older", "New"):
+            await auth_client.post("/api/tasks", json={"title": title})
+        first_id = (
+            (
+                await test_db_session.execute(
+                    select(TaskChange.id).order_by(TaskChange.id)
+                )
+            )
+            .scalars()
+            .first()
+        )
+        await test_db_session.execute(
+            update(TaskChange)
+            .where(TaskChange.id < first_id + 2)
+            .values(changed_at=datetime.now(timezone.utc) - timedelta(days=10))
+        )
+        await test_db_session.commit()
+
+        pruned = await TaskService(TaskRepository(test_db_session)).prune_changes(
+            timedelta(days=7), batch_size=1
+        )
+
+        assert pruned == 2
+        remaining = (await test_db_session.execute(select(TaskChange.id))).scalars()
+        assert list(remaining) == [first_id + 2]
@@ -0,0 +1,230 @@
+from uuid import uuid4
+
+import pytest
+from httpx import AsyncClient
+
+from src.core.task_events import (
+    EventStreamResponse,
+    TaskEventHub,
+    sse_stream,
+    task_events,
+)
+from src.models import TaskEvent, TaskEventType
+
+
+@pytest.fixture
+def subscribe():
+    """Open subscriptions on the app's hub, closed after the test"""
+    opened = []
+
+    def open_subscription(user_id):
+        subscription = task_events.subscribe(user_id)
+        opened.append(subscription)
+        return subscription
+
+    yield open_subscription
+    for subscription in opened:
+        task_events.unsubscribe(subscription)
+
+
+def drain(subscription) -> list[TaskEvent]:
+    events = []
+    while not subscription.queue.empty():
+        events.append(subscription.queue.get_nowait())
+    return events
+
+
+def make_event() -> TaskEvent:
+    return TaskEvent(type=TaskEventType.DELETED, task_id=uuid4())
+
+
+class TestTaskEventHub:
+    """Test suite for the in-process task event hub"""
+
+    def test_publish_reaches_only_recipients(self):
+        """Test events go to every connection of each recipient, once"""
+        hub = TaskEventHub()
+        owner, assignee, other = uuid4(), uuid4(), uuid4()
+        owner_tabs = [hub.subscribe(owner), hub.subscribe(owner)]
+        assignee_sub = hub.subscribe(assignee)
+        other_sub = hub.subscribe(other)
+
+        delivered = hub.publish(make_event(), [owner, assignee, owner, None])
+
+        assert delivered == 3
+        assert [len(drain(s)) for s in owner_tabs] == [1, 1]
+        assert len(drain(assignee_sub)) == 1
+        assert drain(other_sub) == []
+
+    def test_full_queue_cuts_subscriber_off(self, monkeypatch):
+        """Test a slow subscriber is dropped instead of blocking the publisher"""
+        from src.config import settings
+
+        monkeypatch.setattr(settings, "push_queue_size", 2)
+        hub = TaskEventHub()
+        user_id = uuid4()
+        slow = hub.subscribe(user_id)
+
+        results = [hub.publish(make_event(), [user_id]) for _ in range(4)]
+
+        assert results == [1, 1, 0, 0]
+        assert slow.overflowed
+        assert drain(slow) == [None]
+
+    def test_connection_limit(self, monkeypatch):
+        """Test a user cannot open more than the configured streams"""
+        from src.config import settings
+        from src.core.exceptions import ConnectionLimitError
+
+        monkeypatch.setattr(settings, "push_max_connections_per_user", 2)
+        hub = TaskEventHub()
+        user_id = uuid4()
+        first = hub.subscribe(user_id)
+        hub.subscribe(user_id)
+
+        with pytest.raises(ConnectionLimitError):
+            hub.subscribe(user_id)
+        hub.unsubscribe(first)
+        hub.subscribe(user_id)
+        assert hub.subscriber_count(user_id) == 2
+
+
+class TestSseStream:
+    """Test suite for the Server-Sent Events encoding of a subscription"""
+
+    @pytest.mark.asyncio
+    async def test_events_keepalive_and_resync(self, monkeypatch):
+        """Test the stream sends events, heartbeats, then resync on overflow"""
+        from src.config import settings
+
+        monkeypatch.setattr(settings, "push_heartbeat_seconds", 0.01)
+        monkeypatch.setattr(settings, "push_queue_size", 1)
+        hub = TaskEventHub()
+        user_id = uuid4()
+        subscription = hub.subscribe(user_id)
+        stream = sse_stream(subscription, hub)
+
+        assert await anext(stream) == "event: ready\ndata: {}\n\n"
+        event = make_event()
+        hub.publish(event, [user_id])
+        message = await anext(stream)
+        assert message.startswith("event: task.deleted\ndata: ")
+        assert TaskEvent.model_validate_json(message.split("data: ")[1]) == event
+        assert await anext(stream) == ": keep-alive\n\n"
+
+        hub.publish(make_event(), [user_id])
+        hub.publish(make_event(), [user_id])
+        assert await anext(stream) == "event: resync\ndata: {}\n\n"
+        with pytest.raises(StopAsyncIteration):
+            await anext(stream)
+        assert hub.subscriber_count(user_id) == 0
+
+    @pytest.mark.asyncio
+    async def test_closing_the_stream_unsubscribes(self):
+        """Test a client disconnect (generator closed) frees the subscription"""
+        hub = TaskEventHub()
+        user_id = uuid4()
+        stream = sse_stream(hub.subscribe(user_id), hub)
+        await anext(stream)
+
+        await stream.aclose()
+
+        assert hub.subscriber_count(user_id) == 0
+
+    @pytest.mark.asyncio
+    async def test_response_closes_stream_when_send_fails(self):
+        """Test a disconnect reported by send() releases the subscription"""
+        hub = TaskEventHub()
+        user_id = uuid4()
+        response = EventStreamResponse(sse_stream(hub.subscribe(user_id), hub))
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            if message["type"] == "http.response.body":
+                raise OSError("client went away")
+
+        scope = {"type": "http", "asgi": {"spec_version": "2.4"}}
+        with pytest.raises(Exception):
+            await response(scope, receive, send)
+
+        assert hub.subscriber_count(user_id) == 0
+
+
+class TestTaskServicePublishing:
+    """Test suite for task changes published by the service after commit"""
+
+    @pytest.mark.asyncio
+    async def test_create_update_delete_are_pushed(
+        self, auth_client: AsyncClient, test_user, owner_user, subscribe
+    ):
+        """Test owner and assignee receive each committed change"""
+        owner_sub = subscribe(test_user.id)
+        assignee_sub = subscribe(owner_user.id)
+
+        created = await auth_client.post(
+            "/api/tasks",
+            json={"title": "Pushed", "assigned_to_id": str(owner_user.id)},
+        )
+        task_id = created.json()["id"]
+        await auth_client.put(f"/api/tasks/{task_id}", json={"status": "completed"})
+        await auth_client.delete(f"/api/tasks/{task_id}")
+
+        for subscription in (owner_sub, assignee_sub):
+            events = drain(subscription)
+            assert [e.type for e in events] == [
+                TaskEventType.CREATED,
+                TaskEventType.UPDATED,
+                TaskEventType.DELETED,
+            ]
+            assert {str(e.task_id) for e in events} == {task_id}
+            assert events[1].task.status == "completed"
+            assert events[2].task is None
+
+    @pytest.mark.asyncio
+    async def test_previous_assignee_hears_reassignment(
+        self, auth_client: AsyncClient, test_user, owner_user, subscribe
+    ):
+        """Test reassigning a task notifies the user it was taken from"""
+        created = await auth_client.post(
+            "/api/tasks",
+            json={"title": "Handed off", "assigned_to_id": str(owner_user.id)},
+        )
+        assignee_sub = subscribe(owner_user.id)
+
+        await auth_client.put(
+            f"/api/tasks/{created.json()['id']}",
+            json={"assigned_to_id": str(test_user.id)},
+        )
+
+        [event] = drain(assignee_sub)
+        assert event.type == TaskEventType.UPDATED
+        assert event.task.assigned_to_id == test_user.id
+
+    @pytest.mark.asyncio
+    async def test_failed_update_publishes_nothing(
+        self, auth_client: AsyncClient, test_user, test_task, subscribe
+    ):
+        """Test rejected writes are not pushed"""
+        subscription = subscribe(test_user.id)
+
+        response = await auth_client.put(
+            f"/api/tasks/{test_task.id}", json={"title": "Stale", "version": 99}
+        )
+
+        assert response.status_code == 409
+        assert drain(subscription) == []
+
+    @pytest.mark.asyncio
+    async def test_stream_limit_returns_429(
+        self, auth_client: AsyncClient, monkeypatch
+    ):
+        """Test the endpoint refuses streams beyond the per-user limit"""
+        from src.config import settings
+
+        monkeypatch.setattr(settings, "push_max_connections_per_user", 0)
+
+        response = await auth_client.get("/api/tasks/events")
+
+        assert response.status_code == 429
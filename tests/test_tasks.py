@@ -689,3 +689,390 @@ class TestTaskServiceErrorCases:
             assert False, "Should have raised PermissionError"
         except PermissionError as e:
             assert "owner" in str(e).lower()
+
+
+class TestTaskFilteringAndSorting:
+    """Test suite for server-side task filters and sorting"""
+
+    @pytest.mark.asyncio
+    async def test_sort_by_due_date_ascending(
+        self, auth_client: AsyncClient, test_user
+    ):
+        """Test tasks come back ordered by due date with undated tasks last"""
+        now = datetime.now(timezone.utc)
+        for title, days in [("Later", 5), ("Sooner", 1), ("Undated", None)]:
+            payload: dict = {"title": title}
+            if days is not None:
+                payload["due_date"] = (now + timedelta(days=days)).isoformat()
+            await auth_client.post("/api/tasks", json=payload)
+
+        response = await auth_client.get(
+            "/api/tasks", params={"sort_by": "due_date", "sort_order": "asc"}
+        )
+
+        assert response.status_code == 200
+        assert [t["title"] for t in response.json()] == ["Sooner", "Later", "Undated"]
+
+    @pytest.mark.asyncio
+    async def test_sort_by_due_date_descending(
+        self, auth_client: AsyncClient, test_user
+    ):
+        """Test descending due date is the exact reverse, undated tasks first"""
+        now = datetime.now(timezone.utc)
+        for title, days in [("Later", 5), ("Sooner", 1), ("Undated", None)]:
+            payload: dict = {"title": title}
+            if days is not None:
+                payload["due_date"] = (now + timedelta(days=days)).isoformat()
+            await auth_client.post("/api/tasks", json=payload)
+
+        response = await auth_client.get(
+            "/api/tasks", params={"sort_by": "due_date", "sort_order": "desc"}
+        )
+
+        assert response.status_code == 200
+        assert [t["title"] for t in response.json()] == ["Undated", "Later", "Sooner"]
+
+    @pytest.mark.asyncio
+    async def test_filter_due_date_range(self, auth_client: AsyncClient, test_user):
+        """Test due_after/due_before restrict the due date window"""
+        now = datetime.now(timezone.utc)
+        for title, days in [("Tomorrow", 1), ("Next week", 7), ("Next month", 30)]:
+            await auth_client.post(
+                "/api/tasks",
+                json={
+                    "title": title,
+                    "due_date": (now + timedelta(days=days)).isoformat(),
+                },
+            )
+
+        response = await auth_client.get(
+            "/api/tasks",
+            params={
+                "due_after": (now + timedelta(days=2)).isoformat(),
+                "due_before": (now + timedelta(days=10)).isoformat(),
+            },
+        )
+
+        assert response.status_code == 200
+        assert [t["title"] for t in response.json()] == ["Next week"]
+
+    @pytest.mark.asyncio
+    async def test_filter_overdue(self, auth_client: AsyncClient, test_user):
+        """Test overdue returns past-due tasks that are not completed"""
+        past = (datetime.now(timezone.utc) - timedelta(days=1)).isoformat()
+        late = await auth_client.post(
+            "/api/tasks", json={"title": "Late", "due_date": past}
+        )
+        done = await auth_client.post(
+            "/api/tasks", json={"title": "Done late", "due_date": past}
+        )
+        await auth_client.put(
+            f"/api/tasks/{done.json()['id']}", json={"status": "completed"}
+        )
+
+        response = await auth_client.get("/api/tasks", params={"overdue": "true"})
+
+        assert response.status_code == 200
+        assert [t["id"] for t in response.json()] == [late.json()["id"]]
+
+    @pytest.mark.asyncio
+    async def test_filter_by_assignee(self, auth_client: AsyncClient, test_user):
+        """Test owner list can be narrowed to one assignee"""
+        await auth_client.post("/api/tasks", json={"title": "Unassigned"})
+        await auth_client.post(
+            "/api/tasks",
+            json={"title": "Mine", "assigned_to_id": str(test_user.id)},
+        )
+
+        response = await auth_client.get(
+            "/api/tasks", params={"assigned_to_id": str(test_user.id)}
+        )
+
+        assert response.status_code == 200
+        assert [t["title"] for t in response.json()] == ["Mine"]
+
+    @pytest.mark.asyncio
+    async def test_assigned_list_rejects_unindexed_sort(
+        self, auth_client: AsyncClient, test_user
+    ):
+        """Test sorting assigned tasks by status is rejected"""
+        response = await auth_client.get(
+            "/api/tasks/assigned", params={"sort_by": "status"}
+        )
+
+        assert response.status_code == 400
+        assert "unsupported sort" in response.json()["detail"].lower()
+
+    @pytest.mark.asyncio
+    async def test_invalid_sort_field(self, auth_client: AsyncClient, test_user):
+        """Test unknown sort fields fail validation"""
+        response = await auth_client.get("/api/tasks", params={"sort_by": "title"})
+
+        assert response.status_code == 422
+
+
+class TestLookupTasks:
+    """Test suite for batched task lookup endpoint"""
+
+    @pytest.mark.asyncio
+    async def test_lookup_found_forbidden_missing(
+        self, auth_client: AsyncClient, test_db_session, test_user, test_task
+    ):
+        """Test each requested id is classified in one call"""
+        from src.models import Task, TaskStatus
+
+        other_task = Task(
+            id=uuid4(),
+            title="Someone else's task",
+            owner_id=uuid4(),
+            status=TaskStatus.PENDING,
+        )
+        test_db_session.add(other_task)
+        await test_db_session.commit()
+        missing_id = uuid4()
+
+        response = await auth_client.post(
+            "/api/tasks/lookup",
+            json={
+                "ids": [
+                    str(test_task.id),
+                    str(other_task.id),
+                    str(missing_id),
+                    str(test_task.id),
+                ]
+            },
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [t["id"] for t in data["found"]] == [str(test_task.id)]
+        assert data["found"][0]["owner"]["id"] == str(test_user.id)
+        assert data["forbidden"] == [str(other_task.id)]
+        assert data["missing"] == [str(missing_id)]
+
+    @pytest.mark.asyncio
+    async def test_lookup_too_many_ids(self, auth_client: AsyncClient, test_user):
+        """Test lookups above the configured limit are rejected"""
+        from src.config import settings
+
+        ids = [str(uuid4()) for _ in range(settings.task_lookup_max_ids + 1)]
+        response = await auth_client.post("/api/tasks/lookup", json={"ids": ids})
+
+        assert response.status_code == 400
+        assert "cannot look up" in response.json()["detail"].lower()
+
+
+class TestOptimisticConcurrency:
+    """Test suite for version-conditional task updates"""
+
+    @pytest.mark.asyncio
+    async def test_update_increments_version(
+        self, auth_client: AsyncClient, test_user, test_task
+    ):
+        """Test every update bumps the version and returns it as ETag"""
+        response = await auth_client.put(
+            f"/api/tasks/{test_task.id}", json={"title": "First"}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["version"] == 2
+        assert response.headers["ETag"] == '"2"'
+
+    @pytest.mark.asyncio
+    async def test_stale_if_match_conflicts(
+        self, auth_client: AsyncClient, test_user, test_task
+    ):
+        """Test a writer holding an old version gets 409 instead of overwriting"""
+        etag = (await auth_client.get(f"/api/tasks/{test_task.id}")).headers["ETag"]
+
+        first = await auth_client.put(
+            f"/api/tasks/{test_task.id}",
+            json={"title": "Writer A"},
+            headers={"If-Match": etag},
+        )
+        second = await auth_client.put(
+            f"/api/tasks/{test_task.id}",
+            json={"title": "Writer B"},
+            headers={"If-Match": etag},
+        )
+
+        assert first.status_code == 200
+        assert second.status_code == 409
+        assert "version is 2" in second.json()["detail"]
+        current = await auth_client.get(f"/api/tasks/{test_task.id}")
+        assert current.json()["title"] == "Writer A"
+
+    @pytest.mark.asyncio
+    async def test_body_version_conflicts(
+        self, auth_client: AsyncClient, test_user, test_task
+    ):
+        """Test the expected version can also be sent in the body"""
+        ok = await auth_client.put(
+            f"/api/tasks/{test_task.id}", json={"title": "New", "version": 1}
+        )
+        stale = await auth_client.put(
+            f"/api/tasks/{test_task.id}", json={"title": "Old", "version": 1}
+        )
+
+        assert ok.status_code == 200
+        assert stale.status_code == 409
+
+    @pytest.mark.asyncio
+    async def test_malformed_if_match(
+        self, auth_client: AsyncClient, test_user, test_task
+    ):
+        """Test a non-numeric If-Match is rejected"""
+        response = await auth_client.put(
+            f"/api/tasks/{test_task.id}",
+            json={"title": "New"},
+            headers={"If-Match": '"abc"'},
+        )
+
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_wildcard_if_match_skips_version_check(
+        self, auth_client: AsyncClient, test_user, test_task
+    ):
+        """Test If-Match: * updates whatever the current version is"""
+        await auth_client.put(f"/api/tasks/{test_task.id}", json={"title": "v2"})
+
+        response = await auth_client.put(
+            f"/api/tasks/{test_task.id}",
+            json={"title": "v3"},
+            headers={"If-Match": "*"},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["version"] == 3
+
+
+class TestTaskArchival:
+    """Test suite for hot/cold archival of completed tasks"""
+
+    async def _make_task(self, session, owner_id, status, updated_days_ago):
+        from src.models import Task
+
+        stamp = datetime.now(timezone.utc) - timedelta(days=updated_days_ago)
+        task = Task(
+            id=uuid4(),
+            title=f"{status} {updated_days_ago}d",
+            owner_id=owner_id,
+            status=status,
+            created_at=stamp,
+            updated_at=stamp,
+        )
+        session.add(task)
+        await session.commit()
+        return task
+
+    @pytest.mark.asyncio
+    async def test_archive_moves_only_old_completed_tasks(
+        self, test_db_session, test_user
+    ):
+        """Test the archiver moves old completed tasks in batches and nothing else"""
+        from sqlmodel import select
+        from src.models import ArchivedTask, Task, TaskStatus
+        from src.repositories.task_repository import TaskRepository
+        from src.services.task_services import TaskService
+
+        old_done = [
+            await self._make_task(
+                test_db_session, test_user.id, TaskStatus.COMPLETED.value, 40
+            )
+            for _ in range(3)
+        ]
+        recent_done = await self._make_task(
+            test_db_session, test_user.id, TaskStatus.COMPLETED.value, 1
+        )
+        old_pending = await self._make_task(
+            test_db_session, test_user.id, TaskStatus.PENDING.value, 40
+        )
+
+        service = TaskService(TaskRepository(test_db_session))
+        moved = await service.archive_completed_tasks(timedelta(days=30), batch_size=2)
+
+        assert moved == 3
+        hot_ids = set((await test_db_session.execute(select(Task.id))).scalars())
+        cold_ids = set(
+            (await test_db_session.execute(select(ArchivedTask.id))).scalars()
+        )
+        assert hot_ids == {recent_done.id, old_pending.id}
+        assert cold_ids == {task.id for task in old_done}
+
+    @pytest.mark.asyncio
+    async def test_include_archived_and_restore(
+        self, auth_client: AsyncClient, test_db_session, test_user
+    ):
+        """Test archived tasks are listed on request and can be restored"""
+        from src.models import TaskStatus
+        from src.repositories.task_repository import TaskRepository
+        from src.services.task_services import TaskService
+
+        done = await self._make_task(
+            test_db_session, test_user.id, TaskStatus.COMPLETED.value, 40
+        )
+        await TaskService(TaskRepository(test_db_session)).archive_completed_tasks(
+            timedelta(days=30), batch_size=10
+        )
+
+        hot_only = await auth_client.get("/api/tasks")
+        with_archive = await auth_client.get(
+            "/api/tasks", params={"include_archived": "true"}
+        )
+
+        assert hot_only.json() == []
+        assert [t["id"] for t in with_archive.json()] == [str(done.id)]
+        assert with_archive.json()[0]["archived_at"] is not None
+
+        restored = await auth_client.post(f"/api/tasks/{done.id}/restore")
+
+        assert restored.status_code == 200
+        assert restored.json()["status"] == "completed"
+        listed = await auth_client.get("/api/tasks")
+        assert [t["id"] for t in listed.json()] == [str(done.id)]
+        assert listed.json()[0]["archived_at"] is None
+
+    @pytest.mark.asyncio
+    async def test_restore_missing_task(self, auth_client: AsyncClient, test_user):
+        """Test restoring a task that is not archived"""
+        response = await auth_client.post(f"/api/tasks/{uuid4()}/restore")
+
+        assert response.status_code == 404
+
+
+class TestCachedRepositoryQueries:
+    """Test cached (lambda) statements rebind their parameters on every call"""
+
+    @pytest.mark.asyncio
+    async def test_hot_queries_use_current_arguments(
+        self, test_db_session, test_user, owner_user
+    ):
+        """Test consecutive calls with different ids return different rows"""
+        from src.models import Task, TaskFilter, TaskStatus
+        from src.repositories.task_repository import TaskRepository
+
+        mine = Task(id=uuid4(), title="Mine", owner_id=test_user.id)
+        theirs = Task(
+            id=uuid4(),
+            title="Theirs",
+            owner_id=owner_user.id,
+            assigned_to_id=test_user.id,
+            status=TaskStatus.IN_PROGRESS.value,
+        )
+        test_db_session.add_all([mine, theirs])
+        await test_db_session.commit()
+        repo = TaskRepository(test_db_session)
+
+        async def titles(owner_id=None, **filters):
+            tasks = await repo.list_tasks(TaskFilter(**filters), owner_id=owner_id)
+            return [t.title for t in tasks]
+
+        assert await titles(test_user.id) == ["Mine"]
+        assert await titles(owner_user.id) == ["Theirs"]
+        assert (await repo.get_task_by_id_with_users(mine.id)).title == "Mine"
+        assert (await repo.get_task_by_id_with_users(theirs.id)).title == "Theirs"
+        assert await titles(owner_user.id, status=TaskStatus.PENDING) == []
+        assert await titles(owner_user.id, status=TaskStatus.IN_PROGRESS) == ["Theirs"]
+        assert await titles(assigned_to_id=test_user.id) == ["Theirs"]
+        assert await titles(assigned_to_id=owner_user.id) == []
@@ -0,0 +1,138 @@
+import pytest
+from httpx import AsyncClient
+
+from src.core.tracing import InMemoryExporter, parse_traceparent, set_exporter
+
+
+@pytest.fixture
+def exporter(monkeypatch):
+    """Enable tracing with an in-memory exporter"""
+    from src.config import settings
+
+    monkeypatch.setattr(settings, "tracing_enabled", True)
+    monkeypatch.setattr(settings, "tracing_sample_rate", 1.0)
+    memory = InMemoryExporter()
+    set_exporter(memory)
+    yield memory
+    set_exporter(None)
+
+
+def by_name(spans) -> dict:
+    return {span.name: span for span in spans}
+
+
+class TestTracing:
+    """Test suite for request tracing across the layers"""
+
+    @pytest.mark.asyncio
+    async def test_request_spans_cover_every_layer(
+        self, auth_client: AsyncClient, test_task, exporter
+    ):
+        """Test a request yields nested router, service, repository and SQL spans"""
+        response = await auth_client.get(f"/api/tasks/{test_task.id}")
+
+        assert response.status_code == 200
+        spans = by_name(exporter.spans)
+        root = spans["GET /api/tasks/{task_id}"]
+        handler = spans["handler get_task"]
+        service = spans["TaskService.get_task"]
+        repository = spans["TaskRepository.get_task_by_id_with_users"]
+        sql = [span for span in exporter.spans if span.layer == "db"]
+
+        assert response.headers["x-trace-id"] == root.trace.trace_id
+        assert handler.parent_id == root.span_id
+        assert service.parent_id == handler.span_id
+        assert repository.parent_id == service.span_id
+        assert sql and all(s.parent_id == repository.span_id for s in sql)
+        assert root.attributes["db.statements"] == len(sql)
+        assert root.attributes["http.status_code"] == 200
+        assert 0 <= root.attributes["db.time_ms"] <= root.duration_ms
+
+    @pytest.mark.asyncio
+    async def test_incoming_traceparent_is_continued(
+        self, auth_client: AsyncClient, exporter
+    ):
+        """Test the server span joins the caller's trace"""
+        trace_id, parent_id = "4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7"
+
+        await auth_client.get(
+            "/api/tasks", headers={"traceparent": f"00-{trace_id}-{parent_id}-01"}
+        )
+
+        root = by_name(exporter.spans)["GET /api/tasks"]
+        assert root.trace.trace_id == trace_id
+        assert root.parent_id == parent_id
+
+    @pytest.mark.asyncio
+    async def test_unsampled_traceparent_records_nothing(
+        self, auth_client: AsyncClient, exporter
+    ):
+        """Test the caller's not-sampled flag is respected"""
+        trace_id, parent_id = "4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7"
+
+        response = await auth_client.get(
+            "/api/tasks", headers={"traceparent": f"00-{trace_id}-{parent_id}-00"}
+        )
+
+        assert exporter.spans == []
+        assert "x-trace-id" not in response.headers
+
+    @pytest.mark.asyncio
+    async def test_bcrypt_span(self, client: AsyncClient, test_user, exporter):
+        """Test password verification shows up as its own span"""
+        await client.post(
+            "/api/auth/login",
+            data={"username": "test@example.com", "password": "testpass123"},
+        )
+
+        spans = by_name(exporter.spans)
+        assert spans["bcrypt.verify"].layer == "crypto"
+        assert spans["bcrypt.verify"].parent_id == (
+            spans["UserService.authenticate_user"].span_id
+        )
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self, auth_client: AsyncClient):
+        """Test no trace is started unless tracing is enabled"""
+        memory = InMemoryExporter()
+        set_exporter(memory)
+        try:
+            response = await auth_client.get("/api/tasks")
+        finally:
+            set_exporter(None)
+
+        assert memory.spans == []
+        assert "x-trace-id" not in response.headers
+
+    def test_file_exporter_writes_json_lines(self, tmp_path, monkeypatch):
+        """Test the file exporter appends one JSON object per span by shutdown"""
+        import json
+
+        from src.config import settings
+        from src.core.tracing import Span, Trace, load_exporter
+
+        monkeypatch.setattr(settings, "tracing_file", str(tmp_path / "traces.jsonl"))
+        file_exporter = load_exporter("file")
+        trace = Trace("a" * 32)
+        file_exporter.export([Span(trace, "one", "db", None)])
+        file_exporter.export([Span(trace, "two", "db", None)])
+        file_exporter.close()
+
+        lines = (tmp_path / "traces.jsonl").read_text().splitlines()
+        assert [json.loads(line)["name"] for line in lines] == ["one", "two"]
+
+    def test_parse_traceparent(self):
+        """Test malformed traceparent headers are ignored"""
+        valid = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+
+        assert parse_traceparent(valid) == (
+            "4bf92f3577b34da6a3ce929d0e0e4736",
+            "00f067aa0ba902b7",
+            True,
+        )
+        assert parse_traceparent("garbage") is None
+        assert parse_traceparent(f"00-{'0' * 32}-00f067aa0ba902b7-01") is None
+        assert (
+            parse_traceparent("00-zzzz2f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01")
+            is None
+        )
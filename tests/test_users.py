@@ -217,6 +217,30 @@ class TestUpdateUser:
         assert data["email"] == "newemail@example.com"
 
 
+class TestUserOptimisticConcurrency:
+    """Test suite for version-conditional user updates"""
+
+    @pytest.mark.asyncio
+    async def test_stale_user_update_conflicts(
+        self, auth_client: AsyncClient, test_user
+    ):
+        """Test a stale If-Match on a profile update returns 409"""
+        first = await auth_client.put(
+            f"/api/users/{test_user.id}",
+            json={"name": "Fresh"},
+            headers={"If-Match": '"1"'},
+        )
+        second = await auth_client.put(
+            f"/api/users/{test_user.id}",
+            json={"name": "Stale"},
+            headers={"If-Match": '"1"'},
+        )
+
+        assert first.status_code == 200
+        assert first.json()["version"] == 2
+        assert second.status_code == 409
+
+
 class TestListUsers:
     """Test suite for list users endpoint"""
 
@@ -289,6 +313,168 @@ class TestListUsers:
             assert "password" not in user
 
 
+class TestUserDirectoryPagination:
+    """Test suite for keyset pagination and streaming of the user directory"""
+
+    @pytest.mark.asyncio
+    async def test_list_users_pages_with_cursor(
+        self, owner_auth_client: AsyncClient, client: AsyncClient, owner_user
+    ):
+        """Test walking the directory page by page visits every user once"""
+        for i in range(3):
+            await client.post(
+                "/api/users",
+                json={
+                    "name": f"Paged {i}",
+                    "email": f"paged{i}@example.com",
+                    "password": "pass123",
+                },
+            )
+
+        seen: list[str] = []
+        cursor = None
+        while True:
+            params = {"limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            response = await owner_auth_client.get("/api/users", params=params)
+            assert response.status_code == 200
+            page = response.json()
+            assert len(page) <= 2
+            seen.extend(u["email"] for u in page)
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+
+        assert len(seen) == 4
+        assert len(set(seen)) == 4
+        assert owner_user.email in seen
+
+    @pytest.mark.asyncio
+    async def test_next_cursor_readable_cross_origin(
+        self, owner_auth_client: AsyncClient, owner_user, test_user
+    ):
+        """Test the frontend's origin may read X-Next-Cursor to follow pages"""
+        from src.config import settings
+
+        origin = settings.cors_origins.split(",")[0]
+        response = await owner_auth_client.get(
+            "/api/users", params={"limit": 1}, headers={"Origin": origin}
+        )
+
+        assert response.status_code == 200
+        assert "X-Next-Cursor" in response.headers
+        exposed = response.headers["access-control-expose-headers"]
+        assert "x-next-cursor" in exposed.lower()
+
+    @pytest.mark.asyncio
+    async def test_list_users_invalid_cursor(
+        self, owner_auth_client: AsyncClient, owner_user
+    ):
+        """Test a malformed cursor is rejected"""
+        response = await owner_auth_client.get(
+            "/api/users", params={"cursor": "not-a-cursor"}
+        )
+
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_stream_users_ndjson(
+        self, owner_auth_client: AsyncClient, owner_user, test_user
+    ):
+        """Test the streaming variant returns one JSON user per line"""
+        import json
+
+        response = await owner_auth_client.get("/api/users/stream")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        users = [json.loads(line) for line in response.text.splitlines()]
+        assert {u["email"] for u in users} == {owner_user.email, test_user.email}
+        assert all("password_hash" not in u for u in users)
+
+    @pytest.mark.asyncio
+    async def test_stream_users_as_member_forbidden(
+        self, auth_client: AsyncClient, test_user
+    ):
+        """Test that a member cannot stream the user directory"""
+        response = await auth_client.get("/api/users/stream")
+
+        assert response.status_code == 403
+
+
+class TestUserLookup:
+    """Test suite for assignee autocomplete endpoint"""
+
+    @pytest.mark.asyncio
+    async def test_lookup_by_name_and_email_prefix(
+        self, auth_client: AsyncClient, client: AsyncClient, test_user
+    ):
+        """Test registered users are found by name word or email prefix"""
+        await client.post(
+            "/api/users",
+            json={
+                "name": "Ada Lovelace",
+                "email": "ada@example.com",
+                "password": "pass123",
+            },
+        )
+        await client.post(
+            "/api/users",
+            json={
+                "name": "Alan Turing",
+                "email": "turing@example.com",
+                "password": "pass123",
+            },
+        )
+
+        by_name = await auth_client.get("/api/users/lookup", params={"q": "love"})
+        by_email = await auth_client.get("/api/users/lookup", params={"q": "TUR"})
+        shared = await auth_client.get("/api/users/lookup", params={"q": "a"})
+
+        assert by_name.status_code == 200
+        assert [u["email"] for u in by_name.json()] == ["ada@example.com"]
+        assert [u["name"] for u in by_email.json()] == ["Alan Turing"]
+        assert len(shared.json()) == 2
+
+    @pytest.mark.asyncio
+    async def test_lookup_reflects_user_update(
+        self, auth_client: AsyncClient, client: AsyncClient, test_user
+    ):
+        """Test renaming a user moves it to its new prefixes"""
+        created = await client.post(
+            "/api/users",
+            json={
+                "name": "Grace Hopper",
+                "email": "grace@example.com",
+                "password": "pass123",
+            },
+        )
+        user_id = created.json()["id"]
+
+        from src.models import UserResponse
+        from src.main import app
+        from src.dependencies import get_current_user
+
+        app.dependency_overrides[get_current_user] = lambda: UserResponse(
+            **created.json()
+        )
+        await auth_client.put(f"/api/users/{user_id}", json={"name": "Rear Admiral"})
+
+        old = await auth_client.get("/api/users/lookup", params={"q": "hop"})
+        new = await auth_client.get("/api/users/lookup", params={"q": "admiral"})
+
+        assert old.json() == []
+        assert [u["id"] for u in new.json()] == [user_id]
+
+    @pytest.mark.asyncio
+    async def test_lookup_requires_query(self, auth_client: AsyncClient):
+        """Test an empty query is rejected"""
+        response = await auth_client.get("/api/users/lookup", params={"q": ""})
+
+        assert response.status_code == 422
+
+
 class TestHealthCheck:
     """Test suite for health check endpoint"""
 